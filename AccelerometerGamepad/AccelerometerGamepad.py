@@ -2,6 +2,9 @@ from xdpchandler import *
 import vgamepad as vg
 import time
 from InputProcessor import *
+from OutputScheduler import *
+from GamepadState import *
+from xdpc.dispatcher import SampleDispatcher
 import threading
 from PyQt6.QtCore import Qt, QRunnable, QThreadPool, pyqtSlot, pyqtSignal, QObject
 
@@ -9,60 +12,99 @@ class AccelerometerGamepad:
     def __init__(self):
         self.stop_event = threading.Event()
         self.xdpcHandler = self.initXdpcHandler()
-        self.gamepad = vg.VX360Gamepad()
-        self.joystickInputProcessor = TiltInputProcessor(self.gamepad, self.xdpcHandler)
-        self.buttonInputProcessorA = ButtonInputProcessor(self.gamepad, self.xdpcHandler, vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-        self.buttonInputProcessorB = ButtonInputProcessor(self.gamepad, self.xdpcHandler, vg.XUSB_BUTTON.XUSB_GAMEPAD_START)
+        # The processors share one report, sent to the driver at most gamepad_update_rate times per second
+        # and only when it changed
+        self.gamepadState = GamepadState(vg.VX360Gamepad(), epsilon=gamepad_axis_epsilon)
+        self.gamepad = OutputScheduler(self.gamepadState, rate=gamepad_update_rate)
+        self.joystickInputProcessor = TiltInputProcessor(self.gamepad, self.xdpcHandler, filters=tilt_filters)
+        self.buttonInputProcessorA = ButtonInputProcessor(self.gamepad, self.xdpcHandler, vg.XUSB_BUTTON.XUSB_GAMEPAD_A,
+                                                         filters=button_filters)
+        self.buttonInputProcessorB = ButtonInputProcessor(self.gamepad, self.xdpcHandler, vg.XUSB_BUTTON.XUSB_GAMEPAD_START,
+                                                         filters=button_filters)
         self.inputProcessors = [self.joystickInputProcessor, self.buttonInputProcessorA, self.buttonInputProcessorB]
+        self.startMeasurement()
 
 
     def initXdpcHandler(self):
-        xdpcHandler = XdpcHandler()
+        # The input processors only read a few fields, decode them once in the SDK callback
+        xdpcHandler = XdpcHandler(decode_samples=True)
 
         if not xdpcHandler.initialize():
             xdpcHandler.cleanup()
             exit(-1)
 
-        xdpcHandler.scanForDots()
-        if len(xdpcHandler.detectedDots()) == 0:
-            print("No Movella DOT device(s) found. Aborting.")
-            xdpcHandler.cleanup()
-            exit(-1)
+        # Reconnect the devices of the previous session first, only do a full scan if none of them are around
+        if not device_cache or not xdpcHandler.connectKnownDots(device_cache):
+            xdpcHandler.scanForDots(expected_count=expected_dots or None, addresses=whitelist, names=expected_names,
+                                    headless=headless)
+            if len(xdpcHandler.detectedDots()) == 0:
+                print("No Movella DOT device(s) found. Aborting.")
+                xdpcHandler.cleanup()
+                exit(-1)
 
-        xdpcHandler.connectDots()
+            xdpcHandler.connectDots(concurrent=True)
 
         if len(xdpcHandler.connectedDots()) == 0:
             print("Could not connect to any Movella DOT device(s). Aborting.")
             xdpcHandler.cleanup()
             exit(-1)
 
-        for device in xdpcHandler.connectedDots():
-            filterProfiles = device.getAvailableFilterProfiles()
-            print("Available filter profiles:")
-            for f in filterProfiles:
-                print(f.label())
-
-            print(f"Current profile: {device.onboardFilterProfile().label()}")
-            if device.setOnboardFilterProfile("General"):
-                print("Successfully set profile to General")
-            else:
-                print("Setting filter profile failed!")
-
-            print("Setting quaternion CSV output")
-            device.setLogOptions(movelladot_pc_sdk.XsLogOptions_Quaternion)
-
-            print("Putting device into measurement mode.")
-            if not device.startMeasurement(movelladot_pc_sdk.XsPayloadMode_ExtendedEuler):
-                print(f"Could not put device into measurement mode. Reason: {device.lastResultText()}")
-                continue
-
         return xdpcHandler
 
-    def inputProcessorLoop(self, inputProcessor, deviceIndex):
-        while not self.stop_event.is_set():
-            if self.xdpcHandler.packetsAvailable():
-                device = self.xdpcHandler.connectedDots()[deviceIndex]
-                inputProcessor.processInput(device)
+    def startMeasurement(self):
+        # Bound by address, so a processor keeps reading its device after the device reconnects
+        self.bindings = self.bindDevices()
+
+        # Each device only streams the fields the input processor bound to it reads
+        for inputProcessor, address in self.bindings:
+            self.xdpcHandler.registerConsumer(inputProcessor.requiredFields, bluetoothAddress=address)
+
+        print("Configuring devices and putting them into measurement mode.")
+        config = DeviceConfig(filterProfile="General",
+                              outputRate=NEGOTIATE,
+                              logOptions=movelladot_pc_sdk.XsLogOptions_Quaternion,
+                              payloadMode=NEGOTIATE)
+        for report in self.xdpcHandler.configureDots(config).values():
+            print(report)
+
+        if device_cache:
+            self.xdpcHandler.saveKnownDots(device_cache)
+
+        # Reconnect devices that power down or stop streaming, without stopping the others
+        self.xdpcHandler.superviseDots()
+        self.gamepad.start()
+
+    def bindDevices(self):
+        """
+        Pairs the input processors with the connected devices named in device_bindings of user_settings.
+        Processors without an entry take the remaining devices in connection order.
+
+        Returns:
+            A list of (input processor, bluetooth address) tuples, without the processors that have no device
+        """
+        devices = list(self.xdpcHandler.connectedDots())
+        chosen = dict()
+        for index, wanted in enumerate(device_bindings[:len(self.inputProcessors)]):
+            if not wanted:
+                continue
+            match = next((device for device in devices
+                          if wanted in (str(device.bluetoothAddress()), str(device.deviceTagName()))), None)
+            if match is None:
+                print(f"Warning: no connected DOT has the address or tag {wanted}.")
+                continue
+            chosen[index] = match
+            devices.remove(match)
+        for index in range(len(self.inputProcessors)):
+            if index not in chosen and not (index < len(device_bindings) and device_bindings[index]) and devices:
+                chosen[index] = devices.pop(0)
+
+        for index, inputProcessor in enumerate(self.inputProcessors):
+            if index not in chosen:
+                print(f"Warning: {type(inputProcessor).__name__} {index} has no device and stays idle.")
+        if devices:
+            unbound = ", ".join(f"{device.deviceTagName()} ({device.bluetoothAddress()})" for device in devices)
+            print(f"Warning: no input processor reads {unbound}, see device_bindings in user_settings.py.")
+        return [(self.inputProcessors[index], chosen[index].bluetoothAddress()) for index in sorted(chosen)]
 
     def loopData(self):
         # First printing some headers so we see which data belongs to which device
@@ -71,25 +113,31 @@ class AccelerometerGamepad:
             s += f"{device.bluetoothAddress():42}"
         print("%s" % s, flush=True)
 
-        # Create and start threads for input processors
-        threads = []
-        for i, inputProcessor in enumerate(self.inputProcessors):
-            if self.xdpcHandler.connectedDots().__len__() <= i:
-                break
-            thread = threading.Thread(target=self.inputProcessorLoop, args=(inputProcessor, i))
-            threads.append(thread)
-            thread.start()
+        # One thread runs all input processors, whenever their device delivers a sample
+        dispatcher = SampleDispatcher(self.xdpcHandler)
+        for inputProcessor, address in self.bindings:
+            dispatcher.add(address, inputProcessor.processSample, conflate=inputProcessor.conflate,
+                           name=f"{type(inputProcessor).__name__} {address}")
+        dispatcher.start()
 
         try:
-            while any(thread.is_alive() for thread in threads):
-                for thread in threads:
-                    thread.join(timeout=1)
+            while not self.stop_event.wait(timeout=1):
+                pass
         except KeyboardInterrupt:
             self.stop_event.set()
-            for thread in threads:
-                thread.join()
+        dispatcher.stop()
 
         print("\n-----------------------------------------", end="", flush=True)
+        self.xdpcHandler.stopSupervising()
+
+        for stats in dispatcher.stats():
+            print(f"\n{stats}", end="", flush=True)
+
+        for snapshot in self.xdpcHandler.streamStats().values():
+            print(f"\n{snapshot}", end="", flush=True)
+
+        self.gamepad.stop()
+        print(f"\nGamepad: {self.gamepad.stats()}, {self.gamepadState.stats()}", end="", flush=True)
 
         for device in self.xdpcHandler.connectedDots():
             print(f"\nResetting heading to default for device {device.portInfo().bluetoothAddress()}: ", end="", flush=True)
@@ -123,6 +171,12 @@ class AccelerometerGamepad:
     def changeSensitivity(self, value):
         self.setSens(value,value)
 
+    # slider position 0 turns the One Euro filter of the joystick off, 1 to 100 lower its cutoff for slow
+    # movements from 10 Hz (little smoothing) to 0.1 Hz
+    @pyqtSlot(int)
+    def changeSmoothing(self, value):
+        self.joystickInputProcessor.setSmoothing(10 ** (1 - value / 50) if value > 0 else None)
+
 
 
 
@@ -0,0 +1,13 @@
+from xdpc.filters import FilterPipeline
+from user_settings import tilt_filters, button_filters
+
+# Times the filter pipelines configured in user_settings, per sample as the input processors run them and in batches.
+# The tilt axes use the default sensitivities of the input processors.
+pipelines = {
+    "Tilt x": FilterPipeline([{"stage": "scale", "factor": 1 / 50}] + tilt_filters),
+    "Tilt y": FilterPipeline([{"stage": "scale", "factor": 1 / 10}] + tilt_filters),
+    "Button acceleration": FilterPipeline(button_filters),
+}
+
+for name, pipeline in pipelines.items():
+    print(f"{name}: {pipeline.benchmark()}")
@@ -0,0 +1,106 @@
+AXES = ("left_x", "left_y", "right_x", "right_y", "left_trigger", "right_trigger")
+
+
+class GamepadState:
+    """
+    Shadow copy of a vgamepad report that only reaches the driver when it differs from the last one sent
+
+    Takes the same button, joystick and trigger calls as the vgamepad gamepad but only records them. update()
+    compares the result with the report sent last and skips the driver call if nothing changed. An axis can be
+    given an epsilon: changes smaller than that are not worth a report on their own, e.g. sensor noise on a tilt
+    joystick. They are still sent along with any other change, and moving to the center or an end stop (0, -1
+    or 1) is always sent.
+    """
+
+    def __init__(self, gamepad, epsilon=0.0):
+        """
+        Parameters:
+            gamepad: The vgamepad gamepad, e.g. vg.VX360Gamepad()
+            epsilon: Smallest change worth a report, for all axes or as a dictionary from axis name in AXES
+        """
+        self.gamepad = gamepad
+        if isinstance(epsilon, dict):
+            self.epsilon = {axis: epsilon.get(axis, 0.0) for axis in AXES}
+        else:
+            self.epsilon = dict.fromkeys(AXES, epsilon)
+        self.axes = dict.fromkeys(AXES, 0.0)
+        self.sent_axes = dict(self.axes)
+        self.buttons = set()
+        self.sent_buttons = set()
+        # set when a call bypassed the shadow state, the next update is always sent
+        self.unknown = False
+        self.sent_reports = 0
+        self.skipped_reports = 0
+
+    def __getattr__(self, name):
+        # anything the shadow state doesn't model goes straight to the gamepad
+        attribute = getattr(self.gamepad, name)
+        if not callable(attribute):
+            return attribute
+
+        def bypass(*args, **kwargs):
+            self.unknown = True
+            return attribute(*args, **kwargs)
+        return bypass
+
+    def press_button(self, button):
+        self.buttons.add(button)
+
+    def release_button(self, button):
+        self.buttons.discard(button)
+
+    def left_joystick_float(self, x_value_float, y_value_float):
+        self.axes["left_x"] = x_value_float
+        self.axes["left_y"] = y_value_float
+
+    def right_joystick_float(self, x_value_float, y_value_float):
+        self.axes["right_x"] = x_value_float
+        self.axes["right_y"] = y_value_float
+
+    def left_trigger_float(self, value_float):
+        self.axes["left_trigger"] = value_float
+
+    def right_trigger_float(self, value_float):
+        self.axes["right_trigger"] = value_float
+
+    def reset(self):
+        self.buttons.clear()
+        self.axes = dict.fromkeys(AXES, 0.0)
+
+    def changed(self, axis):
+        value = self.axes[axis]
+        sent = self.sent_axes[axis]
+        if value == sent:
+            return False
+        return abs(value - sent) > self.epsilon[axis] or value in (0.0, -1.0, 1.0)
+
+    def update(self):
+        """
+        Sends the report to the driver if it differs from the last one sent
+
+        Returns:
+            True if a report was sent
+        """
+        if not self.unknown and self.buttons == self.sent_buttons and not any(self.changed(axis) for axis in AXES):
+            self.skipped_reports += 1
+            return False
+
+        for button in self.buttons - self.sent_buttons:
+            self.gamepad.press_button(button=button)
+        for button in self.sent_buttons - self.buttons:
+            self.gamepad.release_button(button=button)
+        axes = self.axes
+        self.gamepad.left_joystick_float(x_value_float=axes["left_x"], y_value_float=axes["left_y"])
+        self.gamepad.right_joystick_float(x_value_float=axes["right_x"], y_value_float=axes["right_y"])
+        self.gamepad.left_trigger_float(value_float=axes["left_trigger"])
+        self.gamepad.right_trigger_float(value_float=axes["right_trigger"])
+        self.gamepad.update()
+
+        self.sent_buttons = set(self.buttons)
+        self.sent_axes = dict(axes)
+        self.unknown = False
+        self.sent_reports += 1
+        return True
+
+    def stats(self):
+        return f"{self.sent_reports} reports sent, {self.skipped_reports} identical reports skipped"
@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
+from xdpc.deviceconfig import EULER, FREE_ACC
+from xdpc.filters import FilterPipeline
 import math
 import vgamepad as vg
 import time
 
 class InputProcessor(ABC):
-    def __init__(self, gamepad, xdpcHandler):
+    # processors that only care about the current pose skip stale samples instead of working through a backlog
+    conflate = False
+    # data fields the processor reads, the device is started with the smallest payload that carries them
+    requiredFields = ()
+    # filter stages applied to every signal the processor reads, see xdpc.filters.FilterPipeline
+    defaultFilters = ()
+
+    def __init__(self, gamepad, xdpcHandler, filters=None):
         self.gamepad = gamepad
         self.xdpcHandler = xdpcHandler
         # sensitivity for joystick axis, lower is more sensitive
@@ -13,29 +22,19 @@ class InputProcessor(ABC):
 
         # threshold for button press
         self.hysteresis_threshold = 7 
-        self.deadzone = 0.1  # Default deadzone value
+        self.filters = [dict(stage) for stage in (self.defaultFilters if filters is None else filters)]
+        self.buildFilters()
 
-    @abstractmethod
-    def processInput(self, device):
+    # compiles the filter stages into the functions processSample calls, again after every settings change
+    def buildFilters(self):
         pass
 
-    def updateRightJoystick(self, x_value, y_value): # todo maybe include deadzone
-        # Apply deadzone
-        if abs(x_value) < self.deadzone:
-            x_value = 0
-        if abs(y_value) < self.deadzone:
-            y_value = 0
-
-        if x_value > 1:
-            x_value = 1
-        if x_value < -1:
-            x_value = -1
-
-        if y_value > 1:
-            y_value = 1
-        if y_value < -1:
-            y_value = -1
+    # called by the SampleDispatcher with every sample of the device the processor is bound to
+    @abstractmethod
+    def processSample(self, sample):
+        pass
 
+    def updateRightJoystick(self, x_value, y_value):
         self.gamepad.right_joystick_float(x_value_float=x_value, y_value_float=y_value)
         self.gamepad.update()
 
@@ -45,68 +44,101 @@ class InputProcessor(ABC):
     def setSensitivity(self, x_sens, y_sens):
         self.x_sens = x_sens
         self.y_sens = y_sens   
+        self.buildFilters()
 
     def setDeadzone(self, deadzone):
-        self.deadzone = deadzone
+        self.filters = [dict(stage, width=deadzone) if stage["stage"] == "deadzone" else stage
+                        for stage in self.filters]
+        self.buildFilters()
+
+    # min_cutoff None removes the One Euro filter, otherwise it is added in front of the configured stages if missing,
+    # with a beta that lets a flick across the joystick range through at a few Hz
+    def setSmoothing(self, min_cutoff, beta=None):
+        if min_cutoff is None:
+            self.filters = [stage for stage in self.filters if stage["stage"] != "one_euro"]
+        else:
+            if not any(stage["stage"] == "one_euro" for stage in self.filters):
+                self.filters = [{"stage": "one_euro", "beta": 0.5}] + self.filters
+            parameters = {"min_cutoff": min_cutoff}
+            if beta is not None:
+                parameters["beta"] = beta
+            self.filters = [dict(stage, **parameters) if stage["stage"] == "one_euro" else stage
+                            for stage in self.filters]
+        self.buildFilters()
+
+    # time of the sample on the host clock, so filters and the debounce see when it was measured, not processed
+    def sampleTime(self, sample):
+        current_time = self.xdpcHandler.toHostTime(sample.address, sample.sampleTimeFine)
+        if current_time is None:
+            current_time = time.perf_counter()
+        return current_time
 
 class TiltInputProcessor(InputProcessor):
-    def __init__(self, gamepad, xdpcHandler):
-        super().__init__(gamepad, xdpcHandler)
+    conflate = True
+    requiredFields = (EULER,)
+    defaultFilters = ({"stage": "deadzone", "width": 0.1}, {"stage": "clamp", "low": -1.0, "high": 1.0})
+
+    def __init__(self, gamepad, xdpcHandler, filters=None):
+        super().__init__(gamepad, xdpcHandler, filters)
 
-      
+    def buildFilters(self):
+        # the sensitivity divides the angle before the configured stages, changing it restarts the filters
+        self.x_filter = FilterPipeline([{"stage": "scale", "factor": 1 / self.x_sens}] + self.filters).compile()
+        self.y_filter = FilterPipeline([{"stage": "scale", "factor": 1 / self.y_sens}] + self.filters).compile()
 
-    def processInput(self, device):
-        packet = self.xdpcHandler.getNextPacket(device.portInfo().bluetoothAddress())
+    def processSample(self, sample):
+        if sample.euler is None:
+            return
         s = ""
 
-        if packet.containsOrientation():
-            euler = packet.orientationEuler()
-            s += f"Roll:{euler.x():7.2f}, Pitch:{euler.y():7.2f}, Yaw:{euler.z():7.2f}| "
+        euler = sample.euler
+        s += f"Roll:{euler[0]:7.2f}, Pitch:{euler[1]:7.2f}, Yaw:{euler[2]:7.2f}| "
         
-        if packet.containsFreeAcceleration():
-            acc = packet.freeAcceleration()
+        if sample.freeAcc is not None:
+            acc = sample.freeAcc
             s += f"AccX:{acc[0]:7.2f}, AccY:{acc[2]:7.2f}, AccZ:{acc[1]:7.2f} | "
 
         #print("%s\r" % s, end="", flush=True)
         
-        x_value = euler.x() / self.x_sens
-        y_value = euler.y() / self.y_sens
-
-        self.updateRightJoystick(x_value, y_value)
+        # skipped samples and Bluetooth jitter change the interval, the One Euro filter adapts to the sample times
+        sample_time = self.sampleTime(sample)
+        self.updateRightJoystick(self.x_filter(euler[0], sample_time), self.y_filter(euler[1], sample_time))
 
 
 
 class ButtonInputProcessor(InputProcessor):
-    def __init__(self, gamepad, xdpcHandler, button):
-        super().__init__(gamepad, xdpcHandler)
-        self.filtered_acc = [0, 0, 0]
-        self.alpha = 0.5  # Smoothing factor for low-pass filter
+    requiredFields = (FREE_ACC,)
+    # low-pass filter on each acceleration axis
+    defaultFilters = ({"stage": "ema", "alpha": 0.5},)
+
+    def __init__(self, gamepad, xdpcHandler, button, filters=None):
+        super().__init__(gamepad, xdpcHandler, filters)
         self.hysteresis_buffer = 1  # Buffer to prevent spamming
         self.button_pressed = False
-        self.last_press_time = 0
+        self.last_press_time = float("-inf")
         self.debounce_time = 0.5  # 500 ms debounce time
         self.button = button  # Button to be pressed
 
 
-    def low_pass_filter(self, acc): # not sure if this helps
-        for i in range(3):
-            self.filtered_acc[i] = self.alpha * acc[i] + (1 - self.alpha) * self.filtered_acc[i]
-        return self.filtered_acc
+    def buildFilters(self):
+        pipeline = FilterPipeline(self.filters)
+        self.acc_filters = [pipeline.compile() for _ in range(3)]
 
-    def processInput(self, device):
-        packet = self.xdpcHandler.getNextPacket(device.portInfo().bluetoothAddress())
+    def processSample(self, sample):
+        if sample.freeAcc is None:
+            return
         s = ""
 
-        if packet.containsFreeAcceleration():
-            acc = packet.freeAcceleration()
-            filtered_acc = self.low_pass_filter(acc)
-            totalAcc = math.sqrt(sum(fa ** 2 for fa in filtered_acc))
-            s += f"AccX:{filtered_acc[0]:7.2f}, AccY:{filtered_acc[2]:7.2f}, AccZ:{filtered_acc[1]:7.2f}, AccTot:{totalAcc:7.2f}  | "
+        acc = sample.freeAcc
+        filtered_acc = [self.acc_filters[0](acc[0]), self.acc_filters[1](acc[1]), self.acc_filters[2](acc[2])]
+        totalAcc = math.sqrt(sum(fa ** 2 for fa in filtered_acc))
+        s += f"AccX:{filtered_acc[0]:7.2f}, AccY:{filtered_acc[2]:7.2f}, AccZ:{filtered_acc[1]:7.2f}, AccTot:{totalAcc:7.2f}  | "
         
 
         #print("%s\r" % s, end="", flush=True)
 
-        current_time = time.time()
+        # the sample's own timestamp, so queueing delays don't count towards the debounce
+        current_time = self.sampleTime(sample)
         if totalAcc > self.hysteresis_threshold and not self.button_pressed:
             if current_time - self.last_press_time > self.debounce_time:
                 self.button_pressed = True
@@ -0,0 +1,106 @@
+import threading
+import time
+
+
+class OutputScheduler:
+    """
+    Stands in for a vgamepad gamepad and sends at most one report to the driver per tick
+
+    The input processors change the report (buttons, joysticks, triggers) through the usual vgamepad methods and
+    call update() whenever they changed something. With several processors on several devices that is a driver
+    call per sample per processor, while the game only sees the report at its own frame rate. Here update() only
+    marks the report as changed; a background thread sends it rate times per second, or the owner calls tick()
+    itself, e.g. once per frame, when rate is None.
+    """
+
+    def __init__(self, gamepad, rate=120):
+        """
+        Parameters:
+            gamepad: The vgamepad gamepad, e.g. vg.VX360Gamepad()
+            rate: Reports per second sent by the background thread, None to call tick() yourself
+        """
+        self.gamepad = gamepad
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.requested_updates = 0
+        self.sent_updates = 0
+        self.driver_time = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def __getattr__(self, name):
+        # press_button, right_joystick_float, ... change the shared report, serialize them with the tick
+        attribute = getattr(self.gamepad, name)
+        if not callable(attribute):
+            return attribute
+
+        def locked(*args, **kwargs):
+            with self.lock:
+                return attribute(*args, **kwargs)
+        return locked
+
+    def update(self):
+        with self.lock:
+            self.dirty = True
+            self.requested_updates += 1
+
+    def tick(self):
+        """
+        Sends the report to the driver if it changed since the last tick
+
+        Returns:
+            True if a report was sent
+        """
+        with self.lock:
+            if not self.dirty:
+                return False
+            self.dirty = False
+            start_time = time.perf_counter()
+            self.gamepad.update()
+            self.driver_time += time.perf_counter() - start_time
+            self.sent_updates += 1
+        return True
+
+    def start(self):
+        if self.rate is None or self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread and sends the last change
+        """
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        self.tick()
+
+    def run(self):
+        period = 1.0 / self.rate
+        next_tick = time.perf_counter()
+        while not self.stop_event.is_set():
+            self.tick()
+            # fixed schedule, a slow driver call doesn't push the following ticks back
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                next_tick = time.perf_counter()
+            elif self.stop_event.wait(delay):
+                break
+
+    def savedUpdates(self):
+        """
+        Returns:
+            The number of update() calls that did not cause a driver call
+        """
+        return self.requested_updates - self.sent_updates
+
+    def stats(self):
+        mean = self.driver_time / self.sent_updates if self.sent_updates else 0.0
+        return (f"{self.requested_updates} updates requested, {self.sent_updates} sent, "
+                f"{self.savedUpdates()} saved, {self.driver_time * 1000:.1f} ms in the driver "
+                f"({mean * 1e6:.0f} us per report)")
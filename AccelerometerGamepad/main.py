@@ -101,6 +101,7 @@ class MainWindow(QMainWindow):
     circle = MovableCircle
 
     changeSensitivity = pyqtSignal(object)
+    changeSmoothing = pyqtSignal(int)
 
     def __init__(self):
         super().__init__()
@@ -115,6 +116,13 @@ class MainWindow(QMainWindow):
         self.changeSensitivity.connect(AccelerometerGamepad.changeSensitivity)
         layout.addWidget(self.slider, 0, 2)
 
+        # One Euro filter of the joystick, 0 is off
+        self.smoothingSlider = QSlider(Qt.Orientation.Horizontal)
+        self.smoothingSlider.setRange(0, 100)
+        self.smoothingSlider.setValue(0)
+        self.smoothingSlider.sliderReleased.connect(self.setSmoothing)
+        layout.addWidget(self.smoothingSlider, 0, 1)
+
         widget = QWidget()
         widget.setLayout(layout)
         self.setCentralWidget(widget)
@@ -173,6 +181,7 @@ class MainWindow(QMainWindow):
 
     def accelerometer_worker(self) :
         gamepad = AccelerometerGamepad()
+        self.changeSmoothing.connect(gamepad.changeSmoothing)
         gamepad.loopData()
 
     def activate_controller(self):
@@ -191,6 +200,9 @@ class MainWindow(QMainWindow):
     def setSensitivity(self):
         self.changeSensitivity.emit(self.slider.tickPosition)
 
+    def setSmoothing(self):
+        self.changeSmoothing.emit(self.smoothingSlider.value())
+
 
 app = QApplication(sys.argv)
 window = MainWindow()
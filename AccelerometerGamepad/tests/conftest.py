@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# the app modules import each other by module name, like main.py does when run from AccelerometerGamepad
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeGamepad:
+    """
+    Records the calls a vgamepad gamepad receives
+    """
+
+    def __init__(self):
+        self.calls = list()
+        self.reports = 0
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return call
+
+    def update(self):
+        self.reports += 1
+
+
+@pytest.fixture
+def gamepad():
+    return FakeGamepad()
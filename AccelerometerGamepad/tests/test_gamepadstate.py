@@ -0,0 +1,44 @@
+from GamepadState import GamepadState
+
+
+def test_identical_reports_are_skipped(gamepad):
+    state = GamepadState(gamepad)
+
+    state.press_button("A")
+    state.right_joystick_float(x_value_float=0.5, y_value_float=0.0)
+    assert state.update()
+    state.press_button("A")
+    state.right_joystick_float(x_value_float=0.5, y_value_float=0.0)
+    assert not state.update()
+
+    state.release_button("A")
+    assert state.update()
+    assert ("release_button", (), {"button": "A"}) in gamepad.calls
+    assert (gamepad.reports, state.sent_reports, state.skipped_reports) == (2, 2, 1)
+
+
+def test_changes_below_epsilon_wait_for_another_change(gamepad):
+    state = GamepadState(gamepad, epsilon={"right_x": 0.05})
+
+    state.right_joystick_float(x_value_float=0.03, y_value_float=0.0)
+    assert not state.update()
+    state.left_trigger_float(value_float=0.5)
+    assert state.update()
+    assert ("right_joystick_float", (), {"x_value_float": 0.03, "y_value_float": 0.0}) in gamepad.calls
+
+    # the end stops are always sent
+    state.right_joystick_float(x_value_float=0.0, y_value_float=0.0)
+    assert state.update()
+    state.right_joystick_float(x_value_float=0.99, y_value_float=0.0)
+    assert state.update()
+    state.right_joystick_float(x_value_float=1.0, y_value_float=0.0)
+    assert state.update()
+
+
+def test_calls_the_shadow_state_does_not_model_force_a_report(gamepad):
+    state = GamepadState(gamepad)
+
+    state.left_joystick(x_value=100, y_value=0)
+    assert state.update()
+    assert not state.update()
+    assert gamepad.calls[0] == ("left_joystick", (), {"x_value": 100, "y_value": 0})
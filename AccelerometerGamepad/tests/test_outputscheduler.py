@@ -0,0 +1,33 @@
+import time
+
+from OutputScheduler import OutputScheduler
+
+
+def test_scheduler_sends_one_report_per_tick(gamepad):
+    scheduler = OutputScheduler(gamepad, rate=None)
+
+    for value in (0.1, 0.2, 0.3):
+        scheduler.right_joystick_float(x_value_float=value, y_value_float=0.0)
+        scheduler.update()
+
+    assert scheduler.tick()
+    assert not scheduler.tick()
+    assert gamepad.reports == 1
+    assert len(gamepad.calls) == 3
+    assert scheduler.savedUpdates() == 2
+
+
+def test_scheduler_thread_sends_changes_and_the_last_one_on_stop(gamepad):
+    scheduler = OutputScheduler(gamepad, rate=200)
+    scheduler.start()
+
+    scheduler.update()
+    deadline = time.perf_counter() + 1.0
+    while gamepad.reports == 0 and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    assert gamepad.reports == 1
+
+    scheduler.update()
+    scheduler.stop()
+    assert gamepad.reports == 2
+    assert scheduler.thread is None
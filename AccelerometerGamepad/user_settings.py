@@ -28,9 +28,34 @@
 #  
 
 import getpass
+import os
 
 whitelist = list()
 dot_basename = "movella"
 username = getpass.getuser().lower()
 whitelist = {}
 dot_basename = "Movella DOT"
+
+# Stop scanning as soon as these devices are found instead of waiting for a key press or the 20 second timeout.
+# 0 / empty disables the target. The whitelist is used as a target too.
+expected_dots = 0
+# Bluetooth names the devices advertise, e.g. "Movella DOT", these are not the tags set in the Movella DOT app
+expected_names = []
+# Don't listen for a key press while scanning, for setups without a keyboard
+headless = False
+# Devices connected in earlier sessions are reconnected first, the scan for them stops as soon as they advertised.
+# None disables the cache
+device_cache = os.path.join(os.path.expanduser("~"), ".xdpc_known_dots.json")
+# Bluetooth address or tag of the device read by the tilt joystick, the A button and the START button, in that order.
+# Empty entries and missing ones take the remaining connected devices in connection order.
+device_bindings = []
+# Reports per second sent to the virtual gamepad, however many samples the input processors handle
+gamepad_update_rate = 120
+# Joystick and trigger changes smaller than this don't cause a report on their own, e.g. {"right_x": 0.01}
+gamepad_axis_epsilon = 0.0
+# Filter stages of the tilt joystick axes after the division by the sensitivity, and of the button accelerations.
+# Stages: scale, deadzone, clamp, ema, median, rate_limit, one_euro, see xdpc.filters.FilterPipeline.
+# FilterBenchmark.py times them. {"stage": "one_euro", "min_cutoff": 1.0, "beta": 0.5} in front of the deadzone
+# steadies slow tilting without slowing down fast flicks, the smoothing slider of main.py sets min_cutoff.
+tilt_filters = [{"stage": "deadzone", "width": 0.1}, {"stage": "clamp", "low": -1.0, "high": 1.0}]
+button_filters = [{"stage": "ema", "alpha": 0.5}]
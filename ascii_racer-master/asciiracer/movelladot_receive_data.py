@@ -9,35 +9,31 @@ def receiveData():
         xdpcHandler.cleanup()
         return()
 
-    xdpcHandler.scanForDots()
-    if len(xdpcHandler.detectedDots()) == 0:
-        print("No Movella DOT device(s) found. Aborting.")
-        xdpcHandler.cleanup()
-        return()
+    # Reconnect the devices of the previous session first, only do a full scan if none of them are around
+    if not device_cache or not xdpcHandler.connectKnownDots(device_cache):
+        xdpcHandler.scanForDots(expected_count=expected_dots or None, addresses=whitelist, names=expected_names,
+                                headless=headless)
+        if len(xdpcHandler.detectedDots()) == 0:
+            print("No Movella DOT device(s) found. Aborting.")
+            xdpcHandler.cleanup()
+            return()
 
-    xdpcHandler.connectDots()
+        xdpcHandler.connectDots(concurrent=True)
 
     if len(xdpcHandler.connectedDots()) == 0:
         print("Could not connect to any Movella DOT device(s). Aborting.")
         xdpcHandler.cleanup()
         return()
 
-    for device in xdpcHandler.connectedDots():
-        filterProfiles = device.getAvailableFilterProfiles()
-        print("Available filter profiles:")
-        for f in filterProfiles:
-            print(f.label())
-
-        print(f"Current profile: {device.onboardFilterProfile().label()}")
-        if device.setOnboardFilterProfile("General"):
-            print("Successfully set profile to General")
-        else:
-            print("Setting filter profile failed!")
+    print("Configuring devices and putting them into measurement mode.")
+    # Only the euler angles are sent to the game
+    xdpcHandler.registerConsumer([EULER])
+    config = DeviceConfig(filterProfile="General", payloadMode=NEGOTIATE)
+    for report in xdpcHandler.configureDots(config).values():
+        print(report)
 
-        print("Putting device into measurement mode.")
-        if not device.startMeasurement(movelladot_pc_sdk.XsPayloadMode_ExtendedEuler):
-            print(f"Could not put device into measurement mode. Reason: {device.lastResultText()}")
-            continue
+    if device_cache:
+        xdpcHandler.saveKnownDots(device_cache)
 
     print("\nMain loop. Recording data")
     print("-----------------------------------------")
@@ -58,7 +54,9 @@ def receiveData():
     print(f"Connected by {addr}")
 
     while True:
-        if xdpcHandler.packetsAvailable():
+        # Block until every device has a packet instead of spinning on packetsAvailable()
+        if all(xdpcHandler.waitForPacket(device.portInfo().bluetoothAddress(), timeout=0.1)
+               for device in xdpcHandler.connectedDots()):
             s = ""
             for device in xdpcHandler.connectedDots():
                 # Retrieve a packet
@@ -1,8 +1,20 @@
 
 import getpass
+import os
 
 whitelist = list()
 dot_basename = "movella"
 username = getpass.getuser().lower()
 whitelist = {}
 dot_basename = "Movella DOT"
+
+# Stop scanning as soon as these devices are found instead of waiting for a key press or the 20 second timeout.
+# 0 / empty disables the target. The whitelist is used as a target too.
+expected_dots = 0
+# Bluetooth names the devices advertise, e.g. "Movella DOT", these are not the tags set in the Movella DOT app
+expected_names = []
+# Don't listen for a key press while scanning, for setups without a keyboard
+headless = False
+# Devices connected in earlier sessions are reconnected first, the scan for them stops as soon as they advertised.
+# None disables the cache
+device_cache = os.path.join(os.path.expanduser("~"), ".xdpc_known_dots.json")
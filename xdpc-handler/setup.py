@@ -0,0 +1,16 @@
+import setuptools
+
+setuptools.setup(
+    name='xdpc',
+    version='1.0.0',
+    python_requires='>=3.9',
+    description='Shared handler for Movella DOT sensors',
+    packages=setuptools.find_packages(),
+    install_requires=[
+        'numpy',
+    ],
+    extras_require={
+        # ending a scan with a key press
+        'keyboard': ['pynput'],
+    },
+)
@@ -0,0 +1,50 @@
+"""
+Shared handler for Movella DOT sensors, used by AccelerometerGamepad, the ASCII racer receiver and the Movella
+examples.
+
+Importing the package is cheap: the names below are looked up on first use, so the SDK is only loaded when
+XdpcHandler (or movelladot_pc_sdk) is first used, NumPy with the first sample type, and pynput only when a scan
+listens for a key press. tests/test_import_time.py keeps it that way.
+"""
+import importlib
+
+# exported name -> submodule that defines it
+_EXPORTS = {
+    "XdpcHandler": "handler",
+    "ConnectionResult": "handler",
+    "AsyncXdpcHandler": "asyncxdpc",
+    "DeviceConfig": "deviceconfig",
+    "NEGOTIATE": "deviceconfig",
+    "EULER": "deviceconfig",
+    "FREE_ACC": "deviceconfig",
+    "QUATERNION": "deviceconfig",
+    "PacketRingBuffer": "packetbuffer",
+    "Subscription": "packetbuffer",
+    "DROP_OLDEST": "packetbuffer",
+    "DROP_NEWEST": "packetbuffer",
+    "BLOCK": "packetbuffer",
+    "DotSample": "samples",
+    "SAMPLE_DTYPE": "samples",
+    "StreamSnapshot": "streamstats",
+    "EventLog": "eventlog",
+    "ClockMapping": "clockmap",
+    "FrameAssembler": "framesync",
+    "FilterPipeline": "filters",
+    "SampleDispatcher": "dispatcher",
+    "SessionRecorder": "sessionrecorder",
+    "openSession": "sessionrecorder",
+}
+
+__all__ = ["movelladot_pc_sdk"] + list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name == "movelladot_pc_sdk":
+        from .sdk import loadSdk
+        value = loadSdk()
+    elif name in _EXPORTS:
+        value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
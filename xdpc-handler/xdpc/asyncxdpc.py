@@ -0,0 +1,212 @@
+from collections import deque
+from .handler import XdpcHandler
+import asyncio
+import functools
+
+
+class _Stream:
+    """
+    Samples of one stream() call waiting to be consumed, only touched on the event loop thread
+    """
+
+    def __init__(self, bluetoothAddress, conflate, maxSize):
+        self.address = str(bluetoothAddress)
+        self.pending = deque(maxlen=1 if conflate else maxSize)
+        self.ready = asyncio.Event()
+        self.closed = False
+
+    def put(self, sample):
+        self.pending.append(sample)
+        self.ready.set()
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+
+class AsyncXdpcHandler:
+    """
+    asyncio front end for an XdpcHandler
+
+    Live data and completion callbacks of the SDK are handed to the event loop with call_soon_threadsafe, so
+    coroutines can await them without a thread per device. The blocking SDK calls (scanning, opening ports,
+    configuring) run in the loop's default executor.
+
+        handler = AsyncXdpcHandler(XdpcHandler(decode_samples=True))
+        await handler.initialize()
+        await handler.scan(expected_count=2)
+        await handler.connect()
+        await handler.startMeasurement(DeviceConfig(payloadMode=XsPayloadMode_ExtendedEuler))
+        async for sample in handler.stream(address):
+            ...
+
+    Create it from inside the event loop, or pass the loop, since callbacks are delivered to that loop.
+    """
+
+    def __init__(self, xdpcHandler=None, loop=None):
+        """
+        Parameters:
+            xdpcHandler: The XdpcHandler to wrap, None creates one with decode_samples=True
+            loop: The event loop callbacks are delivered to, None for the running loop
+        """
+        self.xdpcHandler = xdpcHandler if xdpcHandler is not None else XdpcHandler(decode_samples=True)
+        self.__loop = loop if loop is not None else asyncio.get_running_loop()
+        self.__streams = set()
+        self.__waiters = list()
+        self.__closed = False
+        self.xdpcHandler.addEventListener(self._onEvent)
+
+    async def initialize(self):
+        """
+        Returns:
+            False if there was a problem creating a connection manager, see XdpcHandler.initialize
+        """
+        return await self._run(self.xdpcHandler.initialize)
+
+    async def scan(self, expected_count=None, addresses=None, names=None, timeout=20.0):
+        """
+        Scans for Movella DOTs until the target is reached, see XdpcHandler.scanForDots. Without a target it
+        scans for timeout seconds.
+
+        Returns:
+            The detected XsPortInfo of every device found
+        """
+        await self._run(self.xdpcHandler.scanForDots, expected_count, addresses, names, timeout, headless=True)
+        return self.xdpcHandler.detectedDots()
+
+    async def connect(self, max_workers=4, timeout=15.0, retries=3, backoff=0.5):
+        """
+        Opens the detected Movella DOTs concurrently, see XdpcHandler.connectDots
+
+        Returns:
+            The connected XsDotDevices
+        """
+        await self._run(self.xdpcHandler.connectDots, concurrent=True, max_workers=max_workers, timeout=timeout,
+                        retries=retries, backoff=backoff)
+        return self.xdpcHandler.connectedDots()
+
+    async def startMeasurement(self, config, max_workers=4):
+        """
+        Configures the connected Movella DOTs and puts them into measurement mode, see XdpcHandler.configureDots
+
+        Parameters:
+            config: The DeviceConfig to apply, its payloadMode starts the measurement
+        Returns:
+            A dictionary from bluetooth address to the ConfigurationReport of that device
+        """
+        return await self._run(self.xdpcHandler.configureDots, config, max_workers)
+
+    async def stopMeasurement(self):
+        """
+        Returns:
+            True if every connected Movella DOT stopped measuring
+        """
+        def stop():
+            return all([device.stopMeasurement() for device in self.xdpcHandler.connectedDots()])
+        return await self._run(stop)
+
+    async def cleanup(self):
+        """
+        Closes the connections, see XdpcHandler.cleanup. Running streams end.
+        """
+        await self._run(self.xdpcHandler.cleanup)
+
+    async def stream(self, bluetoothAddress, conflate=False, max_size=128):
+        """
+        Yields the live data of one Movella DOT as it arrives, until cleanup is called
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the device
+            conflate: Only keep the newest sample when the consumer falls behind
+            max_size: Number of samples kept for a slow consumer before the oldest are dropped
+        Yields:
+            The DotSample, or a copy of the XsDataPacket if the handler does not decode samples
+        """
+        if self.__closed:
+            return
+        stream = _Stream(bluetoothAddress, conflate, max_size)
+
+        def listener(address, sample):
+            if address == stream.address:
+                self._post(stream.put, sample)
+
+        self.__streams.add(stream)
+        self.xdpcHandler.addSampleListener(listener)
+        try:
+            while True:
+                if stream.pending:
+                    yield stream.pending.popleft()
+                elif stream.closed:
+                    return
+                else:
+                    stream.ready.clear()
+                    await stream.ready.wait()
+        finally:
+            self.xdpcHandler.removeSampleListener(listener)
+            self.__streams.discard(stream)
+
+    def event(self, name):
+        """
+        Parameters:
+            name: An event name of XdpcHandler.addEventListener, e.g. "exportDone"
+        Returns:
+            A future for the next event with this name, resolving to a tuple of the event's arguments. Create it
+            before starting the operation, an event that already happened is not replayed.
+        """
+        future = self.__loop.create_future()
+        self.__waiters.append((name, future))
+        return future
+
+    def exportDone(self):
+        """
+        Returns:
+            A future that resolves to (device,) when the running recording export finishes
+        """
+        return self.event("exportDone")
+
+    def updateDone(self):
+        """
+        Returns:
+            A future that resolves to (portInfo, result) when the running firmware update finishes
+        """
+        return self.event("updateDone")
+
+    def recordingStopped(self):
+        """
+        Returns:
+            A future that resolves to (device,) when the running recording stops
+        """
+        return self.event("recordingStopped")
+
+    def _onEvent(self, name, *args):
+        # SDK callback thread
+        self._post(self._resolve, name, args)
+
+    def _resolve(self, name, args):
+        # event loop thread
+        if name == "closed":
+            self.__closed = True
+            for stream in self.__streams:
+                stream.close()
+        waiting = list()
+        for waiterName, future in self.__waiters:
+            if future.done():
+                continue
+            if waiterName == name:
+                future.set_result(args)
+            elif name == "closed":
+                # nothing completes after the connection manager is gone
+                future.cancel()
+            else:
+                waiting.append((waiterName, future))
+        self.__waiters = waiting
+
+    def _post(self, callback, *args):
+        try:
+            self.__loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # the event loop was closed while the SDK kept calling back
+            pass
+
+    def _run(self, function, *args, **kwargs):
+        return self.__loop.run_in_executor(None, functools.partial(function, *args, **kwargs))
@@ -0,0 +1,102 @@
+from .samples import SAMPLE_TIME_FINE_RANGE
+
+
+class ClockMapping:
+    """
+    Online linear fit from the sampleTimeFine of one Movella DOT to the host clock (time.perf_counter)
+
+    sampleTimeFine is a 32-bit microsecond counter that wraps every 71.6 minutes and runs at the sensor's crystal,
+    which drifts against the host by tens of ppm. Every packet adds the pair (unwrapped sampleTimeFine, arrival
+    time) to an exponentially weighted least squares fit, so the offset and drift follow slow changes without
+    keeping any history. The update is O(1) and uses centered running moments to stay accurate in long sessions.
+
+    Arrival times include the Bluetooth transport latency, so mapped times are when a sample arrives on average,
+    with the jitter of individual packets removed.
+    """
+
+    def __init__(self, halfLife=2000):
+        """
+        Parameters:
+            halfLife: Number of samples after which a sample counts half in the fit
+        """
+        self.__decay = 0.5 ** (1.0 / halfLife)
+        self.__lastSampleTimeFine = None
+        self.__unwrapped = 0
+        self.__originHostTime = 0.0
+        self.__weight = 0.0
+        self.__meanSensor = 0.0
+        self.__meanHost = 0.0
+        self.__covarianceSensor = 0.0
+        self.__covarianceSensorHost = 0.0
+        self.__samples = 0
+
+    def __len__(self):
+        return self.__samples
+
+    def update(self, sampleTimeFine, hostTime):
+        """
+        Parameters:
+            sampleTimeFine: The sampleTimeFine of a packet in microseconds
+            hostTime: The time.perf_counter time the packet arrived at
+        """
+        if self.__lastSampleTimeFine is None:
+            self.__originHostTime = hostTime
+        else:
+            self.__unwrapped = self._unwrap(sampleTimeFine)
+        self.__lastSampleTimeFine = sampleTimeFine
+        self.__samples += 1
+
+        sensor = self.__unwrapped * 1e-6
+        host = hostTime - self.__originHostTime
+        self.__weight = self.__weight * self.__decay + 1.0
+        rate = 1.0 / self.__weight
+        deltaSensor = sensor - self.__meanSensor
+        deltaHost = host - self.__meanHost
+        self.__meanSensor += rate * deltaSensor
+        self.__meanHost += rate * deltaHost
+        self.__covarianceSensor = (1.0 - rate) * (self.__covarianceSensor + rate * deltaSensor * deltaSensor)
+        self.__covarianceSensorHost = (1.0 - rate) * (self.__covarianceSensorHost + rate * deltaSensor * deltaHost)
+
+    def slope(self):
+        """
+        Returns:
+            Host seconds per sensor second, 1.0 until the fit has samples spread over time
+        """
+        if self.__covarianceSensor <= 1e-12:
+            return 1.0
+        return self.__covarianceSensorHost / self.__covarianceSensor
+
+    def drift(self):
+        """
+        Returns:
+            How much faster the host clock runs than the sensor clock, in ppm
+        """
+        return (self.slope() - 1.0) * 1e6
+
+    def offset(self):
+        """
+        Returns:
+            The host time the fit assigns to the first sampleTimeFine it saw, None before the first update
+        """
+        if self.__lastSampleTimeFine is None:
+            return None
+        return self.__originHostTime + self.__meanHost - self.slope() * self.__meanSensor
+
+    def toHostTime(self, sampleTimeFine):
+        """
+        Parameters:
+            sampleTimeFine: A sampleTimeFine within half a wrap (35 minutes) of the latest update
+        Returns:
+            The matching time.perf_counter time, None before the first update
+        """
+        if self.__lastSampleTimeFine is None:
+            return None
+        sensor = self._unwrap(sampleTimeFine) * 1e-6
+        return self.__originHostTime + self.__meanHost + self.slope() * (sensor - self.__meanSensor)
+
+    def _unwrap(self, sampleTimeFine):
+        # the shortest way around the wrap from the latest timestamp, so slightly older timestamps map correctly
+        delta = (sampleTimeFine - self.__lastSampleTimeFine) % SAMPLE_TIME_FINE_RANGE
+        if delta >= SAMPLE_TIME_FINE_RANGE // 2:
+            delta -= SAMPLE_TIME_FINE_RANGE
+        return self.__unwrapped + delta
@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+
+def loadKnownDots(path):
+    """
+    Reads the known-device cache written by saveKnownDots
+
+    Parameters:
+        path: The cache file
+    Returns:
+        A dictionary from bluetooth address to the cached entry, empty if the file is missing or unreadable
+    """
+    try:
+        with open(path) as file:
+            entries = json.load(file)
+    except (OSError, ValueError):
+        return dict()
+    return {entry["address"]: entry for entry in entries if "address" in entry}
+
+
+def saveKnownDots(path, entries):
+    """
+    Writes the known-device cache, replacing the file atomically so a crash can't leave half a cache behind
+
+    Parameters:
+        path: The cache file
+        entries: Iterable of dictionaries with at least an "address" key
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporaryPath = path + ".tmp"
+    with open(temporaryPath, "w") as file:
+        json.dump(list(entries), file, indent=2)
+    os.replace(temporaryPath, path)
+
+
+def knownDotEntry(device):
+    """
+    Describes a connected XsDotDevice for the known-device cache
+
+    Parameters:
+        device: The connected XsDotDevice
+    Returns:
+        A dictionary with the port identity (address, device id, advertised port name), tag, filter profile and
+        output rate of the device
+    """
+    portInfo = device.portInfo()
+    return {
+        "address": str(portInfo.bluetoothAddress()),
+        "deviceId": portInfo.deviceId().toInt(),
+        "tag": str(device.deviceTagName()),
+        "portName": str(portInfo.portName()),
+        "filterProfile": str(device.onboardFilterProfile().label()),
+        "outputRate": device.outputRate(),
+        "lastConnected": time.time(),
+    }
@@ -0,0 +1,180 @@
+import time
+
+APPLIED = "applied"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+# Use as payloadMode or outputRate of a DeviceConfig to let XdpcHandler.negotiatePayload pick the value per device
+NEGOTIATE = "negotiate"
+
+# Data fields a consumer of live data can ask for
+EULER = "euler"
+FREE_ACC = "freeAcc"
+QUATERNION = "quaternion"
+
+# Real-time payload modes with the fields they carry and their size in bytes per packet, smallest first.
+# Every mode also carries sampleTimeFine.
+PAYLOAD_MODES = (
+    ("XsPayloadMode_OrientationEuler", frozenset((EULER,)), 16),
+    ("XsPayloadMode_FreeAcceleration", frozenset((FREE_ACC,)), 16),
+    ("XsPayloadMode_OrientationQuaternion", frozenset((QUATERNION,)), 20),
+    ("XsPayloadMode_CompleteEuler", frozenset((EULER, FREE_ACC)), 28),
+    ("XsPayloadMode_CompleteQuaternion", frozenset((QUATERNION, FREE_ACC)), 32),
+)
+DEFAULT_PAYLOAD_MODE = "XsPayloadMode_ExtendedEuler"
+
+SUPPORTED_OUTPUT_RATES = (1, 4, 10, 12, 15, 20, 30, 60, 120)
+
+
+def smallestPayloadMode(fields):
+    """
+    Parameters:
+        fields: The data fields that have to be in the payload
+    Returns:
+        The name of the smallest payload mode in PAYLOAD_MODES that carries all fields, or
+        DEFAULT_PAYLOAD_MODE if no fields are needed or no single mode carries them all
+    """
+    fields = frozenset(fields)
+    if not fields:
+        return DEFAULT_PAYLOAD_MODE
+    for name, carried, size in PAYLOAD_MODES:
+        if fields <= carried:
+            return name
+    return DEFAULT_PAYLOAD_MODE
+
+
+def lowestOutputRate(rate):
+    """
+    Returns:
+        The lowest supported output rate of at least rate Hz, None if rate is None
+    """
+    if rate is None:
+        return None
+    for supported in SUPPORTED_OUTPUT_RATES:
+        if supported >= rate:
+            return supported
+    return SUPPORTED_OUTPUT_RATES[-1]
+
+
+class DeviceConfig:
+    """
+    Desired state of a Movella DOT at the start of a session
+
+    Settings left at None are not touched.
+        filterProfile: Label of the onboard filter profile, e.g. "General" or "Dynamic"
+        outputRate: Output rate in Hz
+        logOptions: XsLogOptions value for the CSV logging of the SDK
+        payloadMode: XsPayloadMode to start measuring with, None leaves the device idle
+    payloadMode and outputRate can be NEGOTIATE, XdpcHandler.configureDots then asks negotiatePayload for the
+    smallest payload and lowest rate that satisfy the consumers registered for each device.
+    """
+
+    def __init__(self, filterProfile="General", outputRate=None, logOptions=None, payloadMode=None):
+        self.filterProfile = filterProfile
+        self.outputRate = outputRate
+        self.logOptions = logOptions
+        self.payloadMode = payloadMode
+
+
+class ConfigurationStep:
+    """
+    Outcome and duration of one setting applied by configureDevice
+
+        name: The setting, e.g. "filterProfile"
+        status: APPLIED, SKIPPED because it already matched, or FAILED
+        seconds: Time spent on the step, including reading the current state
+        detail: The failure reason reported by the device, empty otherwise
+    """
+    __slots__ = ("name", "status", "seconds", "detail")
+
+    def __init__(self, name, status, seconds, detail=""):
+        self.name = name
+        self.status = status
+        self.seconds = seconds
+        self.detail = detail
+
+    def __str__(self):
+        text = f"{self.name} {self.status} ({self.seconds * 1000:.0f} ms)"
+        return f"{text}: {self.detail}" if self.detail else text
+
+
+class ConfigurationReport:
+    """
+    All steps configureDevice took for one Movella DOT
+    """
+
+    def __init__(self, address):
+        self.address = address
+        self.steps = list()
+
+    def succeeded(self):
+        """
+        Returns:
+            True if no step failed
+        """
+        return all(step.status != FAILED for step in self.steps)
+
+    def seconds(self):
+        """
+        Returns:
+            The total time spent configuring the device
+        """
+        return sum(step.seconds for step in self.steps)
+
+    def __str__(self):
+        return f"{self.address} ({self.seconds():.2f} s): " + ", ".join(str(step) for step in self.steps)
+
+
+def _step(report, name, matches, apply, device):
+    """
+    Runs one configuration step: skips it if matches() is True, otherwise calls apply() and records the result
+    """
+    startTime = time.perf_counter()
+    if matches():
+        report.steps.append(ConfigurationStep(name, SKIPPED, time.perf_counter() - startTime))
+        return True
+    ok = apply()
+    detail = "" if ok else str(device.lastResultText())
+    report.steps.append(ConfigurationStep(name, APPLIED if ok else FAILED, time.perf_counter() - startTime, detail))
+    return ok
+
+
+def configureDevice(device, config, applied):
+    """
+    Brings one Movella DOT into the state described by config, skipping settings that already match
+
+    Every device call is a blocking BLE round trip, so the current state is only read where the SDK offers a
+    getter. Log options and the payload mode cannot be read back, those are compared against applied instead.
+
+    Parameters:
+        device: The connected XsDotDevice
+        config: The DeviceConfig to apply
+        applied: Dictionary with the settings applied to this device earlier in the session, updated in place
+    Returns:
+        A ConfigurationReport with one step per setting in config
+    """
+    report = ConfigurationReport(str(device.bluetoothAddress()))
+
+    if config.filterProfile is not None:
+        _step(report, "filterProfile",
+              lambda: device.onboardFilterProfile().label() == config.filterProfile,
+              lambda: device.setOnboardFilterProfile(config.filterProfile), device)
+
+    if config.outputRate is not None:
+        _step(report, "outputRate",
+              lambda: device.outputRate() == config.outputRate,
+              lambda: device.setOutputRate(config.outputRate), device)
+
+    if config.logOptions is not None:
+        if _step(report, "logOptions",
+                 lambda: applied.get("logOptions") == config.logOptions,
+                 lambda: device.setLogOptions(config.logOptions) is not False, device):
+            applied["logOptions"] = config.logOptions
+
+    if config.payloadMode is not None:
+        if _step(report, "measurement",
+                 lambda: applied.get("payloadMode") == config.payloadMode,
+                 lambda: device.startMeasurement(config.payloadMode), device):
+            applied["payloadMode"] = config.payloadMode
+
+    return report
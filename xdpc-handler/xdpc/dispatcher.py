@@ -0,0 +1,148 @@
+from collections import deque
+from threading import Event, Thread
+import time
+
+
+class ProcessorStats:
+    """
+    Execution time of one callback registered with a SampleDispatcher
+
+        name: The name the callback was registered with
+        address: The bluetooth address of the device it reads
+        calls: Number of samples it processed
+        seconds: Total time spent in the callback
+        maxSeconds: Longest single call
+        dropped: Samples overwritten before the dispatcher got to them
+        skipped: Older samples a conflating callback skipped to process the newest one
+    """
+    __slots__ = ("name", "address", "calls", "seconds", "maxSeconds", "dropped", "skipped")
+
+    def __init__(self, name, address):
+        self.name = name
+        self.address = address
+        self.calls = 0
+        self.seconds = 0.0
+        self.maxSeconds = 0.0
+        self.dropped = 0
+        self.skipped = 0
+
+    def __str__(self):
+        mean = self.seconds / self.calls if self.calls else 0.0
+        return (f"{self.name}: {self.calls} samples, {mean * 1e6:.0f} us mean, {self.maxSeconds * 1e6:.0f} us max, "
+                f"{self.dropped} dropped, {self.skipped} skipped")
+
+
+class _Route:
+    __slots__ = ("callback", "subscription", "stats")
+
+    def __init__(self, callback, subscription, stats):
+        self.callback = callback
+        self.subscription = subscription
+        self.stats = stats
+
+
+class SampleDispatcher:
+    """
+    Runs the processors of all Movella DOTs on one thread, woken up by the arrival of live data
+
+    Each registered callback gets its own subscription to its device, so several processors can read the same
+    DOT. The handler's sample listener queues the address of every packet and wakes the thread, which then only
+    visits the devices that delivered something. Conflating callbacks get the newest sample only, the others
+    every sample in order. The time spent in every callback is recorded, see stats().
+    """
+
+    def __init__(self, xdpcHandler):
+        self.__xdpcHandler = xdpcHandler
+        self.__routes = dict()
+        self.__arrived = deque()
+        self.__ready = Event()
+        self.__stop = Event()
+        self.__thread = None
+
+    def add(self, bluetoothAddress, callback, conflate=False, name=None):
+        """
+        Registers a callback for the live data of a device, call this before start
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT
+            callback: Called with every sample of the device, on the dispatcher thread
+            conflate: Only pass the newest sample when the callback falls behind
+            name: Name in the statistics, defaults to the callback's qualified name
+        Returns:
+            The ProcessorStats of the callback
+        """
+        address = str(bluetoothAddress)
+        stats = ProcessorStats(name or getattr(callback, "__qualname__", repr(callback)), address)
+        subscription = self.__xdpcHandler.subscribe(address, conflate=conflate)
+        self.__routes.setdefault(address, list()).append(_Route(callback, subscription, stats))
+        return stats
+
+    def stats(self):
+        """
+        Returns:
+            A list with the ProcessorStats of every registered callback
+        """
+        return [route.stats for routes in self.__routes.values() for route in routes]
+
+    def start(self):
+        if self.__thread is not None:
+            return
+        self.__stop.clear()
+        self.__xdpcHandler.addSampleListener(self._onSample)
+        self.__thread = Thread(target=self._run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops the dispatcher thread and closes the subscriptions
+        """
+        if self.__thread is None:
+            return
+        self.__xdpcHandler.removeSampleListener(self._onSample)
+        self.__stop.set()
+        self.__ready.set()
+        self.__thread.join()
+        self.__thread = None
+        for routes in self.__routes.values():
+            for route in routes:
+                self.__xdpcHandler.unsubscribe(route.subscription)
+
+    def _onSample(self, address, sample):
+        # SDK callback thread, only queue the address
+        if address in self.__routes:
+            self.__arrived.append(address)
+            self.__ready.set()
+
+    def _run(self):
+        while True:
+            self.__ready.wait()
+            self.__ready.clear()
+            if self.__stop.is_set():
+                break
+            addresses = set()
+            while self.__arrived:
+                addresses.add(self.__arrived.popleft())
+            for address in addresses:
+                for route in self.__routes[address]:
+                    self._dispatch(route)
+
+    def _dispatch(self, route):
+        subscription = route.subscription
+        stats = route.stats
+        while True:
+            sample = subscription.next()
+            if sample is None:
+                break
+            startTime = time.perf_counter()
+            try:
+                route.callback(sample)
+            except Exception as exception:
+                self.__xdpcHandler.eventLog().error("processorFailed", f"{stats.name} failed: {exception!r}",
+                                                    processor=stats.name, address=stats.address)
+            elapsed = time.perf_counter() - startTime
+            stats.calls += 1
+            stats.seconds += elapsed
+            if elapsed > stats.maxSeconds:
+                stats.maxSeconds = elapsed
+        stats.dropped = subscription.dropped()
+        stats.skipped = subscription.skipped()
@@ -0,0 +1,162 @@
+from collections import deque
+from threading import Event, Thread
+import itertools
+import sys
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# Events with this name are written over the previous line instead of on a new one, like a progress bar
+PROGRESS = "progress"
+
+
+class LogEvent:
+    """
+    One entry of an EventLog
+
+        sequence: Increasing number of the event within its log
+        time: Wall clock time the event was logged at, from time.time
+        level: DEBUG, INFO, WARNING or ERROR
+        name: Short identifier of the kind of event, e.g. "battery" or "buttonClicked"
+        message: Human readable text, what used to be printed
+        fields: Dictionary with the structured data of the event, e.g. the address and battery level
+    """
+    __slots__ = ("sequence", "time", "level", "name", "message", "fields")
+
+    def __init__(self, sequence, time, level, name, message, fields):
+        self.sequence = sequence
+        self.time = time
+        self.level = level
+        self.name = name
+        self.message = message
+        self.fields = fields
+
+    def __str__(self):
+        if self.level >= WARNING:
+            return f"{LEVEL_NAMES.get(self.level, self.level)}: {self.message}"
+        return self.message
+
+
+class EventLog:
+    """
+    In-memory ring of structured events, written to a stream by a background thread
+
+    log() only appends to deques, which is atomic in CPython, so SDK callbacks never wait for a lock or for the
+    console. The last capacity events stay available to query(). Events at or above level are also queued for
+    the writer thread, which drains the queue every flushInterval seconds once start() is called. If the writer
+    falls capacity events behind, the oldest unwritten ones are skipped.
+    """
+
+    def __init__(self, capacity=4096, stream=None, level=INFO, flushInterval=0.1):
+        """
+        Parameters:
+            capacity: Number of events kept for query() and queued for the writer
+            stream: File object the writer writes to, None for sys.stdout
+            level: Minimum level of the events that are written, all events are kept for query()
+            flushInterval: Seconds between writer runs
+        """
+        self.__history = deque(maxlen=capacity)
+        self.__pending = deque(maxlen=capacity)
+        self.__sequence = itertools.count()
+        self.__stream = stream
+        self.__level = level
+        self.__flushInterval = flushInterval
+        self.__stop = Event()
+        self.__thread = None
+        self.__progressShown = False
+
+    def log(self, level, name, message, **fields):
+        """
+        Records an event, safe to call from any thread
+
+        Parameters:
+            level: DEBUG, INFO, WARNING or ERROR
+            name: Kind of event, used by query()
+            message: Human readable text for the writer
+            fields: Structured data of the event
+        Returns:
+            The LogEvent
+        """
+        event = LogEvent(next(self.__sequence), time.time(), level, name, message, fields)
+        self.__history.append(event)
+        if level >= self.__level:
+            self.__pending.append(event)
+        return event
+
+    def debug(self, name, message, **fields):
+        return self.log(DEBUG, name, message, **fields)
+
+    def info(self, name, message, **fields):
+        return self.log(INFO, name, message, **fields)
+
+    def warning(self, name, message, **fields):
+        return self.log(WARNING, name, message, **fields)
+
+    def error(self, name, message, **fields):
+        return self.log(ERROR, name, message, **fields)
+
+    def query(self, level=DEBUG, name=None, since=None, **fields):
+        """
+        Parameters:
+            level: Minimum level of the events to return
+            name: Only return events of this kind, None for all
+            since: Only return events with a higher sequence number, e.g. the last one seen by the caller
+            fields: Only return events whose fields have these values, e.g. address="D4:22:CD:00:00:00"
+        Returns:
+            A list of the matching LogEvents that are still in the ring, oldest first
+        """
+        # copying the deque happens in one step under the GIL, log() can keep appending
+        return [event for event in list(self.__history)
+                if event.level >= level
+                and (name is None or event.name == name)
+                and (since is None or event.sequence > since)
+                and all(event.fields.get(key) == value for key, value in fields.items())]
+
+    def start(self):
+        """
+        Starts the background writer, does nothing if it is already running
+        """
+        if self.__thread is not None:
+            return
+        self.__stop.clear()
+        self.__thread = Thread(target=self._run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops the background writer after writing the queued events
+        """
+        if self.__thread is None:
+            return
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def flush(self):
+        """
+        Writes the queued events on the calling thread
+        """
+        stream = self.__stream if self.__stream is not None else sys.stdout
+        while True:
+            try:
+                event = self.__pending.popleft()
+            except IndexError:
+                break
+            if event.name == PROGRESS:
+                stream.write(f"\r{event}")
+                self.__progressShown = True
+                continue
+            if self.__progressShown:
+                stream.write("\n")
+                self.__progressShown = False
+            stream.write(f"{event}\n")
+        stream.flush()
+
+    def _run(self):
+        while not self.__stop.wait(self.__flushInterval):
+            self.flush()
+        self.flush()
@@ -0,0 +1,427 @@
+from collections import deque
+import inspect
+import math
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Largest factor the batch EMA lets its running sums grow by before it starts a new chunk
+_EMA_CHUNK_GROWTH = 1e100
+
+
+def _scale(index, factor):
+    return {}, [f"x = x * {_checkFactor(factor)!r}"]
+
+
+def _deadzone(index, width):
+    width = _checkWidth(width)
+    return {}, [f"if {-width!r} < x < {width!r}:",
+                "    x = 0.0"]
+
+
+def _clamp(index, low=-1.0, high=1.0):
+    low, high = _checkBounds(low, high)
+    return {}, [f"if x > {high!r}:",
+                f"    x = {high!r}",
+                f"elif x < {low!r}:",
+                f"    x = {low!r}"]
+
+
+def _ema(index, alpha, initial=0.0):
+    alpha = _checkAlpha(alpha)
+    initial = _finite("initial", initial)
+    state = f"ema{index}"
+    return {state: repr(initial)}, [f"{state} = {alpha!r} * x + {1.0 - alpha!r} * {state}",
+                                    f"x = {state}"]
+
+
+def _median(index, window):
+    window = _checkWindow(window)
+    state = f"median{index}"
+    # the window starts out filled with the first sample
+    return {state: "None"}, [f"if {state} is None:",
+                             f"    {state} = deque([x] * {window}, maxlen={window})",
+                             f"{state}.append(x)",
+                             f"x = sorted({state})[{window // 2}]"]
+
+
+def _rateLimit(index, step, initial=0.0):
+    step = _checkStep(step)
+    initial = _finite("initial", initial)
+    state = f"rate{index}"
+    return {state: repr(initial)}, [f"if x > {state} + {step!r}:",
+                                    f"    x = {state} + {step!r}",
+                                    f"elif x < {state} - {step!r}:",
+                                    f"    x = {state} - {step!r}",
+                                    f"{state} = x"]
+
+
+def _oneEuro(index, min_cutoff=1.0, beta=0.0, d_cutoff=1.0, rate=60.0):
+    minCutoff, beta, derivativeTau, period = _checkOneEuro(min_cutoff, beta, d_cutoff, rate)
+    value, derivative, previousTime = f"euro{index}", f"euroDerivative{index}", f"euroTime{index}"
+    return {value: "None", derivative: "0.0", previousTime: "None"}, [
+        f"if {value} is None:",
+        f"    {value} = x",
+        "else:",
+        f"    dt = {period!r}",
+        f"    if t is not None and {previousTime} is not None and t > {previousTime}:",
+        f"        dt = t - {previousTime}",
+        f"    {derivative} = {derivative} + 1.0 / (1.0 + {derivativeTau!r} / dt) * ((x - {value}) / dt - {derivative})",
+        f"    {value} = {value} + 1.0 / (1.0 + 1.0 / ({2.0 * math.pi!r} * ({minCutoff!r} + {beta!r} * abs({derivative}))"
+        f" * dt)) * (x - {value})",
+        f"    x = {value}",
+        f"{previousTime} = t"]
+
+
+def _scaleBatch(factor):
+    factor = _checkFactor(factor)
+    return lambda values, times: values * factor
+
+
+def _deadzoneBatch(width):
+    width = _checkWidth(width)
+    return lambda values, times: np.where(np.abs(values) < width, 0.0, values)
+
+
+def _clampBatch(low=-1.0, high=1.0):
+    low, high = _checkBounds(low, high)
+    return lambda values, times: np.minimum(np.maximum(values, low), high)
+
+
+def _emaBatch(alpha, initial=0.0):
+    alpha = _checkAlpha(alpha)
+    decay = 1.0 - alpha
+    state = _finite("initial", initial)
+    if decay > 0.0:
+        chunkSize = max(1, int(np.log(_EMA_CHUNK_GROWTH) / -np.log(decay)))
+
+    def ema(values, times):
+        # y[k] = decay^k * (y[0] + alpha * sum(x[j] / decay^j for j <= k)), in chunks so decay^-k stays finite
+        nonlocal state
+        if decay == 0.0:
+            return values
+        output = np.empty_like(values)
+        for start in range(0, len(values), chunkSize):
+            chunk = values[start:start + chunkSize]
+            powers = decay ** np.arange(1, len(chunk) + 1, dtype=float)
+            powers = powers.reshape((-1,) + (1,) * (chunk.ndim - 1))
+            output[start:start + chunkSize] = powers * (state + alpha * np.cumsum(chunk / powers, axis=0))
+            state = output[start + len(chunk) - 1].copy()
+        return output
+    return ema
+
+
+def _medianBatch(window):
+    window = _checkWindow(window)
+    history = None
+
+    def median(values, times):
+        nonlocal history
+        if history is None:
+            history = np.repeat(values[:1], window - 1, axis=0)
+        padded = np.concatenate((history, values))
+        history = padded[len(padded) - (window - 1):]
+        return np.sort(sliding_window_view(padded, window, axis=0), axis=-1)[..., window // 2]
+    return median
+
+
+def _rateLimitBatch(step, initial=0.0):
+    step = _checkStep(step)
+    state = _finite("initial", initial)
+
+    def rateLimit(values, times):
+        # every output depends on the previous one, this stage runs sample by sample
+        nonlocal state
+        if values.ndim == 1:
+            output = values.tolist()
+            for index, value in enumerate(output):
+                if value > state + step:
+                    value = state + step
+                elif value < state - step:
+                    value = state - step
+                output[index] = state = value
+            return np.array(output)
+        output = np.empty_like(values)
+        for index in range(len(values)):
+            state = np.minimum(np.maximum(values[index], state - step), state + step)
+            output[index] = state
+        return output
+    return rateLimit
+
+
+def _oneEuroBatch(min_cutoff=1.0, beta=0.0, d_cutoff=1.0, rate=60.0):
+    minCutoff, beta, derivativeTau, period = _checkOneEuro(min_cutoff, beta, d_cutoff, rate)
+    value = None
+    derivative = 0.0
+    previousTime = None
+
+    def oneEuro(values, times):
+        # the cutoff depends on the filtered speed so far, this stage runs sample by sample. The arithmetic is the
+        # one of the per-sample function, on floats for 1-D batches and on rows otherwise.
+        nonlocal value, derivative, previousTime
+        rows = values.tolist() if values.ndim == 1 else list(values)
+        if times is not None:
+            times = times.tolist()
+        output = list()
+        for index, x in enumerate(rows):
+            t = None if times is None else times[index]
+            if value is None:
+                value = x
+            else:
+                dt = period
+                if t is not None and previousTime is not None and t > previousTime:
+                    dt = t - previousTime
+                derivative = derivative + 1.0 / (1.0 + derivativeTau / dt) * ((x - value) / dt - derivative)
+                value = value + 1.0 / (1.0 + 1.0 / (2.0 * math.pi * (minCutoff + beta * abs(derivative)) * dt)) * (
+                    x - value)
+            previousTime = t
+            output.append(value)
+        return np.array(output)
+    return oneEuro
+
+
+def _finite(name, value):
+    # the parameters end up in the generated source as their repr, which only works for finite numbers
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"Filter parameter {name} must be a finite number, got {value}")
+    return value
+
+
+def _checkFactor(factor):
+    return _finite("factor", factor)
+
+
+def _checkWidth(width):
+    width = _finite("width", width)
+    if not width >= 0.0:
+        raise ValueError(f"Deadzone width must be at least 0, got {width}")
+    return width
+
+
+def _checkBounds(low, high):
+    low, high = _finite("low", low), _finite("high", high)
+    if not low <= high:
+        raise ValueError(f"Clamp needs low <= high, got low={low}, high={high}")
+    return low, high
+
+
+def _checkStep(step):
+    step = _finite("step", step)
+    if not step > 0.0:
+        raise ValueError(f"Rate limit step must be positive, got {step}")
+    return step
+
+
+def _checkAlpha(alpha):
+    alpha = _finite("alpha", alpha)
+    if not 0.0 < alpha <= 1.0:
+        raise ValueError(f"EMA alpha must be in (0, 1], got {alpha}")
+    return alpha
+
+
+def _checkWindow(window):
+    if _finite("window", window) != int(window) or window < 1:
+        raise ValueError(f"Median window must be a positive integer, got {window}")
+    return int(window)
+
+
+def _checkOneEuro(minCutoff, beta, derivativeCutoff, rate):
+    minCutoff, beta = _finite("min_cutoff", minCutoff), _finite("beta", beta)
+    derivativeCutoff, rate = _finite("d_cutoff", derivativeCutoff), _finite("rate", rate)
+    if not (minCutoff > 0 and derivativeCutoff > 0 and rate > 0 and beta >= 0):
+        raise ValueError(f"One Euro filter needs positive cutoffs and rate and a beta of at least 0, got "
+                         f"min_cutoff={minCutoff}, beta={beta}, d_cutoff={derivativeCutoff}, rate={rate}")
+    # time constant of the derivative filter and the sample period used when the samples have no time
+    return minCutoff, beta, 1.0 / (2.0 * math.pi * derivativeCutoff), 1.0 / rate
+
+
+# stage name -> (source of the per-sample function, factory of the batch function)
+STAGES = {
+    "scale": (_scale, _scaleBatch),
+    "deadzone": (_deadzone, _deadzoneBatch),
+    "clamp": (_clamp, _clampBatch),
+    "ema": (_ema, _emaBatch),
+    "median": (_median, _medianBatch),
+    "rate_limit": (_rateLimit, _rateLimitBatch),
+    "one_euro": (_oneEuro, _oneEuroBatch),
+}
+
+
+def _buildStage(name, index, parameters):
+    """
+    Generates the source of one stage, with its parameters checked against the signature of the stage
+
+    Raises:
+        ValueError: When a parameter is unknown, missing or out of range
+    """
+    signature = inspect.signature(STAGES[name][0])
+    accepted = [parameter for parameter in signature.parameters if parameter != "index"]
+    unknown = sorted(set(parameters) - set(accepted))
+    if unknown:
+        raise ValueError(f"Filter stage {name!r} has no parameter {', '.join(unknown)}, "
+                         f"expected {', '.join(accepted)}")
+    missing = [parameter for parameter in accepted
+               if signature.parameters[parameter].default is inspect.Parameter.empty and parameter not in parameters]
+    if missing:
+        raise ValueError(f"Filter stage {name!r} needs {', '.join(missing)}")
+    try:
+        return STAGES[name][0](index, **parameters)
+    except TypeError as error:
+        # e.g. None where a number belongs
+        raise ValueError(f"Invalid parameter of filter stage {name!r}: {error}") from error
+
+
+class PipelineBenchmark:
+    """
+    Throughput of one FilterPipeline, see FilterPipeline.benchmark
+
+        pipeline: The description of the pipeline
+        samples: Number of samples filtered by each variant
+        sampleSeconds: Time the per-sample function took for all samples
+        batchSeconds: Time the batch function took for all samples
+        batchSize: Number of samples per batch call
+    """
+    __slots__ = ("pipeline", "samples", "sampleSeconds", "batchSeconds", "batchSize")
+
+    def __init__(self, pipeline, samples, sampleSeconds, batchSeconds, batchSize):
+        self.pipeline = pipeline
+        self.samples = samples
+        self.sampleSeconds = sampleSeconds
+        self.batchSeconds = batchSeconds
+        self.batchSize = batchSize
+
+    def __str__(self):
+        return (f"{self.pipeline}: {self.sampleSeconds / self.samples * 1e9:.0f} ns per sample, "
+                f"{self.batchSeconds / self.samples * 1e9:.0f} ns per sample in batches of {self.batchSize}")
+
+
+class FilterPipeline:
+    """
+    Chain of filter stages for one signal, e.g. a joystick axis, built from a declarative description
+
+    Every stage is a dictionary with the name of the stage under "stage" and its parameters, for example
+
+        [{"stage": "scale", "factor": 1 / 50},
+         {"stage": "deadzone", "width": 0.1},
+         {"stage": "clamp", "low": -1.0, "high": 1.0}]
+
+    Stages:
+        scale: Multiplies by factor
+        deadzone: Sets values with an absolute value below width (at least 0) to 0
+        clamp: Limits values to [low, high], defaults to [-1, 1]
+        ema: Exponential moving average, alpha * x + (1 - alpha) * previous, starting at initial (0)
+        median: Median of the last window samples, the upper one of the middle two for even windows
+        rate_limit: Limits the change per sample to step (above 0), starting at initial (0)
+        one_euro: One Euro filter, an EMA whose cutoff frequency rises with the speed of the signal, so slow
+            movements are smoothed strongly and fast ones follow with little lag. The cutoff is
+            min_cutoff + beta * |speed| in Hz, with the speed in units per second filtered at d_cutoff Hz.
+            Lower min_cutoff for less jitter, raise beta for less lag. The samples are taken to be 1 / rate
+            seconds apart unless they are filtered with their time
+
+    The description is compiled once. compile() returns a single generated Python function for the whole chain,
+    with the parameters as constants and the filter state in closure variables, so a sample costs no lookups,
+    loops or calls between stages. compileBatch() returns the NumPy equivalent for arrays of samples, with the time
+    along the first axis. Both take the time of the samples in seconds as an optional second argument, used by the
+    stages that depend on the sample interval. Each compiled function keeps its own state, compile again to start
+    over.
+    """
+
+    def __init__(self, stages):
+        """
+        Parameters:
+            stages: List of stage dictionaries, see the class description
+        Raises:
+            ValueError: When a stage is unknown, or a parameter is unknown, missing or out of range
+        """
+        self.stages = [dict(stage) for stage in stages]
+        states = dict()
+        body = list()
+        for index, stage in enumerate(self.stages):
+            parameters = dict(stage)
+            name = parameters.pop("stage", None)
+            if name not in STAGES:
+                raise ValueError(f"Unknown filter stage {name!r}, expected one of {', '.join(STAGES)}")
+            stageStates, lines = _buildStage(name, index, parameters)
+            states.update(stageStates)
+            body.extend(lines)
+
+        source = ["def factory():"]
+        source.extend(f"    {state} = {initial}" for state, initial in states.items())
+        source.append("    def process(x, t=None):")
+        if states:
+            source.append(f"        nonlocal {', '.join(states)}")
+        source.extend(f"        {line}" for line in body)
+        source.append("        return x")
+        source.append("    return process")
+        self.source = "\n".join(source)
+        self.__code = compile(self.source, f"<FilterPipeline {self}>", "exec")
+
+    def __str__(self):
+        if not self.stages:
+            return "identity"
+        return " -> ".join(
+            stage["stage"] + "(" + ", ".join(f"{key}={value:g}" if isinstance(value, float) else f"{key}={value}"
+                                              for key, value in stage.items() if key != "stage") + ")"
+            for stage in self.stages)
+
+    def compile(self):
+        """
+        Returns:
+            A function process(x, t=None) filtering one float at a time, t the time of the sample in seconds, with
+            fresh filter state
+        """
+        namespace = {"deque": deque}
+        exec(self.__code, namespace)
+        return namespace["factory"]()
+
+    def compileBatch(self):
+        """
+        Returns:
+            A function processBatch(values, times=None) filtering a NumPy array of samples (time along the first
+            axis) and returning the filtered array, with fresh filter state that carries over from one call to the
+            next
+        """
+        stages = list()
+        for stage in self.stages:
+            parameters = dict(stage)
+            stages.append(STAGES[parameters.pop("stage")][1](**parameters))
+
+        def processBatch(values, times=None):
+            values = np.asarray(values, dtype=float)
+            if len(values) == 0:
+                return values
+            if times is not None:
+                times = np.asarray(times, dtype=float)
+            for stage in stages:
+                values = stage(values, times)
+            return values
+        return processBatch
+
+    def benchmark(self, samples=100000, batchSize=1024):
+        """
+        Times both compiled variants on Gaussian noise
+
+        Parameters:
+            samples: Number of samples to filter
+            batchSize: Number of samples per call of the batch function
+        Returns:
+            A PipelineBenchmark
+        """
+        values = np.random.default_rng(0).normal(scale=0.5, size=samples)
+        scalars = values.tolist()
+
+        process = self.compile()
+        startTime = time.perf_counter()
+        for value in scalars:
+            process(value)
+        sampleSeconds = time.perf_counter() - startTime
+
+        processBatch = self.compileBatch()
+        startTime = time.perf_counter()
+        for start in range(0, samples, batchSize):
+            processBatch(values[start:start + batchSize])
+        batchSeconds = time.perf_counter() - startTime
+
+        return PipelineBenchmark(str(self), samples, sampleSeconds, batchSeconds, batchSize)
@@ -0,0 +1,205 @@
+from collections import deque
+from .packetbuffer import Subscription
+from .samples import SAMPLE_TIME_FINE_RANGE
+import time
+
+
+def sampleTimeFineDelta(later, earlier):
+    """
+    Difference between two sampleTimeFine values in microseconds, taking the 32-bit wrap-around into account
+
+    Returns:
+        A signed difference in the range [-2^31, 2^31)
+    """
+    return (later - earlier + (SAMPLE_TIME_FINE_RANGE >> 1)) % SAMPLE_TIME_FINE_RANGE - (SAMPLE_TIME_FINE_RANGE >> 1)
+
+
+def sampleTimeFineOf(sample):
+    """
+    Returns:
+        The sampleTimeFine of a DotSample or an XsDataPacket, None if the sample has no timestamp
+    """
+    if hasattr(sample, "containsSampleTimeFine"):
+        return sample.sampleTimeFine() if sample.containsSampleTimeFine() else None
+    return sample.sampleTimeFine
+
+
+class Frame:
+    """
+    One sample per Movella DOT, all taken at the same sampleTimeFine
+
+        sampleTimeFine: The timestamp of the earliest sample in the frame
+        samples: Dictionary from bluetooth address to sample, None for devices missing from the frame
+        missing: Tuple of the bluetooth addresses missing from the frame
+        missingMask: Bit i is set when the i-th address given to the FrameAssembler is missing
+    """
+    __slots__ = ("sampleTimeFine", "samples", "missing", "missingMask")
+
+    def __init__(self, sampleTimeFine, samples, missing, missingMask):
+        self.sampleTimeFine = sampleTimeFine
+        self.samples = samples
+        self.missing = missing
+        self.missingMask = missingMask
+
+    def complete(self):
+        """
+        Returns:
+            True if every device contributed a sample
+        """
+        return self.missingMask == 0
+
+
+class FrameAssembler:
+    """
+    Groups the live data of several synchronized Movella DOTs into frames by sampleTimeFine
+
+    Samples whose sampleTimeFine lies within tolerance microseconds of each other end up in the same
+    frame. A frame is emitted as soon as every device delivered its sample. If a device already moved past
+    the frame's timestamp it lost that sample, and the frame is emitted straight away without it. If a
+    device has not delivered anything yet, the assembler waits until maxWait seconds after the first sample
+    of the frame arrived and then emits a partial frame with that device marked as missing. The arrival time
+    is the hostTime of decoded samples, raw packets count as arriving when the assembler reads them.
+    Samples without a sampleTimeFine can't be placed in a frame, they are skipped and counted.
+
+    The devices need to be synchronized first (see movelladot_pc_sdk_synchronization.py), otherwise their
+    sampleTimeFine values are unrelated and every frame ends up partial.
+
+    The assembler reads through its own subscriptions, so it does not take data away from other consumers.
+    """
+
+    def __init__(self, xdpcHandler, addresses, tolerance=2000, maxWait=0.05):
+        """
+        Parameters:
+            xdpcHandler: The XdpcHandler the devices are connected through
+            addresses: The bluetooth addresses of the devices that make up a frame
+            tolerance: Maximum sampleTimeFine difference in microseconds between samples of one frame
+            maxWait: Number of seconds to wait for a device before emitting a frame without it
+        """
+        self.__xdpcHandler = xdpcHandler
+        self.__addresses = list(addresses)
+        self.__tolerance = tolerance
+        self.__maxWait = maxWait
+        self.__subscriptions = [xdpcHandler.subscribe(address) for address in self.__addresses]
+        # per device: (sampleTimeFine, host arrival time, sample)
+        self.__pending = [deque() for _ in self.__addresses]
+        self.__framesEmitted = 0
+        self.__partialFrames = 0
+        self.__skippedSamples = 0
+
+    def addresses(self):
+        """
+        Returns:
+            The bluetooth addresses of the devices in a frame, in missingMask bit order
+        """
+        return list(self.__addresses)
+
+    def framesEmitted(self):
+        """
+        Returns:
+            The number of frames returned by nextFrame so far
+        """
+        return self.__framesEmitted
+
+    def partialFrames(self):
+        """
+        Returns:
+            The number of emitted frames that had at least one device missing
+        """
+        return self.__partialFrames
+
+    def skippedSamples(self):
+        """
+        Returns:
+            The number of samples left out of every frame because they had no sampleTimeFine
+        """
+        return self.__skippedSamples
+
+    def close(self):
+        """
+        Closes the subscriptions of the assembler
+        """
+        for subscription in self.__subscriptions:
+            self.__xdpcHandler.unsubscribe(subscription)
+
+    def nextFrame(self, timeout=None):
+        """
+        Blocks until the next frame can be emitted
+
+        Parameters:
+            timeout: Maximum number of seconds to wait, None waits until a frame is ready or the handler closes
+        Returns:
+            The next Frame, or None if the wait timed out or the subscriptions were closed
+        """
+        callDeadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            self._pull()
+            now = time.perf_counter()
+            frame, frameDeadline = self._assemble(now)
+            if frame is not None:
+                return frame
+
+            if callDeadline is not None and now >= callDeadline:
+                return None
+            waitUntil = frameDeadline
+            if callDeadline is not None and (waitUntil is None or callDeadline < waitUntil):
+                waitUntil = callDeadline
+
+            # Any arrival can complete the frame or start the wait for a new one, so wake up on every device
+            if any(subscription.closed() for subscription in self.__subscriptions):
+                return None
+            Subscription.waitForAny(self.__subscriptions, None if waitUntil is None else waitUntil - now)
+
+    def _pull(self):
+        now = time.perf_counter()
+        for subscription, pending in zip(self.__subscriptions, self.__pending):
+            for sample in subscription.drain():
+                sampleTimeFine = sampleTimeFineOf(sample)
+                if sampleTimeFine is None:
+                    self.__skippedSamples += 1
+                    continue
+                hostTime = getattr(sample, "hostTime", None)
+                pending.append((sampleTimeFine, now if hostTime is None else hostTime, sample))
+
+    def _assemble(self, now):
+        """
+        Returns:
+            A tuple of the Frame that can be emitted now (or None), and the host time at which the
+            oldest pending frame has to be emitted partially (or None if nothing is pending)
+        """
+        heads = [pending[0] if pending else None for pending in self.__pending]
+        reference = next((head for head in heads if head is not None), None)
+        if reference is None:
+            return None, None
+
+        # The frame is built around the earliest pending sample
+        earliest = reference
+        for head in heads:
+            if head is not None and sampleTimeFineDelta(head[0], earliest[0]) < 0:
+                earliest = head
+
+        waitingForDevice = False
+        missingMask = 0
+        for i, head in enumerate(heads):
+            if head is None:
+                waitingForDevice = True
+                missingMask |= 1 << i
+            elif sampleTimeFineDelta(head[0], earliest[0]) > self.__tolerance:
+                missingMask |= 1 << i
+
+        frameDeadline = earliest[1] + self.__maxWait
+        if waitingForDevice and now < frameDeadline:
+            return None, frameDeadline
+
+        samples = dict()
+        missing = list()
+        for i, address in enumerate(self.__addresses):
+            if missingMask & (1 << i):
+                samples[address] = None
+                missing.append(address)
+            else:
+                samples[address] = self.__pending[i].popleft()[2]
+
+        self.__framesEmitted += 1
+        if missingMask:
+            self.__partialFrames += 1
+        return Frame(earliest[0], samples, tuple(missing), missingMask), None
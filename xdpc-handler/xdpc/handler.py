@@ -0,0 +1,1261 @@
+
+#  Copyright (c) 2003-2023 Movella Technologies B.V. or subsidiaries worldwide.
+#  All rights reserved.
+#  
+#  Redistribution and use in source and binary forms, with or without modification,
+#  are permitted provided that the following conditions are met:
+#  
+#  1.	Redistributions of source code must retain the above copyright notice,
+#  	this list of conditions and the following disclaimer.
+#  
+#  2.	Redistributions in binary form must reproduce the above copyright notice,
+#  	this list of conditions and the following disclaimer in the documentation
+#  	and/or other materials provided with the distribution.
+#  
+#  3.	Neither the names of the copyright holders nor the names of their contributors
+#  	may be used to endorse or promote products derived from this software without
+#  	specific prior written permission.
+#  
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY
+#  EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+#  MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL
+#  THE COPYRIGHT HOLDERS OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+#  SPECIAL, EXEMPLARY OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT
+#  OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION)
+#  HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY OR
+#  TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#  
+
+from .sdk import loadSdk
+# XdpcHandler derives from the SDK's callback class, so importing this module loads the SDK
+movelladot_pc_sdk = loadSdk()
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Event, Lock, Thread
+from .packetbuffer import *
+from .samples import *
+from .streamstats import *
+from .devicecache import *
+from .deviceconfig import *
+from .eventlog import *
+from .clockmap import *
+import time
+
+waitForConnections = True
+
+
+def loadKeyboard():
+    """
+    Imports pynput on first use, it is only needed to end a scan with a key press
+
+    Returns:
+        pynput's keyboard module, None if pynput is not available
+    """
+    try:
+        from pynput import keyboard
+    except ImportError:
+        # pynput needs a display on Linux, scanning then just runs until the timeout
+        return None
+    return keyboard
+
+
+def defaultWhitelist():
+    """
+    Returns:
+        The whitelist of the user_settings module next to the running script, empty if there is none
+    """
+    try:
+        from user_settings import whitelist
+    except ImportError:
+        return ()
+    return whitelist
+
+
+def on_press(key):
+    global waitForConnections
+    waitForConnections = False
+
+
+class ConnectionResult:
+    """
+    Outcome of connecting to one Movella DOT in XdpcHandler.connectDots(concurrent=True)
+
+        address: The bluetooth address of the device
+        connected: True if the device was opened
+        attempts: Number of openPort calls made
+        seconds: Time from the first attempt until the device was opened or given up on
+        reason: The last failure reason reported by the SDK, empty if the device connected
+    """
+    __slots__ = ("address", "connected", "attempts", "seconds", "reason")
+
+    def __init__(self, address, connected, attempts, seconds, reason=""):
+        self.address = address
+        self.connected = connected
+        self.attempts = attempts
+        self.seconds = seconds
+        self.reason = reason
+
+    def __str__(self):
+        state = "connected" if self.connected else f"failed ({self.reason})"
+        return f"{self.address}: {state} after {self.attempts} attempt(s) in {self.seconds:.2f} s"
+
+
+class XdpcHandler(movelladot_pc_sdk.XsDotCallback):
+    def __init__(self, max_buffer_size=5, buffer_policy=DROP_OLDEST, block_timeout=0.05, decode_samples=False,
+                 broadcast_buffer_size=128, whitelist=None, event_log=None):
+        movelladot_pc_sdk.XsDotCallback.__init__(self)
+
+        self.__manager = 0
+
+        self.__lock = Lock()
+        self.__spaceAvailable = Condition(self.__lock)
+        self.__packetArrived = Condition(self.__lock)
+        self.__errorReceived = False
+        self.__updateDone = False
+        self.__recordingStopped = False
+        self.__exportDone = False
+        self.__closing = False
+        self.__progressCurrent = 0
+        self.__progressTotal = 0
+        self.__packetsReceived = 0
+
+        # only devices with these bluetooth addresses are detected, None for user_settings.whitelist
+        self.__whitelist = whitelist
+        self.__detectedDots = list()
+        self.__scanTarget = None
+        self.__scanDone = Event()
+        self.__connectedDots = list()
+        self.__connectedUsbDots = list()
+        self.__connectionResults = dict()
+        self.__knownDots = dict()
+        self.__appliedConfig = defaultdict(dict)
+        self.__lastConfig = None
+        self.__consumers = list()
+        # bluetooth address -> whether live packets of that device are decoded with their quaternion
+        self.__decodeQuaternion = dict()
+        self.__supervisedPorts = dict()
+        self.__supervisedSince = dict()
+        self.__recovering = set()
+        self.__recoveries = list()
+        self.__supervisorWake = Event()
+        self.__supervisorStop = Event()
+        self.__maxNumberOfPacketsInBuffer = max_buffer_size
+        self.__bufferPolicy = buffer_policy
+        self.__blockTimeout = block_timeout
+        self.__decodeSamples = decode_samples
+        self.__packetBuffer = defaultdict(lambda: PacketRingBuffer(max_buffer_size, buffer_policy))
+        # the packet buffer of a device is only filled once one of the queue readers (packetAvailable,
+        # waitForPacket, getNextPacket, getNextSample, drain) asked for it, waitForAnyPacket enables all devices
+        self.__queuedAddresses = set()
+        self.__queueAllAddresses = False
+        self.__broadcastBuffer = defaultdict(lambda: BroadcastRing(broadcast_buffer_size))
+        self.__subscriptions = list()
+        self.__streamStats = defaultdict(StreamStats)
+        self.__clockMappings = defaultdict(ClockMapping)
+        self.__lastStatsSnapshot = dict()
+        self.__statsReporterStop = Event()
+        self.__progress = dict()
+        self.__sampleListeners = list()
+        self.__eventListeners = list()
+        # SDK callbacks report through the event log instead of printing on the callback thread
+        self.__eventLog = event_log if event_log is not None else EventLog()
+
+    def initialize(self):
+        """
+        Initialize the PC SDK
+
+        - Prints the used PC SDK version to show we connected to XDPC
+        - Constructs the connection manager used for discovering and connecting to DOTs
+        - Connects this class as callback handler to the XDPC
+
+        Returns:
+            False if there was a problem creating a connection manager.
+        """
+
+        # Print SDK version
+        version = movelladot_pc_sdk.XsVersion()
+        movelladot_pc_sdk.xsdotsdkDllVersion(version)
+        print(f"Using Movella DOT SDK version: {version.toXsString()}")
+
+        # Create connection manager
+        self.__manager = movelladot_pc_sdk.XsDotConnectionManager()
+        if self.__manager is None:
+            print("Manager could not be constructed, exiting.")
+            return False
+
+        # Attach callback handler (self) to connection manager
+        self.__manager.addXsDotCallbackHandler(self)
+        self.__eventLog.start()
+        return True
+
+    def cleanup(self):
+        """
+        Close connections to any Movella DOT devices and destructs the connection manager created in initialize
+        """
+        print("Closing ports...")
+        self.__closing = True
+        self.__statsReporterStop.set()
+        self.stopSupervising()
+        with self.__lock:
+            self.__packetArrived.notify_all()
+        for subscription in self.subscriptions():
+            subscription.close()
+        self.__manager.close()
+        self._notifyEvent("closed")
+        self.__eventLog.stop()
+
+        print("Successful exit.")
+
+    def scanForDots(self, expected_count=None, addresses=None, names=None, timeout=20.0, headless=False):
+        """
+        Scan if any Movella DOT devices can be detected via Bluetooth
+
+        Enables device detection in the connection manager and uses the
+        onAdvertisementFound callback to detect active Movella DOT devices
+        Disables device detection when done
+
+        Without a target the scan runs until a key is pressed or 20 seconds have passed, or for timeout
+        seconds if headless is True. With a target the scan stops as soon as onAdvertisementFound has seen it:
+            expected_count: this many devices were detected
+            addresses: every bluetooth address in this collection was detected, e.g. user_settings.whitelist
+            names: every one of these Bluetooth names was advertised, see XsPortInfo.portName. The advertised name
+                is only known before connecting, it is not necessarily the device tag (deviceTagName).
+        A key press still ends a targeted scan early unless headless is True, and timeout bounds it.
+
+        Returns:
+            True if the scan target was reached, False if a targeted scan timed out or was aborted
+        """
+        untargeted = expected_count is None and not addresses and not names
+        if untargeted and not headless:
+            self._scanUntilKeyPress()
+            return True
+
+        self.__scanTarget = None if untargeted else (expected_count, set(addresses or ()), set(names or ()), set(), set())
+        self.__scanDone.clear()
+        for portInfo in list(self.__detectedDots):
+            self._updateScanTarget(portInfo)
+
+        print("Scanning for devices...")
+        self.__manager.enableDeviceDetection()
+        listener = None
+        keyboard = None if headless else loadKeyboard()
+        if keyboard is not None:
+            listener = keyboard.Listener(on_press=lambda key: self.__scanDone.set())
+            listener.start()
+            print(f"Press any key or wait {timeout:.0f} seconds to stop scanning...")
+
+        self.__scanDone.wait(timeout)
+        reached = untargeted or self._scanTargetReached()
+        self.__scanTarget = None
+        self.__manager.disableDeviceDetection()
+        if listener is not None:
+            listener.stop()
+        print(f"Stopped scanning for devices, found {len(self.__detectedDots)}.")
+        return reached
+
+    def _updateScanTarget(self, portInfo):
+        """
+        Records an advertisement against the target of a running scanForDots and ends the scan once it is reached
+        """
+        target = self.__scanTarget
+        if target is None:
+            return
+        target[3].add(str(portInfo.bluetoothAddress()))
+        target[4].add(str(portInfo.portName()))
+        if self._scanTargetReached():
+            self.__scanDone.set()
+
+    def _scanTargetReached(self):
+        target = self.__scanTarget
+        if target is None:
+            return False
+        expectedCount, addresses, names, foundAddresses, foundNames = target
+        return ((expectedCount is None or len(foundAddresses) >= expectedCount)
+                and addresses <= foundAddresses and names <= foundNames)
+
+    def _scanUntilKeyPress(self):
+        # Start a scan and wait until we have found one or more DOT Devices
+        print("Scanning for devices...")
+        self.__manager.enableDeviceDetection()
+
+        # Setup the keyboard input listener
+        keyboard = loadKeyboard()
+        if keyboard is not None:
+            listener = keyboard.Listener(on_press=on_press)
+            listener.start()
+            print("Press any key or wait 20 seconds to stop scanning...")
+        else:
+            print("Wait 20 seconds to stop scanning...")
+        connectedDOTCount = 0
+        startTime = movelladot_pc_sdk.XsTimeStamp_nowMs()
+        while waitForConnections and not self.errorReceived() and movelladot_pc_sdk.XsTimeStamp_nowMs() - startTime <= 20000:
+            time.sleep(0.1)
+
+            nextCount = len(self.detectedDots())
+            if nextCount != connectedDOTCount:
+                print(f"Number of connected DOTs: {nextCount}. Press any key to start.")
+                connectedDOTCount = nextCount
+
+        self.__manager.disableDeviceDetection()
+        print("Stopped scanning for devices.")
+
+    def connectDots(self, concurrent=False, max_workers=4, timeout=15.0, retries=3, backoff=0.5):
+        """
+        Connects to Movella DOTs found via either USB or Bluetooth connection
+
+        Uses the isBluetooth function of the XsPortInfo to determine if the device was detected
+        via Bluetooth or via USB. Then connects to the device accordingly
+        When using Bluetooth, a retry has been built in, since wireless connection sometimes just fails the 1st time
+        Connected devices can be retrieved using either connectedDots() or connectedUsbDots()
+
+        With concurrent=True, Bluetooth devices are opened in parallel by a pool of max_workers threads, so
+        startup takes about as long as the slowest device. Each device gets up to retries attempts, with
+        an exponential backoff starting at backoff seconds, until timeout seconds have passed. A single
+        openPort call cannot be interrupted, so the timeout only stops further retries. connectionResults()
+        reports how long each device took.
+
+        USB and Bluetooth devices should not be mixed in the same session!
+        """
+        if concurrent:
+            self._connectDotsConcurrently(max_workers, timeout, retries, backoff)
+            return
+
+        for portInfo in self.detectedDots():
+            if portInfo.isBluetooth():
+                address = portInfo.bluetoothAddress()
+
+                print(f"Opening DOT with address: @ {address}")
+                if not self.__manager.openPort(portInfo):
+                    print(f"Connection to Device {address} failed, retrying...")
+                    print(f"Device {address} retry connected:")
+                    if not self.__manager.openPort(portInfo):
+                        print(f"Could not open DOT. Reason: {self.__manager.lastResultText()}")
+                        continue
+
+                device = self.__manager.device(portInfo.deviceId())
+                if device is None:
+                    continue
+
+                self._addConnectedDot(device)
+                print(f"Found a device with Tag: {device.deviceTagName()} @ address: {address}")
+            else:
+                print(f"Opening DOT with ID: {portInfo.deviceId().toXsString()} @ port: {portInfo.portName()}, baudrate: {portInfo.baudrate()}")
+                if not self.__manager.openPort(portInfo):
+                    print(f"Could not open DOT. Reason: {self.__manager.lastResultText()}")
+                    continue
+
+                device = self.__manager.usbDevice(portInfo.deviceId())
+                if device is None:
+                    continue
+
+                self.__connectedUsbDots.append(device)
+                print(f"Device: {device.productCode()}, with ID: {device.deviceId().toXsString()} opened.")
+
+    def _connectDotsConcurrently(self, maxWorkers, timeout, retries, backoff):
+        bluetoothPorts = [portInfo for portInfo in self.detectedDots() if portInfo.isBluetooth()]
+        self._openBluetoothPorts(bluetoothPorts, maxWorkers, timeout, retries, backoff)
+
+    def _openBluetoothPorts(self, bluetoothPorts, maxWorkers, timeout, retries, backoff):
+        if not bluetoothPorts:
+            return
+        startTime = time.perf_counter()
+        connectedBefore = len(self.__connectedDots)
+        with ThreadPoolExecutor(max_workers=max(1, maxWorkers)) as pool:
+            # map keeps detection order, so connectedDots() does not depend on which device was fastest
+            results = list(pool.map(lambda portInfo: self._connectBluetoothDot(portInfo, timeout, retries, backoff),
+                                    bluetoothPorts))
+
+        for result, device in results:
+            self.__connectionResults[result.address] = result
+            print(result)
+            if device is not None:
+                self._addConnectedDot(device)
+        connected = len(self.__connectedDots) - connectedBefore
+        print(f"Connected {connected} of {len(bluetoothPorts)} DOT(s) in {time.perf_counter() - startTime:.2f} s")
+
+    def _connectBluetoothDot(self, portInfo, timeout, retries, backoff):
+        """
+        Opens one Bluetooth DOT, retrying with exponential backoff
+
+        Returns:
+            A tuple of the ConnectionResult and the XsDotDevice, which is None if the connection failed
+        """
+        address = portInfo.bluetoothAddress()
+        startTime = time.perf_counter()
+        attempts = 0
+        delay = backoff
+        reason = ""
+        while True:
+            attempts += 1
+            if self.__manager.openPort(portInfo):
+                device = self.__manager.device(portInfo.deviceId())
+                if device is not None:
+                    return ConnectionResult(address, True, attempts, time.perf_counter() - startTime), device
+                reason = "device not available after opening the port"
+            else:
+                reason = self.__manager.lastResultText()
+
+            elapsed = time.perf_counter() - startTime
+            if attempts >= retries or elapsed + delay >= timeout:
+                break
+            time.sleep(delay)
+            delay *= 2
+
+        return ConnectionResult(address, False, attempts, time.perf_counter() - startTime, reason), None
+
+    def connectKnownDots(self, cache_path, scan_timeout=5.0, max_workers=4, timeout=15.0, retries=2, backoff=0.5):
+        """
+        Reconnects to the Movella DOTs in the known-device cache without a full scan
+
+        Where the SDK can rebuild a port from the cached identity (address, device id and port name), the
+        cached devices are opened directly and concurrently, like connectDots(concurrent=True). Only the
+        simulated SDK can do that, the real SDK only hands out ports in advertisements. The devices that could
+        not be opened directly are scanned for, and that scan stops as soon as all of them advertised or after
+        scan_timeout seconds, instead of waiting for a key press or the full scan time.
+
+        Parameters:
+            cache_path: The cache file written by saveKnownDots
+            scan_timeout: Maximum number of seconds to scan for cached devices that did not open directly
+        Returns:
+            The number of connected devices, 0 if the cache is empty or none of the devices could be reached
+        """
+        self.__knownDots = loadKnownDots(cache_path)
+        if not self.__knownDots:
+            return 0
+
+        print(f"Reconnecting to {len(self.__knownDots)} known DOT(s)...")
+        ports = [self._knownPortInfo(entry) for entry in self.__knownDots.values()]
+        self._openBluetoothPorts([portInfo for portInfo in ports if portInfo is not None], max_workers, timeout,
+                                 retries, backoff)
+
+        connected = {str(device.bluetoothAddress()) for device in self.__connectedDots}
+        missing = [address for address in self.__knownDots if address not in connected]
+        if missing:
+            print(f"Scanning for {len(missing)} known DOT(s) that did not open directly...")
+            self.scanForDots(addresses=missing, timeout=scan_timeout, headless=True)
+            ports = [portInfo for portInfo in self.__detectedDots if str(portInfo.bluetoothAddress()) in missing]
+            self._openBluetoothPorts(ports, max_workers, timeout, retries, backoff)
+        return len(self.__connectedDots)
+
+    def _knownPortInfo(self, entry):
+        """
+        Rebuilds the XsPortInfo of a cached device
+
+        Returns:
+            The XsPortInfo, or None if the entry has no device id or the SDK can't build ports from one
+        """
+        if "deviceId" not in entry:
+            return None
+        try:
+            return movelladot_pc_sdk.XsPortInfo(entry["address"], movelladot_pc_sdk.XsDeviceId(entry["deviceId"]),
+                                                portName=entry.get("portName", entry["address"]))
+        except (TypeError, AttributeError) as error:
+            # the SWIG wrapped SDK takes no keyword arguments and has no constructor for a known bluetooth port
+            self.__eventLog.debug("knownPortUnavailable", f"Cannot rebuild the port of {entry['address']}: {error}",
+                                  address=entry["address"])
+            return None
+
+    def saveKnownDots(self, cache_path):
+        """
+        Stores the connected Movella DOTs in the known-device cache for connectKnownDots
+
+        Call this after the devices are configured, so the cached filter profile and output rate are current.
+        Cached devices that are not connected right now are kept.
+
+        Parameters:
+            cache_path: The cache file
+        """
+        for device in self.__connectedDots:
+            entry = knownDotEntry(device)
+            self.__knownDots[entry["address"]] = entry
+        saveKnownDots(cache_path, self.__knownDots.values())
+
+    def knownDots(self):
+        """
+        Returns:
+             A dictionary from bluetooth address to the cached entry (deviceId, portName, tag, filterProfile,
+             outputRate)
+             loaded by connectKnownDots or written by saveKnownDots
+        """
+        return self.__knownDots
+
+    def registerConsumer(self, fields, rate=None, bluetoothAddress=None):
+        """
+        Declares which data a consumer of live data needs, input for negotiatePayload and for the fields
+        decode_samples copies out of every packet
+
+        Parameters:
+            fields: Iterable of data fields the consumer reads: EULER, FREE_ACC and/or QUATERNION
+            rate: Minimum output rate in Hz the consumer needs, None if it has no preference
+            bluetoothAddress: The Movella DOT the consumer reads, None for all devices
+        """
+        self.__consumers.append((bluetoothAddress, frozenset(fields), rate))
+        self.__decodeQuaternion = dict()
+
+    def negotiatePayload(self, bluetoothAddress):
+        """
+        Picks the payload mode and output rate for a Movella DOT from the consumers registered for it
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT
+        Returns:
+            A tuple of the smallest XsPayloadMode that carries every field the consumers need, and the
+            lowest supported output rate that satisfies all of them (None if none of them asked for a rate).
+            Without registered consumers the mode is XsPayloadMode_ExtendedEuler.
+        """
+        fields = set()
+        rate = None
+        for address, consumerFields, consumerRate in self.__consumers:
+            if address is None or address == bluetoothAddress:
+                fields |= consumerFields
+                if consumerRate is not None:
+                    rate = consumerRate if rate is None else max(rate, consumerRate)
+        return getattr(movelladot_pc_sdk, smallestPayloadMode(fields)), lowestOutputRate(rate)
+
+    def _needsQuaternion(self, bluetoothAddress):
+        """
+        Returns:
+            True if a consumer registered for the device reads QUATERNION, or if none registered at all
+        """
+        needed = self.__decodeQuaternion.get(bluetoothAddress)
+        if needed is None:
+            consumers = [fields for address, fields, rate in self.__consumers
+                         if address is None or address == bluetoothAddress]
+            needed = not consumers or any(QUATERNION in fields for fields in consumers)
+            self.__decodeQuaternion[bluetoothAddress] = needed
+        return needed
+
+    def configureDots(self, config, max_workers=4):
+        """
+        Applies a DeviceConfig to all connected Movella DOTs at the same time
+
+        Settings that already match are skipped, see configureDevice. Since every setting is a blocking BLE
+        round trip, configuring the devices in parallel makes this take about as long as the slowest device.
+        NEGOTIATE in the payloadMode or outputRate of config is resolved per device with negotiatePayload.
+
+        Parameters:
+            config: The DeviceConfig to apply
+            max_workers: Maximum number of devices configured at the same time
+        Returns:
+            A dictionary from bluetooth address to the ConfigurationReport of that device
+        """
+        self.__lastConfig = config
+        devices = self.__connectedDots
+        if not devices:
+            return dict()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            reports = list(pool.map(
+                lambda device: configureDevice(device, self._resolveConfig(config, str(device.bluetoothAddress())),
+                                               self.__appliedConfig[str(device.bluetoothAddress())]),
+                devices))
+        return {report.address: report for report in reports}
+
+    def _resolveConfig(self, config, bluetoothAddress):
+        if config.payloadMode != NEGOTIATE and config.outputRate != NEGOTIATE:
+            return config
+        payloadMode, outputRate = self.negotiatePayload(bluetoothAddress)
+        return DeviceConfig(config.filterProfile,
+                            outputRate if config.outputRate == NEGOTIATE else config.outputRate,
+                            config.logOptions,
+                            payloadMode if config.payloadMode == NEGOTIATE else config.payloadMode)
+
+    def superviseDots(self, config=None, stall_timeout=1.0, check_interval=0.1, timeout=5.0, retries=5,
+                      backoff=0.2):
+        """
+        Watches the connected Movella DOTs on a background thread and reconnects the ones that drop out
+
+        A device is recovered when it reports a power down or disconnect, or when no packet arrived for
+        stall_timeout seconds. Each recovery runs on its own thread, so the other devices keep streaming: the
+        port is closed and reopened, the configuration is applied again and the device takes its old place in
+        connectedDots(). Subscriptions and packet buffers are keyed by bluetooth address, so readers pick up
+        the reconnected device's data without doing anything. The stream statistics and clock mapping of the
+        device start over, its sampleTimeFine restarts. recoveries() reports how long each recovery took. Runs until stopSupervising or cleanup is called.
+
+        Parameters:
+            config: The DeviceConfig to restore, None for the one last passed to configureDots
+            stall_timeout: Seconds without packets after which a measuring device is considered stalled
+            check_interval: Seconds between checks for stalled devices
+            timeout, retries, backoff: Reconnection limits per recovery, see connectDots
+        """
+        config = config if config is not None else self.__lastConfig
+        self.__supervisorStop.clear()
+        now = time.perf_counter()
+        for device in self.__connectedDots:
+            address = str(device.bluetoothAddress())
+            self.__supervisedPorts[address] = device.portInfo()
+            self.__supervisedSince[address] = now
+
+        def supervise():
+            while not self.__supervisorStop.is_set():
+                self.__supervisorWake.wait(check_interval)
+                self.__supervisorWake.clear()
+                if self.__supervisorStop.is_set():
+                    break
+                connected = {str(device.bluetoothAddress()) for device in self.__connectedDots}
+                now = time.perf_counter()
+                for address in self.__supervisedPorts:
+                    if address not in connected or self._stalled(address, now, stall_timeout):
+                        self._startRecovery(address, config, timeout, retries, backoff)
+
+        Thread(target=supervise, daemon=True).start()
+
+    def stopSupervising(self):
+        """
+        Stops the supervisor started by superviseDots, call this before stopping the measurement on purpose
+        """
+        self.__supervisorStop.set()
+        self.__supervisorWake.set()
+
+    def _stalled(self, address, now, stallTimeout):
+        lastArrival = self.__streamStats[address].lastArrival()
+        since = self.__supervisedSince[address]
+        return now - (since if lastArrival is None else max(lastArrival, since)) > stallTimeout
+
+    def _startRecovery(self, address, config, timeout, retries, backoff):
+        with self.__lock:
+            if address in self.__recovering:
+                return
+            self.__recovering.add(address)
+        Thread(target=self._recoverDot, args=(address, config, timeout, retries, backoff), daemon=True).start()
+
+    def _recoverDot(self, address, config, timeout, retries, backoff):
+        startTime = time.perf_counter()
+        portInfo = self.__supervisedPorts[address]
+        try:
+            self.__eventLog.warning("reconnecting", f"DOT {address} stopped streaming, reconnecting...", address=address)
+            self._removeConnectedDot(address)
+            self.__manager.closePort(portInfo)
+
+            result, device = self._connectBluetoothDot(portInfo, timeout, retries, backoff)
+            if device is not None:
+                # a reopened device starts from its defaults, nothing of the old session can be skipped
+                self.__appliedConfig[address] = dict()
+                with self.__lock:
+                    # sampleTimeFine restarts from another value after a reconnect, the jump is not a gap
+                    self.__clockMappings.pop(address, None)
+                    self.__streamStats[address] = StreamStats()
+                if config is not None:
+                    report = configureDevice(device, self._resolveConfig(config, address), self.__appliedConfig[address])
+                    if not report.succeeded():
+                        result = ConnectionResult(address, False, result.attempts, result.seconds, str(report))
+                self._addConnectedDot(device)
+            result.seconds = time.perf_counter() - startTime
+            self.__recoveries.append(result)
+            self.__eventLog.log(INFO if result.connected else ERROR, "recovery", f"Recovery of {result}",
+                                address=address, connected=result.connected, seconds=result.seconds)
+        finally:
+            self.__supervisedSince[address] = time.perf_counter()
+            with self.__lock:
+                self.__recovering.discard(address)
+
+    def recoveries(self):
+        """
+        Returns:
+             A list with a ConnectionResult for every recovery superviseDots attempted, seconds is the time from
+             detecting the dropout until the device was configured and measuring again
+        """
+        return self.__recoveries
+
+    def _addConnectedDot(self, device):
+        # connectedDots() is copy-on-write, readers can keep iterating or indexing the list they got
+        with self.__lock:
+            dots = list(self.__connectedDots)
+            dots.append(device)
+            if self.__supervisedPorts:
+                # a reconnected device takes its old place
+                order = list(self.__supervisedPorts)
+                dots.sort(key=lambda dot: order.index(str(dot.bluetoothAddress()))
+                          if str(dot.bluetoothAddress()) in self.__supervisedPorts else len(order))
+            self.__connectedDots = dots
+
+    def _removeConnectedDot(self, bluetoothAddress):
+        with self.__lock:
+            self.__connectedDots = [dot for dot in self.__connectedDots
+                                    if str(dot.bluetoothAddress()) != str(bluetoothAddress)]
+
+    def connectionResults(self):
+        """
+        Returns:
+             A dictionary from bluetooth address to the ConnectionResult of the last concurrent connectDots call
+        """
+        return self.__connectionResults
+
+    def detectUsbDevices(self):
+        """
+        Scans for USB connected Movella DOT devices for data export
+        """
+        print("Scanning for devices...")
+        self.__detectedDots = self.__manager.detectUsbDevices()
+
+    def manager(self):
+        """
+        Returns:
+             A pointer to the XsDotConnectionManager
+        """
+        return self.__manager
+
+    def detectedDots(self):
+        """
+        Returns:
+             An XsPortInfoArray containing information on detected Movella DOT devices
+        """
+        return self.__detectedDots
+
+    def connectedDots(self):
+        """
+        Returns:
+            A list containing an XsDotDevice pointer for each Movella DOT device connected via Bluetooth. The list
+            is never changed after it is returned, devices that connect or drop out replace it with a new one.
+        """
+        return self.__connectedDots
+
+    def connectedUsbDots(self):
+        """
+        Returns:
+             A list containing an XsDotUsbDevice pointer for each Movella DOT device connected via USB */
+        """
+        return self.__connectedUsbDots
+
+    def errorReceived(self):
+        """
+        Returns:
+             True if an error was received through the onError callback
+        """
+        return self.__errorReceived
+
+    def exportDone(self):
+        """
+        True if the export has finished
+        """
+        return self.__exportDone
+
+    def updateDone(self):
+        """
+        Returns:
+             Whether update done was received through the onDeviceUpdateDone callback
+        """
+        return self.__updateDone
+
+    def resetUpdateDone(self):
+        """
+        Resets the update done member variable to be ready for a next device update
+        """
+        self.__updateDone = False
+
+    def recordingStopped(self):
+        """
+        Returns:
+             True if the device indicated the recording has stopped
+        """
+        return self.__recordingStopped
+
+    def resetRecordingStopped(self):
+        """
+        Resets the recording stopped member variable to be ready for a next recording
+        """
+        self.__recordingStopped = False
+
+    def packetsAvailable(self):
+        """
+        Returns:
+             True if a data packet is available for each of the connected Movella DOT devices
+        """
+        for dev in self.__connectedDots:
+            if self.packetAvailable(dev.bluetoothAddress()) == 0:
+                return False
+        return True
+
+    def packetAvailable(self, bluetoothAddress):
+        """
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT to check for a ready data packet
+        Returns:
+            True if a data packet is available for the Movella DOT with the provided bluetoothAddress
+        """
+        with self.__lock:
+            return len(self._queueFor(bluetoothAddress)) > 0
+
+    def waitForPacket(self, bluetoothAddress, timeout=None):
+        """
+        Blocks until a data packet is available for the Movella DOT with the provided bluetoothAddress
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT to wait for
+            timeout: Maximum number of seconds to wait, None waits until a packet arrives or cleanup is called
+        Returns:
+            True if a data packet is available, False if the wait timed out or the handler is closing
+        """
+        with self.__lock:
+            buffer = self._queueFor(bluetoothAddress)
+            self.__packetArrived.wait_for(lambda: len(buffer) > 0 or self.__closing, timeout)
+            return len(buffer) > 0
+
+    def waitForAnyPacket(self, timeout=None):
+        """
+        Blocks until a data packet is available for any of the Movella DOT devices
+
+        Parameters:
+            timeout: Maximum number of seconds to wait, None waits until a packet arrives or cleanup is called
+        Returns:
+            True if a data packet is available, False if the wait timed out or the handler is closing
+        """
+        with self.__lock:
+            self.__queueAllAddresses = True
+            return self.__packetArrived.wait_for(self._anyPacketBuffered, timeout) and not self.__closing
+
+    def _queueFor(self, bluetoothAddress):
+        # called with the lock held, from now on live packets of the device are queued for the readers
+        self.__queuedAddresses.add(bluetoothAddress)
+        return self.__packetBuffer[bluetoothAddress]
+
+    def _anyPacketBuffered(self):
+        if self.__closing:
+            return True
+        for buffer in self.__packetBuffer.values():
+            if len(buffer) > 0:
+                return True
+        return False
+
+    def subscribe(self, bluetoothAddress, conflate=False):
+        """
+        Creates a non-destructive reader for the live data of a Movella DOT
+
+        All subscriptions of a device share one BroadcastRing, so every subscriber sees the full stream
+        without extra copies and without taking packets away from getNextPacket or other subscribers.
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT to subscribe to
+            conflate: If True, the subscription only hands out the newest sample and counts the ones it skips.
+                Recorders should leave this off, low latency control loops should turn it on.
+        Returns:
+            A Subscription that receives packets published from now on
+        """
+        with self.__lock:
+            subscription = Subscription(bluetoothAddress, self.__broadcastBuffer[bluetoothAddress], self.__packetArrived,
+                                        conflate)
+            self.__subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Closes a subscription created with subscribe
+        """
+        with self.__lock:
+            if subscription in self.__subscriptions:
+                self.__subscriptions.remove(subscription)
+        subscription.close()
+
+    def addSampleListener(self, listener):
+        """
+        Calls listener(bluetoothAddress, packet) for every live packet, with the same packet or DotSample that is
+        buffered. The listener runs on the SDK's callback thread after the packet is buffered, so it must return
+        quickly and must not call back into the SDK, e.g. hand the packet to an event loop and return.
+        """
+        # copy-on-write, onLiveDataAvailable iterates the list without taking the lock
+        with self.__lock:
+            self.__sampleListeners = self.__sampleListeners + [listener]
+
+    def removeSampleListener(self, listener):
+        with self.__lock:
+            self.__sampleListeners = [known for known in self.__sampleListeners if known != listener]
+
+    def addEventListener(self, listener):
+        """
+        Calls listener(name, *args) when a long running operation completes or the handler shuts down:
+            "exportDone" (device): a recording export finished, see onRecordedDataDone
+            "updateDone" (portInfo, result): a firmware update finished, see onDeviceUpdateDone
+            "recordingStopped" (device): a recording stopped, see onRecordingStopped
+            "error" (result, errorString): the SDK reported an error, see onError
+            "closed" (): cleanup closed the connection manager
+        Like sample listeners, event listeners run on the SDK's callback thread.
+        """
+        with self.__lock:
+            self.__eventListeners = self.__eventListeners + [listener]
+
+    def removeEventListener(self, listener):
+        with self.__lock:
+            self.__eventListeners = [known for known in self.__eventListeners if known != listener]
+
+    def _notifyEvent(self, name, *args):
+        for listener in self.__eventListeners:
+            listener(name, *args)
+
+    def subscriptions(self):
+        """
+        Returns:
+             A list of the open subscriptions, e.g. for checking their lag() and dropped() counters
+        """
+        with self.__lock:
+            return list(self.__subscriptions)
+
+    def droppedPackets(self, bluetoothAddress):
+        """
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT to check
+        Returns:
+            The number of live data packets discarded because the device's packet buffer was full,
+            always 0 while no queue reader was used for the device
+        """
+        with self.__lock:
+            return self._overflows(bluetoothAddress)
+
+    def _overflows(self, bluetoothAddress):
+        if bluetoothAddress not in self.__packetBuffer:
+            return 0
+        return self.__packetBuffer[bluetoothAddress].dropped()
+
+    def packetsReceived(self):
+        """
+        Returns:
+             The number of packets received during data export
+        """
+        return self.__packetsReceived
+
+    def getNextPacket(self, bluetoothAddress):
+        """
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT to get the next packet for
+        Returns:
+             The next available data packet for the Movella DOT with the provided bluetoothAddress.
+             This is a DotSample instead of an XsDataPacket when the handler decodes samples.
+        """
+        with self.__lock:
+            packet = self._queueFor(bluetoothAddress).pop()
+            if packet is not None:
+                self.__spaceAvailable.notify()
+        return packet
+
+    def getNextSample(self, bluetoothAddress):
+        """
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT to get the next sample for
+        Returns:
+             The next available DotSample for the Movella DOT with the provided bluetoothAddress, or None
+        """
+        packet = self.getNextPacket(bluetoothAddress)
+        if packet is None or self.__decodeSamples:
+            return packet
+        return decodePacket(bluetoothAddress, packet)
+
+    def drain(self, bluetoothAddress, max_samples=None):
+        """
+        Removes everything queued for a Movella DOT in a single locked step
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT to drain
+            max_samples: The maximum number of samples to return, None returns all of them
+        Returns:
+            A NumPy structured array with dtype SAMPLE_DTYPE (timestamp, euler, freeAcc, quaternion),
+            oldest sample first. The array is empty if nothing was queued.
+        """
+        with self.__lock:
+            packets = self._queueFor(bluetoothAddress).popMany(max_samples)
+            if packets:
+                self.__spaceAvailable.notify_all()
+        if not self.__decodeSamples:
+            packets = [decodePacket(bluetoothAddress, packet) for packet in packets]
+        return samplesToArray(packets)
+
+    def streamStats(self):
+        """
+        Returns:
+             A dictionary from bluetooth address to a StreamSnapshot with the effective sample rate, arrival
+             jitter, sampleTimeFine gaps, buffer overflows and subscriber drops of that device.
+             Buffer overflows only count for devices whose packet buffer is read, see getNextPacket.
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            subscriberDrops = defaultdict(int)
+            for subscription in self.__subscriptions:
+                subscriberDrops[subscription.address()] += subscription.dropped()
+            return {address: stats.snapshot(address, now, self._overflows(address), subscriberDrops[address])
+                    for address, stats in self.__streamStats.items()}
+
+    def lastStatsSnapshot(self):
+        """
+        Returns:
+             The streamStats() taken by the last run of the stats reporter, empty if it is not running
+        """
+        return self.__lastStatsSnapshot
+
+    def startStatsReporter(self, interval=5.0, callback=None):
+        """
+        Takes a streamStats() snapshot every interval seconds on a background thread until cleanup is called
+
+        Parameters:
+            interval: Number of seconds between snapshots
+            callback: Called with each snapshot. If None, each device's statistics are printed.
+        """
+        def report():
+            while not self.__statsReporterStop.wait(interval):
+                self.__lastStatsSnapshot = self.streamStats()
+                if callback is not None:
+                    callback(self.__lastStatsSnapshot)
+                else:
+                    for snapshot in self.__lastStatsSnapshot.values():
+                        print(f"\n{snapshot}", flush=True)
+
+        Thread(target=report, daemon=True).start()
+
+    def toHostTime(self, bluetoothAddress, sampleTimeFine):
+        """
+        Maps a sampleTimeFine of a Movella DOT to the host clock, see ClockMapping
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT
+            sampleTimeFine: A sampleTimeFine of a recent packet of that device
+        Returns:
+            The time.perf_counter time the sample arrives at on average, None if no packet arrived yet or
+            sampleTimeFine is None
+        """
+        if sampleTimeFine is None:
+            return None
+        with self.__lock:
+            mapping = self.__clockMappings.get(bluetoothAddress)
+            return None if mapping is None else mapping.toHostTime(sampleTimeFine)
+
+    def clockMapping(self, bluetoothAddress):
+        """
+        Returns:
+            The ClockMapping of a Movella DOT, for its drift() and offset(), None if no packet arrived yet
+        """
+        return self.__clockMappings.get(bluetoothAddress)
+
+    def decodesSamples(self):
+        """
+        Returns:
+             True if live packets are decoded into DotSample records in the SDK callback
+        """
+        return self.__decodeSamples
+
+    def addDeviceToProgressBuffer(self, bluetoothAddress):
+        """
+        Initialize internal progress buffer for an Movella DOT device
+
+        Parameters:
+            bluetoothAddress: The bluetooth address of the Movella DOT
+        """
+        self.__progress[bluetoothAddress] = 0
+
+    def eventLog(self):
+        """
+        Returns:
+             The EventLog the SDK callbacks report battery levels, button clicks, errors and progress to
+        """
+        return self.__eventLog
+
+    def progress(self):
+        """
+        Returns:
+             The current progress indication of the connected Movella DOT devices
+        """
+        return self.__progress
+
+    def _outputDeviceProgress(self, device):
+        """
+        Helper function for reporting file export info to the event log.
+        """
+        line = 'Exporting... '
+        if self.__exportDone:
+            line += 'done!'
+        elif self.__progressTotal != 0xffff:
+            line += '{:.1f}%'.format(100.0 * self.__progressCurrent / self.__progressTotal)
+        else:
+            line += f'{self.__progressCurrent}'
+        if self.__exportDone:
+            self.__eventLog.info("exportDone", line, address=str(device.bluetoothAddress()),
+                                 current=self.__progressCurrent, total=self.__progressTotal)
+        else:
+            self.__eventLog.info(PROGRESS, line, address=str(device.bluetoothAddress()),
+                                 current=self.__progressCurrent, total=self.__progressTotal)
+
+    def onAdvertisementFound(self, port_info):
+        """
+        Called when an Movella DOT device advertisement was received. Updates m_detectedDots.
+        Parameters:
+            port_info: The XsPortInfo of the discovered information
+        """
+        if self.__whitelist is None:
+            self.__whitelist = defaultWhitelist()
+        if not self.__whitelist or port_info.bluetoothAddress() in self.__whitelist:
+            self.__detectedDots.append(port_info)
+            self._updateScanTarget(port_info)
+        else:
+            self.__eventLog.debug("advertisementIgnored", f"Ignoring {port_info.bluetoothAddress()}",
+                                  address=str(port_info.bluetoothAddress()))
+
+    def onBatteryUpdated(self, device, batteryLevel, chargingStatus):
+        """
+        Called when a battery status update is available. Reports it to the event log.
+        Parameters:
+            device: The device that initiated the callback. This may be 0 in some cases
+            batteryLevel: The battery level in percentage
+            chargingStatus: The charging status of the battery. 0: Not charging, 1: charging
+        """
+        self.__eventLog.info("battery", f"{device.deviceTagName()} BatteryLevel: {batteryLevel} Charging status: {chargingStatus}",
+                             address=str(device.bluetoothAddress()), batteryLevel=batteryLevel,
+                             chargingStatus=chargingStatus)
+
+    def onError(self, result, errorString):
+        """
+        Called when an internal error has occurred. Reports it to the event log.
+        Parameters:
+            result: The XsResultValue related to this error
+            errorString: The error string with information on the problem that occurred
+        """
+        resultText = str(movelladot_pc_sdk.XsResultValueToString(result))
+        self.__eventLog.error("error", f"{resultText}, error received: {errorString}", result=resultText,
+                              errorString=str(errorString))
+        self.__errorReceived = True
+        self.__scanDone.set()
+        self._notifyEvent("error", result, errorString)
+
+    def onLiveDataAvailable(self, device, packet):
+        """
+        Called when new data has been received from a device
+        Adds the new packet to the device's packet buffer, either as a copy of the packet or decoded into
+        a DotSample when the handler was created with decode_samples=True. The quaternion is only decoded when
+        a consumer registered for the device reads it, see registerConsumer
+        The packet buffer is skipped until a queue reader such as getNextPacket was used for the device.
+        When the buffer is full the buffer policy decides which packet is lost. With the BLOCK
+        policy this waits up to block_timeout seconds for a consumer to make room before dropping.
+        The packet is also published to the device's broadcast ring for subscribers.
+        Wakes up any thread blocked in waitForPacket, waitForAnyPacket or Subscription.wait.
+        Updates the stream statistics of the device, see streamStats, and its clock mapping, see toHostTime.
+
+        Parameters:
+            device: The device that initiated the callback.
+            packet: The data packet that has been received (and processed).
+        """
+        arrivalTime = time.perf_counter()
+        address = device.portInfo().bluetoothAddress()
+        if self.__decodeSamples:
+            packet = decodePacket(address, packet, arrivalTime, self._needsQuaternion(address))
+            sampleTimeFine = packet.sampleTimeFine
+        else:
+            packet = movelladot_pc_sdk.XsDataPacket(packet)
+            sampleTimeFine = packet.sampleTimeFine() if packet.containsSampleTimeFine() else None
+        with self.__lock:
+            self.__streamStats[address].update(arrivalTime, sampleTimeFine)
+            if sampleTimeFine is not None:
+                self.__clockMappings[address].update(sampleTimeFine, arrivalTime)
+            self.__broadcastBuffer[address].publish(packet)
+            if self.__queueAllAddresses or address in self.__queuedAddresses:
+                buffer = self.__packetBuffer[address]
+                if not buffer.push(packet) and self.__bufferPolicy == BLOCK:
+                    if self.__spaceAvailable.wait_for(lambda: not buffer.full(), self.__blockTimeout):
+                        buffer.push(packet)
+                    else:
+                        buffer.countDrop()
+            self.__packetArrived.notify_all()
+        for listener in self.__sampleListeners:
+            listener(address, packet)
+
+    def onProgressUpdated(self, device, current, total, identifier):
+        """
+        Called when a long-duration operation has made some progress or has completed.
+        When device is an XsDotUsbDevice, the progress applies to data export progress
+        When device is an XsDotDevice, the progress applies to OTA and Magnetic Field Mapping progress
+        Parameters:
+            device: The device that initiated the callback.
+            current: The current progress.
+            total: The total work to be done. When current equals total, the task is completed.
+            identifier: An identifier for the task. This may for example be a filename for file read operations.
+        """
+        if isinstance(device, movelladot_pc_sdk.XsDotUsbDevice):
+            self.__progressCurrent = current
+            self.__progressTotal = total
+            self._outputDeviceProgress(device)
+        else:
+            address = device.bluetoothAddress()
+            if address not in self.__progress:
+                self.__progress[address] = current
+            if current > self.__progress[address]:
+                self.__progress[address] = current
+                line = f"Update: {current} Total: {total}"
+                if identifier:
+                    line += f" Remark: {identifier}"
+                self.__eventLog.info(PROGRESS, line, address=str(address), current=current, total=total,
+                                     identifier=str(identifier))
+
+    def onDeviceUpdateDone(self, portInfo, result):
+        """
+        Called when the firmware update process has completed. Reports it to the event log.
+        Parameters:
+            portInfo: The XsPortInfo of the updated device
+            result: The XsDotFirmwareUpdateResult of the firmware update
+        """
+        resultText = str(movelladot_pc_sdk.XsDotFirmwareUpdateResultToString(result))
+        self.__eventLog.info("updateDone", f"{portInfo.bluetoothAddress()}  Firmware Update done. Result: {resultText}",
+                             address=str(portInfo.bluetoothAddress()), result=resultText)
+        self.__updateDone = True
+        self._notifyEvent("updateDone", portInfo, result)
+
+    def onRecordingStopped(self, device):
+        """
+        Called when a recording has stopped. Reports it to the event log.
+        Parameters:
+            device: The device that initiated the callback.
+        """
+        self.__eventLog.info("recordingStopped", f"{device.deviceTagName()} Recording stopped",
+                             address=str(device.bluetoothAddress()))
+        self.__recordingStopped = True
+        self._notifyEvent("recordingStopped", device)
+
+    def onDeviceStateChanged(self, device, newState, oldState):
+        """
+        Called when the device state has changed.
+        Used for removing/disconnecting the device when it indicates a power down.
+        Parameters:
+            device: The device that initiated the callback.
+            newState: The new device state.
+            oldState: The old device state.
+        """
+        if newState == movelladot_pc_sdk.XDS_Destructing and not self.__closing:
+            self.__eventLog.warning("poweredDown", f"{device.deviceTagName()} Device powered down",
+                                    address=str(device.bluetoothAddress()))
+            self._removeConnectedDot(device.bluetoothAddress())
+            # let superviseDots start the recovery right away instead of at its next check
+            self.__supervisorWake.set()
+
+    def onButtonClicked(self, device, timestamp):
+        """
+        Called when the device's button has been clicked. Reports it to the event log.
+        Parameters:
+            device: The device that initiated the callback.
+            timestamp: The timestamp at which the button was clicked
+        """
+        self.__eventLog.info("buttonClicked", f"{device.deviceTagName()} Button clicked at {timestamp}",
+                             address=str(device.bluetoothAddress()), timestamp=timestamp)
+
+    def onRecordedDataAvailable(self, device, packet):
+        """
+        Called when new data has been received from a device that is exporting a recording
+
+        The callback rate will be as fast as the data comes in and not necessarily reflect real-time. For
+        timing information, please refer to the SampletimeFine which is available when the Timestamp field is exported.
+        Parameters:
+            device: The device that initiated the callback.
+            packet: The data packet that has been received.
+        """
+        self.__packetsReceived += 1
+
+    def onRecordedDataDone(self, device):
+        """
+        Called when a device that is exporting a recording is finished with exporting.
+
+        This callback will occur in any sitation that stops the export of the recording, such as
+        the export being completed, the export being stopped by request or an internal failure.
+        Parameters:
+            device: The device that initiated the callback.
+        """
+        self.__exportDone = True
+        self._outputDeviceProgress(device)
+        self._notifyEvent("exportDone", device)
+
+
+
+
+
+
@@ -0,0 +1,609 @@
+# Simulated stand-in for the movelladot_pc_sdk wheel, which only exists for Windows.
+#
+# Implements the part of the SDK that XdpcHandler, AccelerometerGamepad and the racer receiver use, so they can be
+# run and benchmarked on Linux without any hardware. xdpc.sdk loads this module instead of the real SDK when the
+# XDPC_BACKEND environment variable is set to "sim".
+#
+# The simulated devices are configured with environment variables, or by calling configure() before the connection
+# manager is created:
+#   XDPC_SIM_DEVICES  number of simulated DOTs (default 1)
+#   XDPC_SIM_RATE     output rate in Hz (default 60)
+#   XDPC_SIM_REPLAY   comma separated CSV files to replay, one per device. Accepts the CSV files written by the
+#                     SDK's enableLogging (SampleTimeFine, Euler_X.. / Quat_W.., FreeAcc_X.. columns)
+#
+# Without replay files every device plays a synthetic motion: slow roll/pitch oscillations with a sharp free
+# acceleration spike every couple of seconds.
+
+import csv
+import math
+import os
+import random
+import threading
+import time
+
+XsPayloadMode_HighFidelitywMag = 1
+XsPayloadMode_ExtendedQuaternion = 2
+XsPayloadMode_CompleteQuaternion = 3
+XsPayloadMode_OrientationEuler = 4
+XsPayloadMode_OrientationQuaternion = 5
+XsPayloadMode_FreeAcceleration = 6
+XsPayloadMode_ExtendedEuler = 7
+XsPayloadMode_CompleteEuler = 16
+XsPayloadMode_HighFidelity = 17
+XsPayloadMode_DeltaQuantitieswMag = 18
+XsPayloadMode_DeltaQuantities = 19
+XsPayloadMode_RateQuantitieswMag = 20
+XsPayloadMode_RateQuantities = 21
+XsPayloadMode_CustomMode1 = 22
+XsPayloadMode_CustomMode2 = 23
+XsPayloadMode_CustomMode3 = 24
+XsPayloadMode_CustomMode4 = 25
+XsPayloadMode_CustomMode5 = 26
+
+XRM_Heading = 1
+XRM_DefaultAlignment = 4
+
+XsLogOptions_Quaternion = 0
+XsLogOptions_Euler = 1
+
+XDS_Initial = 0
+XDS_Measurement = 2
+XDS_Destructing = 9
+
+XRV_OK = 0
+XRV_ERROR = 257
+XRV_SYNC_COULD_NOT_START = 1234
+
+SUPPORTED_OUTPUT_RATES = (1, 4, 10, 12, 15, 20, 30, 60, 120)
+
+# Which fields each simulated payload mode carries: (orientation, free acceleration)
+_PAYLOAD_FIELDS = {
+    XsPayloadMode_ExtendedQuaternion: (True, True),
+    XsPayloadMode_CompleteQuaternion: (True, True),
+    XsPayloadMode_OrientationEuler: (True, False),
+    XsPayloadMode_OrientationQuaternion: (True, False),
+    XsPayloadMode_FreeAcceleration: (False, True),
+    XsPayloadMode_ExtendedEuler: (True, True),
+    XsPayloadMode_CompleteEuler: (True, True),
+    XsPayloadMode_CustomMode1: (True, True),
+    XsPayloadMode_CustomMode2: (True, True),
+    XsPayloadMode_CustomMode3: (True, True),
+    XsPayloadMode_CustomMode4: (True, True),
+    XsPayloadMode_CustomMode5: (True, True),
+}
+
+_config = {
+    "devices": int(os.environ.get("XDPC_SIM_DEVICES", "1")),
+    "rate": int(os.environ.get("XDPC_SIM_RATE", "60")),
+    "replay": [path for path in os.environ.get("XDPC_SIM_REPLAY", "").split(",") if path],
+    "advertisementDelay": 0.05,
+}
+
+
+def configure(devices=None, rate=None, replay=None, advertisementDelay=None):
+    """
+    Overrides the environment configuration of the simulator, affects connection managers created afterwards
+
+    Parameters:
+        devices: Number of simulated DOTs
+        rate: Default output rate in Hz
+        replay: List of CSV files to replay, one per device. Devices without a file play synthetic motion.
+        advertisementDelay: Seconds between the advertisements of the simulated devices during a scan
+    """
+    if devices is not None:
+        _config["devices"] = devices
+    if rate is not None:
+        _config["rate"] = rate
+    if replay is not None:
+        _config["replay"] = list(replay)
+    if advertisementDelay is not None:
+        _config["advertisementDelay"] = advertisementDelay
+
+
+def XsTimeStamp_nowMs():
+    return int(time.time() * 1000)
+
+
+def XsResultValueToString(result):
+    return {XRV_OK: "XRV_OK", XRV_SYNC_COULD_NOT_START: "XRV_SYNC_COULD_NOT_START"}.get(result, "XRV_ERROR")
+
+
+def XsDotFirmwareUpdateResultToString(result):
+    return str(result)
+
+
+class XsString(str):
+    def toXsString(self):
+        return str(self)
+
+
+class XsVersion:
+    def __init__(self):
+        self.__version = "simulated"
+
+    def toXsString(self):
+        return self.__version
+
+
+def xsdotsdkDllVersion(version):
+    pass
+
+
+class XsEuler:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.__values = (x, y, z)
+
+    def x(self):
+        return self.__values[0]
+
+    def y(self):
+        return self.__values[1]
+
+    def z(self):
+        return self.__values[2]
+
+    def __getitem__(self, index):
+        return self.__values[index]
+
+
+class XsQuaternion:
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        self.__values = (w, x, y, z)
+
+    def w(self):
+        return self.__values[0]
+
+    def x(self):
+        return self.__values[1]
+
+    def y(self):
+        return self.__values[2]
+
+    def z(self):
+        return self.__values[3]
+
+    def __getitem__(self, index):
+        return self.__values[index]
+
+
+class XsVector(list):
+    pass
+
+
+def _eulerToQuaternion(roll, pitch, yaw):
+    cr, sr = math.cos(math.radians(roll) / 2), math.sin(math.radians(roll) / 2)
+    cp, sp = math.cos(math.radians(pitch) / 2), math.sin(math.radians(pitch) / 2)
+    cy, sy = math.cos(math.radians(yaw) / 2), math.sin(math.radians(yaw) / 2)
+    return (cr * cp * cy + sr * sp * sy,
+            sr * cp * cy - cr * sp * sy,
+            cr * sp * cy + sr * cp * sy,
+            cr * cp * sy - sr * sp * cy)
+
+
+def _quaternionToEuler(w, x, y, z):
+    roll = math.degrees(math.atan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y)))
+    pitch = math.degrees(math.asin(max(-1.0, min(1.0, 2 * (w * y - z * x)))))
+    yaw = math.degrees(math.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z)))
+    return roll, pitch, yaw
+
+
+class XsDataPacket:
+    """
+    Simulated data packet. Copy-constructible like the SDK's XsDataPacket.
+    """
+
+    def __init__(self, other=None, sampleTimeFine=None, euler=None, freeAcc=None, quaternion=None):
+        if other is not None:
+            sampleTimeFine, euler, freeAcc, quaternion = other.__fields
+        if euler is not None and quaternion is None:
+            quaternion = _eulerToQuaternion(*euler)
+        elif quaternion is not None and euler is None:
+            euler = _quaternionToEuler(*quaternion)
+        self.__fields = (sampleTimeFine, euler, freeAcc, quaternion)
+
+    def containsSampleTimeFine(self):
+        return self.__fields[0] is not None
+
+    def sampleTimeFine(self):
+        return self.__fields[0]
+
+    def containsOrientation(self):
+        return self.__fields[1] is not None
+
+    def orientationEuler(self):
+        return XsEuler(*self.__fields[1])
+
+    def orientationQuaternion(self):
+        return XsQuaternion(*self.__fields[3])
+
+    def containsFreeAcceleration(self):
+        return self.__fields[2] is not None
+
+    def freeAcceleration(self):
+        return XsVector(self.__fields[2])
+
+
+class XsDeviceId:
+    def __init__(self, value):
+        self.__value = value
+
+    def toXsString(self):
+        return XsString(f"{self.__value:08X}")
+
+    def toInt(self):
+        return self.__value
+
+    def __eq__(self, other):
+        return isinstance(other, XsDeviceId) and other.__value == self.__value
+
+    def __hash__(self):
+        return hash(self.__value)
+
+
+class XsPortInfo:
+    def __init__(self, bluetoothAddress="", deviceId=None, portName=None, baudrate=0):
+        self.__bluetoothAddress = bluetoothAddress
+        self.__deviceId = deviceId if deviceId is not None else XsDeviceId(hash(bluetoothAddress) & 0xFFFFFFFF)
+        self.__portName = portName if portName is not None else bluetoothAddress
+        self.__baudrate = baudrate
+
+    def bluetoothAddress(self):
+        return XsString(self.__bluetoothAddress)
+
+    def isBluetooth(self):
+        return bool(self.__bluetoothAddress)
+
+    def deviceId(self):
+        return self.__deviceId
+
+    def portName(self):
+        return XsString(self.__portName)
+
+    def baudrate(self):
+        return self.__baudrate
+
+    def empty(self):
+        return not self.__bluetoothAddress and not self.__portName
+
+
+class XsFilterProfile:
+    def __init__(self, label):
+        self.__label = label
+
+    def label(self):
+        return XsString(self.__label)
+
+
+class SyntheticMotion:
+    """
+    Generates a smooth tilt motion with a free acceleration spike every spikeInterval seconds
+    """
+
+    def __init__(self, seed=0, spikeInterval=2.0):
+        rng = random.Random(seed)
+        self.__phase = rng.uniform(0, 2 * math.pi)
+        self.__spikeInterval = spikeInterval
+        self.__rng = rng
+
+    def sample(self, t):
+        """
+        Parameters:
+            t: Seconds since the start of the measurement
+        Returns:
+            A tuple of (euler, freeAcc) tuples
+        """
+        roll = 30.0 * math.sin(0.5 * t + self.__phase)
+        pitch = 15.0 * math.sin(0.8 * t + self.__phase)
+        yaw = (10.0 * t) % 360.0 - 180.0
+        freeAcc = [self.__rng.gauss(0.0, 0.2) for _ in range(3)]
+        if t % self.__spikeInterval < 0.1:
+            freeAcc[2] += 15.0
+        return (roll, pitch, yaw), tuple(freeAcc)
+
+
+class ReplayMotion:
+    """
+    Plays back a CSV file as written by the SDK's logging, looping at the end of the file
+    """
+
+    def __init__(self, path):
+        self.__rows = list()
+        with open(path, newline="") as file:
+            # SDK log files start with a few comment lines before the header
+            lines = [line for line in file if line.strip() and not line.startswith(("sep=", "//", "#"))]
+        for row in csv.DictReader(lines):
+            euler = None
+            if "Euler_X" in row:
+                euler = (float(row["Euler_X"]), float(row["Euler_Y"]), float(row["Euler_Z"]))
+            elif "Quat_W" in row:
+                euler = _quaternionToEuler(float(row["Quat_W"]), float(row["Quat_X"]), float(row["Quat_Y"]),
+                                           float(row["Quat_Z"]))
+            freeAcc = None
+            if "FreeAcc_X" in row:
+                freeAcc = (float(row["FreeAcc_X"]), float(row["FreeAcc_Y"]), float(row["FreeAcc_Z"]))
+            self.__rows.append((euler, freeAcc))
+        if not self.__rows:
+            raise ValueError(f"No samples in replay file {path}")
+        self.__index = 0
+
+    def sample(self, t):
+        row = self.__rows[self.__index]
+        self.__index = (self.__index + 1) % len(self.__rows)
+        return row
+
+
+class XsDotDevice:
+    """
+    Simulated Bluetooth DOT, streams live data to the manager's callback handlers while measuring
+    """
+
+    def __init__(self, manager, portInfo, tag, motion):
+        self.__manager = manager
+        self.__portInfo = portInfo
+        self.__tag = tag
+        self.__motion = motion
+        self.__filterProfile = "General"
+        self.__outputRate = _config["rate"]
+        self.__payloadMode = None
+        self.__headingOffset = 0.0
+        self.__lastResult = XRV_OK
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.timeBase = random.getrandbits(32)
+
+    def portInfo(self):
+        return self.__portInfo
+
+    def bluetoothAddress(self):
+        return self.__portInfo.bluetoothAddress()
+
+    def deviceId(self):
+        return self.__portInfo.deviceId()
+
+    def deviceTagName(self):
+        return XsString(self.__tag)
+
+    def productCode(self):
+        return XsString("XS-T01")
+
+    def lastResult(self):
+        return self.__lastResult
+
+    def lastResultText(self):
+        return XsResultValueToString(self.__lastResult)
+
+    def getAvailableFilterProfiles(self):
+        return [XsFilterProfile("General"), XsFilterProfile("Dynamic")]
+
+    def onboardFilterProfile(self):
+        return XsFilterProfile(self.__filterProfile)
+
+    def setOnboardFilterProfile(self, profile):
+        if profile not in ("General", "Dynamic"):
+            self.__lastResult = XRV_ERROR
+            return False
+        self.__filterProfile = profile
+        return True
+
+    def outputRate(self):
+        return self.__outputRate
+
+    def setOutputRate(self, rate):
+        if rate not in SUPPORTED_OUTPUT_RATES:
+            self.__lastResult = XRV_ERROR
+            return False
+        self.__outputRate = rate
+        return True
+
+    def setLogOptions(self, options):
+        return True
+
+    def enableLogging(self, filename):
+        return True
+
+    def disableLogging(self):
+        return True
+
+    def isMeasuring(self):
+        return self.__thread is not None
+
+    def payloadMode(self):
+        return self.__payloadMode
+
+    def startMeasurement(self, payloadMode):
+        if payloadMode not in _PAYLOAD_FIELDS or self.__thread is not None:
+            self.__lastResult = XRV_ERROR
+            return False
+        self.__payloadMode = payloadMode
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self._stream, daemon=True)
+        self.__thread.start()
+        return True
+
+    def stopMeasurement(self):
+        if self.__thread is None:
+            return False
+        self.__stop.set()
+        if self.__thread is not threading.current_thread():
+            self.__thread.join()
+        self.__thread = None
+        return True
+
+    def resetOrientation(self, resetMode):
+        self.__headingOffset = 0.0 if resetMode == XRM_DefaultAlignment else None
+        return True
+
+    def _stream(self):
+        containsOrientation, containsFreeAcc = _PAYLOAD_FIELDS[self.__payloadMode]
+        period = 1.0 / self.__outputRate
+        periodUs = int(round(1e6 / self.__outputRate))
+        start = time.perf_counter()
+        index = 0
+        while not self.__stop.is_set():
+            due = start + index * period
+            delay = due - time.perf_counter()
+            if delay > 0 and self.__stop.wait(delay):
+                break
+            euler, freeAcc = self.__motion.sample(index * period)
+            if euler is not None and self.__headingOffset is None:
+                self.__headingOffset = euler[2]
+            if euler is not None and self.__headingOffset:
+                euler = (euler[0], euler[1], (euler[2] - self.__headingOffset + 180.0) % 360.0 - 180.0)
+            packet = XsDataPacket(sampleTimeFine=(self.timeBase + index * periodUs) & 0xFFFFFFFF,
+                                  euler=euler if containsOrientation else None,
+                                  freeAcc=freeAcc if containsFreeAcc else None)
+            self.__manager._dispatch("onLiveDataAvailable", self, packet)
+            index += 1
+
+
+class XsDotUsbDevice:
+    """
+    Only used for isinstance checks, the simulator has no USB devices
+    """
+
+
+class XsDotCallback:
+    def __init__(self):
+        pass
+
+    def onAdvertisementFound(self, port_info):
+        pass
+
+    def onBatteryUpdated(self, device, batteryLevel, chargingStatus):
+        pass
+
+    def onError(self, result, errorString):
+        pass
+
+    def onLiveDataAvailable(self, device, packet):
+        pass
+
+    def onProgressUpdated(self, device, current, total, identifier):
+        pass
+
+    def onDeviceUpdateDone(self, portInfo, result):
+        pass
+
+    def onRecordingStopped(self, device):
+        pass
+
+    def onDeviceStateChanged(self, device, newState, oldState):
+        pass
+
+    def onButtonClicked(self, device, timestamp):
+        pass
+
+    def onRecordedDataAvailable(self, device, packet):
+        pass
+
+    def onRecordedDataDone(self, device):
+        pass
+
+
+class XsDotConnectionManager:
+    """
+    Simulated connection manager with _config["devices"] DOTs in range
+    """
+
+    def __init__(self):
+        self.__handlers = list()
+        self.__lock = threading.Lock()
+        self.__lastResult = XRV_OK
+        self.__ports = list()
+        self.__devices = dict()
+        self.__detecting = threading.Event()
+        self.__synced = False
+        replay = _config["replay"]
+        for i in range(_config["devices"]):
+            address = f"D4:22:CD:00:{i // 256:02X}:{i % 256:02X}"
+            self.__ports.append(XsPortInfo(address, XsDeviceId(0x00B00000 + i), portName=f"Movella DOT {i}"))
+        self.__motions = [ReplayMotion(replay[i]) if i < len(replay) else SyntheticMotion(seed=i)
+                          for i in range(_config["devices"])]
+
+    def addXsDotCallbackHandler(self, handler):
+        self.__handlers.append(handler)
+
+    def _dispatch(self, callbackName, *args):
+        for handler in self.__handlers:
+            getattr(handler, callbackName)(*args)
+
+    def lastResult(self):
+        return self.__lastResult
+
+    def lastResultText(self):
+        return XsResultValueToString(self.__lastResult)
+
+    def enableDeviceDetection(self):
+        self.__detecting.set()
+
+        def advertise():
+            for portInfo in self.__ports:
+                time.sleep(_config["advertisementDelay"])
+                if not self.__detecting.is_set():
+                    break
+                self._dispatch("onAdvertisementFound", portInfo)
+
+        threading.Thread(target=advertise, daemon=True).start()
+        return True
+
+    def disableDeviceDetection(self):
+        self.__detecting.clear()
+        return True
+
+    def detectUsbDevices(self):
+        return list()
+
+    def openPort(self, portInfo):
+        address = str(portInfo.bluetoothAddress())
+        for i, known in enumerate(self.__ports):
+            if known.bluetoothAddress() == address:
+                with self.__lock:
+                    if known.deviceId() not in self.__devices:
+                        self.__devices[known.deviceId()] = XsDotDevice(self, known, f"DOT{i}", self.__motions[i])
+                self.__lastResult = XRV_OK
+                return True
+        self.__lastResult = XRV_ERROR
+        return False
+
+    def closePort(self, portInfo):
+        with self.__lock:
+            device = self.__devices.pop(portInfo.deviceId(), None)
+        if device is not None:
+            device.stopMeasurement()
+            self._dispatch("onDeviceStateChanged", device, XDS_Destructing, XDS_Measurement)
+
+    def dropConnection(self, bluetoothAddress):
+        """
+        Not part of the SDK: simulates a DOT that powers down or goes out of range
+        """
+        for portInfo in self.__ports:
+            if portInfo.bluetoothAddress() == str(bluetoothAddress):
+                self.closePort(portInfo)
+
+    def device(self, deviceId):
+        return self.__devices.get(deviceId)
+
+    def usbDevice(self, deviceId):
+        return None
+
+    def startSync(self, rootAddress):
+        if self.__synced:
+            self.__lastResult = XRV_SYNC_COULD_NOT_START
+            return False
+        # Synchronized devices share one sampleTimeFine time base
+        timeBase = random.getrandbits(32)
+        for device in self.__devices.values():
+            device.timeBase = timeBase
+        self.__synced = True
+        return True
+
+    def stopSync(self):
+        self.__synced = False
+        return True
+
+    def close(self):
+        self.__detecting.clear()
+        for device in list(self.__devices.values()):
+            device.stopMeasurement()
+            self._dispatch("onDeviceStateChanged", device, XDS_Destructing, XDS_Measurement)
+        self.__devices.clear()
@@ -0,0 +1,340 @@
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+BUFFER_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class PacketRingBuffer:
+    """
+    Fixed-capacity FIFO of packets for a single Movella DOT
+
+    All slots are allocated up front so pushing and popping never grows or shrinks a list on
+    the SDK callback thread. The buffer does no locking of its own, callers are expected to
+    hold the lock that guards it.
+
+    What happens when a packet is pushed into a full buffer depends on the policy:
+        DROP_OLDEST: the oldest packet is overwritten, so consumers always see the freshest data
+        DROP_NEWEST: the incoming packet is discarded
+        BLOCK: the push is refused, the caller decides whether to wait for space and retry
+    Every discarded packet is counted in dropped().
+    """
+
+    def __init__(self, capacity, policy=DROP_OLDEST):
+        if capacity < 1:
+            raise ValueError(f"Buffer capacity must be at least 1, got {capacity}")
+        if policy not in BUFFER_POLICIES:
+            raise ValueError(f"Unknown buffer policy: {policy}")
+
+        self.__slots = [None] * capacity
+        self.__capacity = capacity
+        self.__policy = policy
+        self.__head = 0
+        self.__count = 0
+        self.__dropped = 0
+
+    def __len__(self):
+        return self.__count
+
+    def capacity(self):
+        """
+        Returns:
+            The maximum number of packets the buffer can hold
+        """
+        return self.__capacity
+
+    def policy(self):
+        """
+        Returns:
+            The overflow policy of the buffer
+        """
+        return self.__policy
+
+    def full(self):
+        """
+        Returns:
+            True if the next push will overflow the buffer
+        """
+        return self.__count == self.__capacity
+
+    def dropped(self):
+        """
+        Returns:
+            The number of packets discarded because the buffer was full
+        """
+        return self.__dropped
+
+    def push(self, packet):
+        """
+        Appends a packet, applying the overflow policy when the buffer is full
+
+        Parameters:
+            packet: The packet to store
+        Returns:
+            False if the packet was not stored (DROP_NEWEST and BLOCK policies on a full buffer)
+        """
+        if self.__count == self.__capacity:
+            if self.__policy != DROP_OLDEST:
+                if self.__policy == DROP_NEWEST:
+                    self.__dropped += 1
+                return False
+            self.__slots[self.__head] = packet
+            self.__head = (self.__head + 1) % self.__capacity
+            self.__dropped += 1
+            return True
+
+        self.__slots[(self.__head + self.__count) % self.__capacity] = packet
+        self.__count += 1
+        return True
+
+    def countDrop(self):
+        """
+        Counts a packet the caller discarded itself, e.g. after giving up waiting on a BLOCK buffer
+        """
+        self.__dropped += 1
+
+    def pop(self):
+        """
+        Returns:
+            The oldest packet in the buffer, or None if the buffer is empty
+        """
+        if self.__count == 0:
+            return None
+        packet = self.__slots[self.__head]
+        self.__slots[self.__head] = None
+        self.__head = (self.__head + 1) % self.__capacity
+        self.__count -= 1
+        return packet
+
+    def popMany(self, maxCount=None):
+        """
+        Removes up to maxCount packets from the buffer in one go
+
+        Parameters:
+            maxCount: The maximum number of packets to remove, None removes all of them
+        Returns:
+            A list of packets, oldest first
+        """
+        count = self.__count if maxCount is None else min(maxCount, self.__count)
+        packets = [None] * count
+        for i in range(count):
+            packets[i] = self.__slots[self.__head]
+            self.__slots[self.__head] = None
+            self.__head = (self.__head + 1) % self.__capacity
+        self.__count -= count
+        return packets
+
+    def clear(self):
+        """
+        Discards all buffered packets without counting them as dropped
+        """
+        for i in range(self.__capacity):
+            self.__slots[i] = None
+        self.__head = 0
+        self.__count = 0
+
+
+class BroadcastRing:
+    """
+    Fixed-capacity ring that keeps the most recent packets of a Movella DOT for any number of readers
+
+    Unlike PacketRingBuffer, reading does not remove anything. Every published packet gets a sequence
+    number and readers keep their own position, see Subscription. Like PacketRingBuffer the ring does no
+    locking of its own.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError(f"Buffer capacity must be at least 1, got {capacity}")
+        self.__slots = [None] * capacity
+        self.__capacity = capacity
+        self.__written = 0
+
+    def capacity(self):
+        """
+        Returns:
+            The number of packets kept for readers that fall behind
+        """
+        return self.__capacity
+
+    def written(self):
+        """
+        Returns:
+            The sequence number the next published packet will get
+        """
+        return self.__written
+
+    def publish(self, packet):
+        """
+        Stores a packet, overwriting the oldest one once the ring is full
+        """
+        self.__slots[self.__written % self.__capacity] = packet
+        self.__written += 1
+
+    def read(self, sequence):
+        """
+        Parameters:
+            sequence: The sequence number of the packet, must be within the last capacity() packets
+        Returns:
+            The packet with the given sequence number
+        """
+        return self.__slots[sequence % self.__capacity]
+
+
+class Subscription:
+    """
+    A reader's own position in the BroadcastRing of a Movella DOT
+
+    Subscriptions are created with XdpcHandler.subscribe. Each one sees every packet published after it
+    was created, as long as it does not fall more than the ring capacity behind. Packets it missed that
+    way are counted in dropped().
+
+    A conflating subscription only cares about the latest value: next() returns the newest unread packet
+    and skips the older ones, counting them in skipped(). This is meant for control loops where a stale
+    sample is worth less than no sample.
+    """
+
+    def __init__(self, address, ring, condition, conflate=False):
+        self.__address = address
+        self.__ring = ring
+        self.__condition = condition
+        self.__conflate = conflate
+        self.__cursor = ring.written()
+        self.__dropped = 0
+        self.__skipped = 0
+        self.__closed = False
+
+    def address(self):
+        """
+        Returns:
+            The bluetooth address of the Movella DOT this subscription reads from
+        """
+        return self.__address
+
+    def conflates(self):
+        """
+        Returns:
+            True if next() only returns the newest packet
+        """
+        return self.__conflate
+
+    def closed(self):
+        """
+        Returns:
+            True if the subscription was closed or the handler is shutting down
+        """
+        return self.__closed
+
+    def close(self):
+        """
+        Stops the subscription and wakes up any thread waiting on it
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+
+    def lag(self):
+        """
+        Returns:
+            The number of published packets this subscription has not read yet
+        """
+        with self.__condition:
+            return self.__ring.written() - self.__cursor
+
+    def dropped(self):
+        """
+        Returns:
+            The number of packets that were overwritten before this subscription read them
+        """
+        return self.__dropped
+
+    def skipped(self):
+        """
+        Returns:
+            The number of packets a conflating subscription passed over in favour of a newer one
+        """
+        return self.__skipped
+
+    def wait(self, timeout=None):
+        """
+        Blocks until an unread packet is available
+
+        Parameters:
+            timeout: Maximum number of seconds to wait, None waits until a packet arrives or the subscription is closed
+        Returns:
+            True if an unread packet is available
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__ring.written() > self.__cursor or self.__closed, timeout)
+            return self.__ring.written() > self.__cursor
+
+    @staticmethod
+    def waitForAny(subscriptions, timeout=None):
+        """
+        Blocks until any of the subscriptions has an unread packet, so one silent device doesn't hold up the
+        others. The subscriptions have to share their condition, like all subscriptions of one XdpcHandler.
+
+        Parameters:
+            subscriptions: The subscriptions to wait on
+            timeout: Maximum number of seconds to wait, None waits until a packet arrives or one of the
+                subscriptions is closed
+        Returns:
+            True if one of the subscriptions has an unread packet
+        """
+        if not subscriptions:
+            return False
+        condition = subscriptions[0].__condition
+
+        def ready():
+            return any(s.__ring.written() > s.__cursor for s in subscriptions)
+        with condition:
+            condition.wait_for(lambda: ready() or any(s.__closed for s in subscriptions), timeout)
+            return ready()
+
+    def next(self):
+        """
+        Returns:
+            The oldest unread packet, or the newest one for a conflating subscription. None if there is none.
+        """
+        with self.__condition:
+            if not self._catchUp():
+                return None
+            if self.__conflate:
+                newest = self.__ring.written() - 1
+                self.__skipped += newest - self.__cursor
+                self.__cursor = newest
+            packet = self.__ring.read(self.__cursor)
+            self.__cursor += 1
+            return packet
+
+    def drain(self, maxCount=None):
+        """
+        Ignores conflation, use this to get at the full backlog.
+
+        Parameters:
+            maxCount: The maximum number of packets to read, None reads all unread packets
+        Returns:
+            A list of unread packets, oldest first
+        """
+        with self.__condition:
+            if not self._catchUp():
+                return []
+            count = self.__ring.written() - self.__cursor
+            if maxCount is not None:
+                count = min(count, maxCount)
+            packets = [self.__ring.read(self.__cursor + i) for i in range(count)]
+            self.__cursor += count
+            return packets
+
+    def _catchUp(self):
+        """
+        Skips the cursor over packets that were already overwritten, must be called with the lock held
+
+        Returns:
+            True if there is an unread packet
+        """
+        behind = self.__ring.written() - self.__cursor
+        if behind > self.__ring.capacity():
+            self.__dropped += behind - self.__ring.capacity()
+            self.__cursor = self.__ring.written() - self.__ring.capacity()
+        return behind > 0
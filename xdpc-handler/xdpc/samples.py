@@ -0,0 +1,93 @@
+import numpy as np
+
+# Layout of the arrays returned by samplesToArray, fields missing from a sample are NaN
+SAMPLE_DTYPE = np.dtype([
+    ("timestamp", np.uint32),
+    ("euler", np.float32, 3),
+    ("freeAcc", np.float32, 3),
+    ("quaternion", np.float32, 4),
+])
+
+# sampleTimeFine is a 32-bit microsecond counter
+SAMPLE_TIME_FINE_RANGE = 1 << 32
+
+_MISSING3 = (np.nan,) * 3
+_MISSING4 = (np.nan,) * 4
+
+
+class DotSample:
+    """
+    Compact record holding the fields the input processors use from a Movella DOT data packet
+
+    Fields that were not part of the packet's payload are None.
+        address: The bluetooth address of the device the sample came from
+        sampleTimeFine: The sensor timestamp in microseconds, wraps around at 2^32
+        euler: (roll, pitch, yaw) in degrees
+        freeAcc: (x, y, z) free acceleration in m/s^2
+        quaternion: (w, x, y, z) orientation quaternion
+        hostTime: The time.perf_counter() value at which the packet reached the handler
+    """
+    __slots__ = ("address", "sampleTimeFine", "euler", "freeAcc", "quaternion", "hostTime")
+
+    def __init__(self, address, sampleTimeFine, euler=None, freeAcc=None, quaternion=None, hostTime=None):
+        self.address = address
+        self.sampleTimeFine = sampleTimeFine
+        self.euler = euler
+        self.freeAcc = freeAcc
+        self.quaternion = quaternion
+        self.hostTime = hostTime
+
+    def __repr__(self):
+        return (f"DotSample({self.address!r}, {self.sampleTimeFine}, euler={self.euler}, "
+                f"freeAcc={self.freeAcc}, quaternion={self.quaternion})")
+
+
+def decodePacket(address, packet, hostTime=None, quaternion=True):
+    """
+    Copies the fields used by the input processors out of an XsDataPacket
+
+    Each accessor is a call into the native SDK, so this is meant to run once per packet.
+
+    Parameters:
+        address: The bluetooth address of the device that sent the packet
+        packet: The XsDataPacket to decode
+        hostTime: The time.perf_counter() value at which the packet arrived, if known
+        quaternion: Also copy the orientation quaternion, leave it None when no consumer reads it
+    Returns:
+        A DotSample with plain Python floats
+    """
+    euler = None
+    orientation = None
+    if packet.containsOrientation():
+        e = packet.orientationEuler()
+        euler = (e.x(), e.y(), e.z())
+        if quaternion:
+            q = packet.orientationQuaternion()
+            orientation = (q.w(), q.x(), q.y(), q.z())
+
+    freeAcc = None
+    if packet.containsFreeAcceleration():
+        a = packet.freeAcceleration()
+        freeAcc = (a[0], a[1], a[2])
+
+    sampleTimeFine = packet.sampleTimeFine() if packet.containsSampleTimeFine() else None
+    return DotSample(address, sampleTimeFine, euler, freeAcc, orientation, hostTime)
+
+
+def samplesToArray(samples):
+    """
+    Packs a sequence of DotSamples into one contiguous NumPy structured array
+
+    Parameters:
+        samples: A sequence of DotSample records, oldest first
+    Returns:
+        A NumPy array with dtype SAMPLE_DTYPE and one row per sample
+    """
+    array = np.empty(len(samples), dtype=SAMPLE_DTYPE)
+    if len(samples) == 0:
+        return array
+    array["timestamp"] = [s.sampleTimeFine or 0 for s in samples]
+    array["euler"] = [s.euler or _MISSING3 for s in samples]
+    array["freeAcc"] = [s.freeAcc or _MISSING3 for s in samples]
+    array["quaternion"] = [s.quaternion or _MISSING4 for s in samples]
+    return array
@@ -0,0 +1,22 @@
+import importlib
+import os
+
+_sdk = None
+
+
+def loadSdk():
+    """
+    Imports the Movella DOT PC SDK on first use
+
+    XDPC_BACKEND=sim swaps the Windows-only SDK for the simulated one in xdpc.movelladot_sim.
+
+    Returns:
+        The movelladot_pc_sdk module, or xdpc.movelladot_sim
+    """
+    global _sdk
+    if _sdk is None:
+        if os.environ.get("XDPC_BACKEND") == "sim":
+            _sdk = importlib.import_module(".movelladot_sim", __package__)
+        else:
+            _sdk = importlib.import_module("movelladot_pc_sdk")
+    return _sdk
@@ -0,0 +1,242 @@
+from .samples import DotSample, decodePacket
+from threading import Event, Thread
+import json
+import mmap
+import numpy as np
+import struct
+import time
+
+SESSION_MAGIC = b"XDPCSES2"
+HEADER_SIZE = 4096
+# magic, number of samples, end of the last block, length of the JSON metadata that follows
+_HEADER_FORMAT = "<8sQQI"
+# device index, capacity and number of samples of a block, padded so the first column is 8 byte aligned
+_BLOCK_FORMAT = "<HxxII4x"
+BLOCK_HEADER_SIZE = struct.calcsize(_BLOCK_FORMAT)
+
+# The fixed-width columns stored for every device: name, dtype and the shape of one value
+COLUMNS = (
+    ("hostTime", np.dtype(np.float64), ()),
+    ("sampleTimeFine", np.dtype(np.uint32), ()),
+    ("euler", np.dtype(np.float32), (3,)),
+    ("freeAcc", np.dtype(np.float32), (3,)),
+    ("quaternion", np.dtype(np.float32), (4,)),
+)
+
+_MISSING3 = (np.nan,) * 3
+_MISSING4 = (np.nan,) * 4
+
+
+def blockSize(capacity):
+    """
+    Returns:
+        The number of bytes a block of capacity samples takes up in a session file, a multiple of 8
+    """
+    size = BLOCK_HEADER_SIZE + sum(capacity * dtype.itemsize * int(np.prod(shape)) for _, dtype, shape in COLUMNS)
+    return (size + 7) & ~7
+
+
+def _blockColumns(buffer, offset, capacity):
+    columns = dict()
+    offset += BLOCK_HEADER_SIZE
+    for name, dtype, shape in COLUMNS:
+        column = np.ndarray((capacity,) + shape, dtype=dtype, buffer=buffer, offset=offset)
+        columns[name] = column
+        offset += column.nbytes
+    return columns
+
+
+class SessionRecorder:
+    """
+    Records the live data of Movella DOTs into a memory-mapped session file
+
+    The file is a 4 KiB header followed by blocks. A block belongs to one device and holds room for chunkSize
+    samples of that device as contiguous COLUMNS, the hostTime values of all its samples, then their
+    sampleTimeFine values and so on. When a device's block is full the file grows by a new block for it, so
+    writing a batch is a copy into mapped memory rather than a write call. A device only spans several blocks
+    when it records more than chunkSize samples, at 60 Hz the default of 262144 samples covers 72 minutes.
+
+    The recorder reads through its own subscriptions on a background thread and drains them every
+    flushInterval seconds. Host timestamps are only available when the handler decodes samples
+    (XdpcHandler(decode_samples=True)), otherwise the hostTime column is NaN. A decoding handler leaves out the
+    quaternion of devices whose registered consumers don't read QUATERNION, its column is NaN then.
+
+    Use openSession to read a session file back.
+    """
+
+    def __init__(self, xdpcHandler, path, addresses=None, chunkSize=262144, flushInterval=0.05):
+        """
+        Parameters:
+            xdpcHandler: The XdpcHandler to record from
+            path: The session file to create, an existing file is overwritten
+            addresses: The bluetooth addresses to record, None records all connected DOTs
+            chunkSize: Number of samples per device the file grows by when the device's block is full
+            flushInterval: Seconds between draining the subscriptions into the file
+        """
+        self.__xdpcHandler = xdpcHandler
+        self.__path = path
+        self.__chunkSize = chunkSize
+        self.__flushInterval = flushInterval
+        if addresses is None:
+            addresses = [device.bluetoothAddress() for device in xdpcHandler.connectedDots()]
+        self.__addresses = [str(address) for address in addresses]
+        self.__subscriptions = list()
+        self.__file = None
+        self.__map = None
+        # per device: [offset, capacity, count] of the block currently written to, None before the first sample
+        self.__blocks = [None] * len(self.__addresses)
+        self.__columns = [None] * len(self.__addresses)
+        self.__end = HEADER_SIZE
+        self.__count = 0
+        self.__stop = Event()
+        self.__thread = None
+        # perf_counter has an arbitrary origin, this maps hostTime back to wall clock time
+        self.__metadata = {
+            "addresses": self.__addresses,
+            "columns": [(name, dtype.str, shape) for name, dtype, shape in COLUMNS],
+            "wallClockOffset": time.time() - time.perf_counter(),
+        }
+
+    def recorded(self):
+        """
+        Returns:
+            The number of samples written so far
+        """
+        return self.__count
+
+    def start(self):
+        """
+        Creates the session file and starts recording
+        """
+        self.__file = open(self.__path, "w+b")
+        self._resize(HEADER_SIZE)
+        self._writeHeader()
+        self.__subscriptions = [self.__xdpcHandler.subscribe(address) for address in self.__addresses]
+        self.__stop.clear()
+        self.__thread = Thread(target=self._run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Writes the remaining samples and closes the file
+        """
+        if self.__thread is None:
+            return
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
+        for subscription in self.__subscriptions:
+            self.__xdpcHandler.unsubscribe(subscription)
+        self._unmap()
+        self.__file.close()
+        self.__file = None
+
+    def _run(self):
+        while not self.__stop.wait(self.__flushInterval):
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        for index, subscription in enumerate(self.__subscriptions):
+            samples = subscription.drain()
+            if samples:
+                self._append(index, samples)
+        self._writeHeader()
+
+    def _append(self, deviceIndex, samples):
+        if not isinstance(samples[0], DotSample):
+            samples = [decodePacket(self.__addresses[deviceIndex], sample) for sample in samples]
+
+        while samples:
+            block = self.__blocks[deviceIndex]
+            if block is None or block[2] == block[1]:
+                block = self._newBlock(deviceIndex)
+            offset, capacity, count = block
+            written = samples[:capacity - count]
+            samples = samples[len(written):]
+
+            end = count + len(written)
+            columns = self.__columns[deviceIndex]
+            columns["hostTime"][count:end] = [np.nan if s.hostTime is None else s.hostTime for s in written]
+            columns["sampleTimeFine"][count:end] = [s.sampleTimeFine or 0 for s in written]
+            columns["euler"][count:end] = [s.euler or _MISSING3 for s in written]
+            columns["freeAcc"][count:end] = [s.freeAcc or _MISSING3 for s in written]
+            columns["quaternion"][count:end] = [s.quaternion or _MISSING4 for s in written]
+            block[2] = end
+            struct.pack_into(_BLOCK_FORMAT, self.__map, offset, deviceIndex, capacity, end)
+            self.__count += len(written)
+
+    def _newBlock(self, deviceIndex):
+        offset = self.__end
+        self._resize(offset + blockSize(self.__chunkSize))
+        block = [offset, self.__chunkSize, 0]
+        struct.pack_into(_BLOCK_FORMAT, self.__map, offset, deviceIndex, self.__chunkSize, 0)
+        self.__blocks[deviceIndex] = block
+        self.__columns[deviceIndex] = _blockColumns(self.__map, offset, self.__chunkSize)
+        return block
+
+    def _writeHeader(self):
+        metadata = json.dumps(self.__metadata).encode()
+        header = struct.pack(_HEADER_FORMAT, SESSION_MAGIC, self.__count, self.__end, len(metadata)) + metadata
+        if len(header) > HEADER_SIZE:
+            raise ValueError("Session metadata does not fit in the file header")
+        self.__map[:len(header)] = header
+
+    def _unmap(self):
+        # the column views have to go before the map can be closed
+        self.__columns = [None] * len(self.__addresses)
+        if self.__map is not None:
+            self.__map.flush()
+            self.__map.close()
+            self.__map = None
+
+    def _resize(self, size):
+        self._unmap()
+        self.__file.truncate(size)
+        self.__end = size
+        self.__map = mmap.mmap(self.__file.fileno(), 0)
+        for index, block in enumerate(self.__blocks):
+            if block is not None:
+                self.__columns[index] = _blockColumns(self.__map, block[0], block[1])
+
+
+def openSession(path):
+    """
+    Maps a session file written by SessionRecorder into NumPy
+
+    Parameters:
+        path: The session file
+    Returns:
+        A tuple of the session metadata dictionary and a dictionary from bluetooth address to a dictionary
+        from column name to a read-only array, e.g. columns[address]["euler"] is an (n, 3) array.
+        The columns of a device that fits in one block are views of the mapped file, the blocks of
+        a device that spans several are concatenated into a copy.
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    magic, count, end, metadataLength = struct.unpack_from(_HEADER_FORMAT, header)
+    if magic != SESSION_MAGIC:
+        raise ValueError(f"{path} is not a session file")
+    start = struct.calcsize(_HEADER_FORMAT)
+    metadata = json.loads(header[start:start + metadataLength])
+
+    blocks = {address: list() for address in metadata["addresses"]}
+    if end > HEADER_SIZE:
+        data = np.memmap(path, dtype=np.uint8, mode="r", shape=(end,))
+        offset = HEADER_SIZE
+        while offset < end:
+            deviceIndex, capacity, blockCount = struct.unpack_from(_BLOCK_FORMAT, data, offset)
+            columns = _blockColumns(data, offset, capacity)
+            blocks[metadata["addresses"][deviceIndex]].append({name: column[:blockCount]
+                                                               for name, column in columns.items()})
+            offset += blockSize(capacity)
+
+    columns = dict()
+    for address, deviceBlocks in blocks.items():
+        if len(deviceBlocks) == 1:
+            columns[address] = deviceBlocks[0]
+        else:
+            columns[address] = {name: np.concatenate([block[name] for block in deviceBlocks])
+                                if deviceBlocks else np.empty((0,) + shape, dtype=dtype)
+                                for name, dtype, shape in COLUMNS}
+    return metadata, columns
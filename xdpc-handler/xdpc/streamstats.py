@@ -0,0 +1,157 @@
+from .samples import SAMPLE_TIME_FINE_RANGE
+import math
+
+# A sensor interval this many times the nominal one means packets were lost over the radio
+GAP_FACTOR = 1.5
+
+
+class RollingWindow:
+    """
+    Mean and standard deviation over the last size values, updated in O(1) per value
+    """
+
+    def __init__(self, size):
+        self.__values = [0.0] * size
+        self.__size = size
+        self.__index = 0
+        self.__count = 0
+        self.__sum = 0.0
+        self.__sumSquares = 0.0
+
+    def __len__(self):
+        return self.__count
+
+    def push(self, value):
+        if self.__count == self.__size:
+            old = self.__values[self.__index]
+            self.__sum -= old
+            self.__sumSquares -= old * old
+        else:
+            self.__count += 1
+        self.__values[self.__index] = value
+        self.__index = (self.__index + 1) % self.__size
+        self.__sum += value
+        self.__sumSquares += value * value
+
+    def mean(self):
+        if self.__count == 0:
+            return 0.0
+        return self.__sum / self.__count
+
+    def std(self):
+        if self.__count < 2:
+            return 0.0
+        mean = self.__sum / self.__count
+        # clamp the rounding error of the running sums
+        return math.sqrt(max(0.0, self.__sumSquares / self.__count - mean * mean))
+
+
+class StreamSnapshot:
+    """
+    Health of the live data stream of one Movella DOT at a point in time
+
+        address: The bluetooth address of the device
+        samples: Number of packets received
+        rate: Effective arrival rate on the host in Hz
+        jitter: Standard deviation of the host inter-arrival time in seconds
+        sensorRate: Sample rate according to sampleTimeFine in Hz
+        gaps: Number of times sampleTimeFine jumped by more than a sample period
+        lostSamples: Estimated number of samples lost in those gaps
+        overflows: Packets dropped by the handler's packet buffer
+        subscriberDrops: Packets overwritten before a subscriber read them, summed over subscribers
+        lastArrivalAge: Seconds since the last packet arrived, None if nothing arrived yet
+    """
+    __slots__ = ("address", "samples", "rate", "jitter", "sensorRate", "gaps", "lostSamples", "overflows",
+                 "subscriberDrops", "lastArrivalAge")
+
+    def __init__(self, address, samples, rate, jitter, sensorRate, gaps, lostSamples, overflows, subscriberDrops,
+                 lastArrivalAge):
+        self.address = address
+        self.samples = samples
+        self.rate = rate
+        self.jitter = jitter
+        self.sensorRate = sensorRate
+        self.gaps = gaps
+        self.lostSamples = lostSamples
+        self.overflows = overflows
+        self.subscriberDrops = subscriberDrops
+        self.lastArrivalAge = lastArrivalAge
+
+    def __str__(self):
+        return (f"{self.address}: {self.samples} samples, {self.rate:6.1f} Hz "
+                f"(sensor {self.sensorRate:6.1f} Hz), jitter {self.jitter * 1000:5.2f} ms, "
+                f"{self.gaps} gaps / {self.lostSamples} lost, {self.overflows} buffer overflows, "
+                f"{self.subscriberDrops} subscriber drops")
+
+
+class StreamStats:
+    """
+    Rolling statistics over the live data of one Movella DOT
+
+    Fed by XdpcHandler.onLiveDataAvailable with the host arrival time and the sampleTimeFine of every packet.
+    """
+
+    def __init__(self, window=240):
+        self.__arrivalIntervals = RollingWindow(window)
+        self.__sensorIntervals = RollingWindow(window)
+        self.__samples = 0
+        self.__gaps = 0
+        self.__lostSamples = 0
+        self.__lastArrival = None
+        self.__lastSampleTimeFine = None
+
+    def lastArrival(self):
+        """
+        Returns:
+            The host time (time.perf_counter) the last packet arrived at, None if nothing arrived yet
+        """
+        return self.__lastArrival
+
+    def update(self, arrivalTime, sampleTimeFine):
+        """
+        Parameters:
+            arrivalTime: Host time the packet arrived at, from time.perf_counter
+            sampleTimeFine: The packet's sampleTimeFine in microseconds, None if the payload has no timestamp
+        """
+        self.__samples += 1
+        if self.__lastArrival is not None:
+            self.__arrivalIntervals.push(arrivalTime - self.__lastArrival)
+        self.__lastArrival = arrivalTime
+
+        if sampleTimeFine is None:
+            return
+        if self.__lastSampleTimeFine is not None:
+            interval = (sampleTimeFine - self.__lastSampleTimeFine) % SAMPLE_TIME_FINE_RANGE
+            nominal = self.__sensorIntervals.mean()
+            if len(self.__sensorIntervals) > 0 and interval > GAP_FACTOR * nominal:
+                # keep gaps out of the window so they don't inflate the nominal interval
+                self.__gaps += 1
+                self.__lostSamples += max(1, round(interval / nominal) - 1)
+            elif interval > 0:
+                self.__sensorIntervals.push(interval)
+        self.__lastSampleTimeFine = sampleTimeFine
+
+    def snapshot(self, address, now, overflows=0, subscriberDrops=0):
+        """
+        Parameters:
+            address: The bluetooth address of the device, copied into the snapshot
+            now: The current host time from time.perf_counter
+            overflows: Number of packets dropped by the handler's packet buffer
+            subscriberDrops: Number of packets overwritten before subscribers read them
+        Returns:
+            A StreamSnapshot of the current statistics
+        """
+        arrivalMean = self.__arrivalIntervals.mean()
+        sensorMean = self.__sensorIntervals.mean()
+        return StreamSnapshot(
+            address,
+            self.__samples,
+            1.0 / arrivalMean if arrivalMean > 0 else 0.0,
+            self.__arrivalIntervals.std(),
+            1e6 / sensorMean if sensorMean > 0 else 0.0,
+            self.__gaps,
+            self.__lostSamples,
+            overflows,
+            subscriberDrops,
+            None if self.__lastArrival is None else now - self.__lastArrival,
+        )
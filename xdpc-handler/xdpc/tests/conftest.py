@@ -0,0 +1,38 @@
+import os
+import time
+from threading import Condition, Lock
+
+import pytest
+
+# the handler tests run against the simulated SDK, set before anything imports xdpc.handler
+os.environ["XDPC_BACKEND"] = "sim"
+
+from xdpc.packetbuffer import BroadcastRing, Subscription  # noqa: E402
+from xdpc.samples import DotSample  # noqa: E402
+
+
+class FakeHandler:
+    def __init__(self):
+        self.__condition = Condition(Lock())
+        self.__rings = dict()
+
+    def subscribe(self, address, conflate=False):
+        ring = self.__rings.setdefault(address, BroadcastRing(16))
+        return Subscription(address, ring, self.__condition, conflate)
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+
+    def publish(self, address, sampleTimeFine, hostTime=None):
+        sample = DotSample(address, sampleTimeFine, hostTime=time.perf_counter() if hostTime is None else hostTime)
+        with self.__condition:
+            self.__rings[address].publish(sample)
+            self.__condition.notify_all()
+
+
+@pytest.fixture
+def fake_handler():
+    """
+    Stands in for an XdpcHandler towards subscribers, publish(address, sampleTimeFine) delivers a DotSample
+    """
+    return FakeHandler()
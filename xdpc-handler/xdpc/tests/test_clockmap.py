@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from xdpc.clockmap import ClockMapping
+from xdpc.samples import SAMPLE_TIME_FINE_RANGE
+
+
+def feed(mapping, start, drift, jitter, count=6000, period=1 / 60, origin=100.0, seed=0):
+    noise = np.random.default_rng(seed).exponential(jitter, size=count)
+    for index in range(count):
+        sensorSeconds = index * period
+        sampleTimeFine = (start + round(sensorSeconds * 1e6)) % SAMPLE_TIME_FINE_RANGE
+        mapping.update(sampleTimeFine, origin + sensorSeconds * (1 + drift * 1e-6) + noise[index])
+    return sampleTimeFine
+
+
+def test_fit_recovers_the_drift_and_removes_the_jitter():
+    mapping = ClockMapping()
+    last = feed(mapping, start=1000, drift=40, jitter=0.004)
+
+    assert len(mapping) == 6000
+    assert mapping.drift() == pytest.approx(40, abs=5)
+    # the mean transport latency stays in the mapping, the jitter around it does not
+    expected = 100.0 + 5999 / 60 * (1 + 40e-6) + 0.004
+    assert mapping.toHostTime(last) == pytest.approx(expected, abs=0.001)
+
+
+def test_fit_follows_the_sample_time_fine_wrap_around():
+    mapping = ClockMapping()
+    last = feed(mapping, start=SAMPLE_TIME_FINE_RANGE - 30_000_000, drift=-25, jitter=0.002)
+
+    assert last < 100_000_000
+    assert mapping.drift() == pytest.approx(-25, abs=5)
+    assert mapping.offset() == pytest.approx(100.002, abs=0.001)
+    # a slightly older timestamp from before the wrap still maps to the past
+    assert mapping.toHostTime(SAMPLE_TIME_FINE_RANGE - 1) < mapping.toHostTime(last)
+
+
+def test_mapping_is_empty_until_the_first_update():
+    mapping = ClockMapping()
+
+    assert mapping.toHostTime(0) is None
+    assert mapping.offset() is None
+    mapping.update(500, 10.0)
+    assert mapping.slope() == 1.0
+    assert mapping.toHostTime(1500) == pytest.approx(10.001)
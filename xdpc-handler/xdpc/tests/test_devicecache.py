@@ -0,0 +1,22 @@
+import json
+
+from xdpc.devicecache import loadKnownDots, saveKnownDots
+
+
+def test_missing_or_unreadable_caches_are_empty(tmp_path):
+    path = tmp_path / "known.json"
+    assert loadKnownDots(str(path)) == {}
+
+    path.write_text("{not json")
+    assert loadKnownDots(str(path)) == {}
+
+
+def test_saved_entries_load_by_address(tmp_path):
+    path = str(tmp_path / "cache" / "known.json")
+    entries = [{"address": "A", "deviceId": 11534336, "portName": "Movella DOT 0"}, {"tag": "no address"}]
+
+    saveKnownDots(path, entries)
+
+    assert loadKnownDots(path) == {"A": entries[0]}
+    assert json.loads(open(path).read()) == entries
+    assert [file.name for file in (tmp_path / "cache").iterdir()] == ["known.json"]
@@ -0,0 +1,90 @@
+from xdpc.deviceconfig import (APPLIED, EULER, FAILED, FREE_ACC, QUATERNION, SKIPPED, DeviceConfig, configureDevice,
+                               lowestOutputRate, smallestPayloadMode)
+
+
+class Profile:
+    def __init__(self, label):
+        self.__label = label
+
+    def label(self):
+        return self.__label
+
+
+class FakeDevice:
+    def __init__(self, filterProfile="General", outputRate=60, failing=()):
+        self.filterProfile = filterProfile
+        self.rate = outputRate
+        self.failing = failing
+        self.calls = list()
+
+    def bluetoothAddress(self):
+        return "A"
+
+    def lastResultText(self):
+        return "rejected"
+
+    def onboardFilterProfile(self):
+        return Profile(self.filterProfile)
+
+    def setOnboardFilterProfile(self, label):
+        self.calls.append("setOnboardFilterProfile")
+        self.filterProfile = label
+        return True
+
+    def outputRate(self):
+        return self.rate
+
+    def setOutputRate(self, rate):
+        self.calls.append("setOutputRate")
+        if "setOutputRate" in self.failing:
+            return False
+        self.rate = rate
+        return True
+
+    def setLogOptions(self, options):
+        self.calls.append("setLogOptions")
+
+    def startMeasurement(self, payloadMode):
+        self.calls.append("startMeasurement")
+        return True
+
+
+def test_smallest_payload_mode_carries_every_field():
+    assert smallestPayloadMode([EULER]) == "XsPayloadMode_OrientationEuler"
+    assert smallestPayloadMode([FREE_ACC, EULER]) == "XsPayloadMode_CompleteEuler"
+    assert smallestPayloadMode([QUATERNION, FREE_ACC]) == "XsPayloadMode_CompleteQuaternion"
+    assert smallestPayloadMode([EULER, QUATERNION]) == "XsPayloadMode_ExtendedEuler"
+    assert smallestPayloadMode([]) == "XsPayloadMode_ExtendedEuler"
+
+
+def test_lowest_output_rate_rounds_up_to_a_supported_rate():
+    assert lowestOutputRate(None) is None
+    assert lowestOutputRate(50) == 60
+    assert lowestOutputRate(60) == 60
+    assert lowestOutputRate(500) == 120
+
+
+def test_settings_that_already_match_are_skipped():
+    device = FakeDevice()
+    applied = dict()
+    config = DeviceConfig("General", 60, logOptions=1, payloadMode="XsPayloadMode_CompleteEuler")
+
+    first = configureDevice(device, config, applied)
+    second = configureDevice(device, config, applied)
+
+    assert [step.status for step in first.steps] == [SKIPPED, SKIPPED, APPLIED, APPLIED]
+    assert [step.status for step in second.steps] == [SKIPPED] * 4
+    assert device.calls == ["setLogOptions", "startMeasurement"]
+    assert first.succeeded()
+
+
+def test_failed_steps_report_the_device_error():
+    device = FakeDevice(filterProfile="Dynamic", failing=("setOutputRate",))
+
+    report = configureDevice(device, DeviceConfig("General", 120), dict())
+
+    assert [(step.name, step.status) for step in report.steps] == [("filterProfile", APPLIED),
+                                                                   ("outputRate", FAILED)]
+    assert report.steps[1].detail == "rejected"
+    assert not report.succeeded()
+    assert device.filterProfile == "General"
@@ -0,0 +1,27 @@
+import io
+
+from xdpc.eventlog import DEBUG, ERROR, INFO, EventLog
+
+
+def test_query_by_level_name_and_fields():
+    log = EventLog(capacity=8)
+    log.info("battery", "DOT 0 BatteryLevel: 80", address="A", batteryLevel=80)
+    log.info("battery", "DOT 1 BatteryLevel: 50", address="B", batteryLevel=50)
+    log.error("error", "boom")
+
+    assert [event.fields["batteryLevel"] for event in log.query(name="battery")] == [80, 50]
+    assert [event.message for event in log.query(address="B")] == ["DOT 1 BatteryLevel: 50"]
+    assert [event.name for event in log.query(level=ERROR)] == ["error"]
+    assert len(log.query(since=log.query()[0].sequence)) == 2
+
+
+def test_writer_skips_events_below_its_level_and_keeps_the_newest():
+    stream = io.StringIO()
+    log = EventLog(capacity=2, stream=stream, level=INFO)
+    log.log(DEBUG, "advertisementIgnored", "Ignoring A")
+    for click in range(3):
+        log.info("buttonClicked", f"Button clicked at {click}")
+    log.flush()
+
+    assert stream.getvalue() == "Button clicked at 1\nButton clicked at 2\n"
+    assert len(log.query()) == 2
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from xdpc.filters import FilterPipeline
+
+PIPELINES = [
+    [{"stage": "scale", "factor": 1 / 50}, {"stage": "deadzone", "width": 0.1}, {"stage": "clamp"}],
+    [{"stage": "ema", "alpha": 0.5}],
+    [{"stage": "ema", "alpha": 0.01}],
+    [{"stage": "median", "window": 4}],
+    [{"stage": "median", "window": 3}, {"stage": "ema", "alpha": 0.3}, {"stage": "rate_limit", "step": 0.2},
+     {"stage": "deadzone", "width": 0.05}, {"stage": "clamp", "low": -0.5, "high": 0.5}],
+    [{"stage": "scale", "factor": 1 / 50}, {"stage": "one_euro", "min_cutoff": 0.5, "beta": 2.0},
+     {"stage": "deadzone", "width": 0.01}],
+    [],
+]
+
+
+@pytest.mark.parametrize("stages", PIPELINES)
+def test_batches_match_the_per_sample_function(stages):
+    values = np.random.default_rng(1).normal(scale=2.0, size=3000)
+    pipeline = FilterPipeline(stages)
+
+    process = pipeline.compile()
+    expected = np.array([process(value) for value in values.tolist()])
+    processBatch = pipeline.compileBatch()
+    batches = np.concatenate([processBatch(values[start:start + 333]) for start in range(0, len(values), 333)])
+    columns = pipeline.compileBatch()(np.stack([values, values], axis=1))
+
+    np.testing.assert_allclose(batches, expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(columns[:, 1], expected, rtol=0, atol=1e-12)
+
+
+def test_one_euro_uses_the_sample_times():
+    times = np.cumsum(np.random.default_rng(2).uniform(0.005, 0.05, size=1000))
+    values = np.sin(times * 3.0)
+    pipeline = FilterPipeline([{"stage": "one_euro", "min_cutoff": 1.0, "beta": 0.5}])
+
+    process = pipeline.compile()
+    expected = np.array([process(value, time) for value, time in zip(values.tolist(), times.tolist())])
+    untimed = pipeline.compile()
+
+    np.testing.assert_allclose(pipeline.compileBatch()(values, times), expected, rtol=0, atol=1e-12)
+    assert [untimed(value) for value in values[:100].tolist()] != expected[:100].tolist()
+
+
+def test_one_euro_smooths_slow_movements_more_than_fast_ones():
+    values = np.random.default_rng(3).normal(scale=0.02, size=2000)
+    process = FilterPipeline([{"stage": "one_euro", "min_cutoff": 0.5, "beta": 2.0}]).compile()
+
+    still = np.array([process(value) for value in values.tolist()])
+    assert np.std(still[100:]) < 0.3 * np.std(values)
+    # a step of one unit is followed to within 5 % after 0.1 s at 60 Hz
+    step = [process(1.0) for _ in range(6)]
+    assert step[-1] > 0.95
+
+
+def test_deadzone_and_clamp():
+    process = FilterPipeline([{"stage": "deadzone", "width": 0.1}, {"stage": "clamp"}]).compile()
+
+    assert [process(value) for value in (0.05, -0.099, 0.1, 0.5, 3.0, -2.0)] == [0.0, 0.0, 0.1, 0.5, 1.0, -1.0]
+
+
+def test_invalid_stages():
+    with pytest.raises(ValueError):
+        FilterPipeline([{"stage": "lowpass"}])
+    with pytest.raises(ValueError):
+        FilterPipeline([{"stage": "ema", "alpha": 0.0}])
+    with pytest.raises(ValueError):
+        FilterPipeline([{"stage": "one_euro", "min_cutoff": 0.0}])
+
+
+@pytest.mark.parametrize("stage", [
+    {"stage": "deadzone", "widht": 0.1},
+    {"stage": "scale"},
+    {"stage": "scale", "factor": float("inf")},
+    {"stage": "deadzone", "width": -0.1},
+    {"stage": "deadzone", "width": float("nan")},
+    {"stage": "rate_limit", "step": -0.5},
+    {"stage": "rate_limit", "step": 0.0},
+    {"stage": "clamp", "low": 1.0, "high": -1.0},
+    {"stage": "median", "window": None},
+    {"stage": "one_euro", "beta": -1.0},
+    {"stage": "one_euro", "rate": "fast"},
+    {"stage": "clamp", "low": -1.0, "high": float("inf")},
+    {"stage": "clamp", "low": float("nan")},
+    {"stage": "deadzone", "width": float("inf")},
+    {"stage": "rate_limit", "step": float("inf")},
+    {"stage": "rate_limit", "step": 0.1, "initial": float("-inf")},
+    {"stage": "ema", "alpha": 0.5, "initial": float("nan")},
+    {"stage": "ema", "alpha": float("inf")},
+    {"stage": "median", "window": float("inf")},
+    {"stage": "one_euro", "min_cutoff": float("inf")},
+    {"stage": "one_euro", "beta": float("nan")},
+])
+def test_bad_parameters_are_rejected_when_the_pipeline_is_built(stage):
+    with pytest.raises(ValueError):
+        FilterPipeline([stage])
@@ -0,0 +1,79 @@
+import time
+from threading import Thread
+
+from xdpc.framesync import FrameAssembler, sampleTimeFineDelta
+from xdpc.samples import SAMPLE_TIME_FINE_RANGE
+
+
+def test_sample_time_fine_delta_wraps_around():
+    assert sampleTimeFineDelta(50, SAMPLE_TIME_FINE_RANGE - 100) == 150
+    assert sampleTimeFineDelta(SAMPLE_TIME_FINE_RANGE - 100, 50) == -150
+
+
+def test_frames_are_matched_across_the_wrap_around(fake_handler):
+    assembler = FrameAssembler(fake_handler, ["A", "B"])
+    fake_handler.publish("A", SAMPLE_TIME_FINE_RANGE - 100)
+    fake_handler.publish("B", 50)
+
+    frame = assembler.nextFrame(timeout=1.0)
+
+    assert frame.complete()
+    assert frame.sampleTimeFine == SAMPLE_TIME_FINE_RANGE - 100
+    assert frame.samples["B"].sampleTimeFine == 50
+
+
+def test_device_that_moved_past_the_frame_is_marked_missing(fake_handler):
+    assembler = FrameAssembler(fake_handler, ["A", "B", "C"])
+    fake_handler.publish("A", 0)
+    fake_handler.publish("B", 16667)
+    fake_handler.publish("C", 500)
+
+    frame = assembler.nextFrame(timeout=1.0)
+
+    assert frame.missing == ("B",)
+    assert frame.missingMask == 0b010
+    assert frame.samples["B"] is None
+    assert assembler.partialFrames() == 1
+
+
+def test_partial_frame_deadline_counts_from_the_sample_host_time(fake_handler):
+    assembler = FrameAssembler(fake_handler, ["A", "B", "C"], maxWait=0.5)
+    arrived = time.perf_counter() - 1.0
+    fake_handler.publish("A", 1000, hostTime=arrived)
+    fake_handler.publish("C", 1000, hostTime=arrived)
+
+    frame = assembler.nextFrame(timeout=0.1)
+
+    assert frame is not None
+    assert frame.missingMask == 0b010
+    assert frame.samples["A"].sampleTimeFine == 1000
+
+
+def test_samples_without_a_timestamp_are_skipped(fake_handler):
+    assembler = FrameAssembler(fake_handler, ["A"])
+    fake_handler.publish("A", None)
+    fake_handler.publish("A", 2000)
+
+    assert assembler.nextFrame(timeout=1.0).sampleTimeFine == 2000
+    assert assembler.skippedSamples() == 1
+    assert assembler.nextFrame(timeout=0.01) is None
+
+
+def test_silent_first_device_does_not_hold_up_the_others(fake_handler):
+    assembler = FrameAssembler(fake_handler, ["A", "B"], maxWait=0.05)
+    frames = list()
+    reader = Thread(target=lambda: frames.append(assembler.nextFrame()), daemon=True)
+    reader.start()
+
+    time.sleep(0.02)
+    started = time.perf_counter()
+    fake_handler.publish("B", 1000)
+    reader.join(1.0)
+
+    assert frames and frames[0].missing == ("A",)
+    assert time.perf_counter() - started < 0.5
+    # with a long timeout the partial frame still comes maxWait after the sample arrived
+    fake_handler.publish("B", 17667)
+    started = time.perf_counter()
+    assert assembler.nextFrame(timeout=5.0).missing == ("A",)
+    assert time.perf_counter() - started < 0.5
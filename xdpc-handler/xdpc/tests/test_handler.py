@@ -0,0 +1,149 @@
+import json
+import time
+
+import pytest
+
+from xdpc import movelladot_sim
+from xdpc.deviceconfig import DeviceConfig
+from xdpc.handler import XdpcHandler
+from xdpc.packetbuffer import BLOCK
+
+
+class FakeDevice:
+    def __init__(self, address):
+        self.__portInfo = movelladot_sim.XsPortInfo(address)
+
+    def portInfo(self):
+        return self.__portInfo
+
+
+def deliver(handler, device, count, start=0):
+    for sampleTimeFine in range(start, start + count):
+        handler.onLiveDataAvailable(device, movelladot_sim.XsDataPacket(sampleTimeFine=sampleTimeFine * 16667))
+
+
+def test_packet_queue_stays_empty_until_a_reader_asks_for_it():
+    handler = XdpcHandler(max_buffer_size=3, buffer_policy=BLOCK, block_timeout=0.5)
+    device = FakeDevice("A")
+
+    started = time.perf_counter()
+    deliver(handler, device, 10)
+    assert time.perf_counter() - started < 0.5
+    assert handler.streamStats()["A"].overflows == 0
+    assert handler.droppedPackets("A") == 0
+
+    assert handler.getNextPacket("A") is None
+    deliver(handler, device, 2, start=10)
+    assert handler.getNextPacket("A").sampleTimeFine() == 10 * 16667
+    assert handler.getNextPacket("A").sampleTimeFine() == 11 * 16667
+
+
+def test_overflows_count_once_the_queue_is_read():
+    handler = XdpcHandler(max_buffer_size=3)
+    device = FakeDevice("A")
+
+    assert not handler.packetAvailable("A")
+    deliver(handler, device, 5)
+
+    assert handler.streamStats()["A"].overflows == 2
+    assert len(handler.drain("A")) == 3
+
+
+def test_wait_for_any_packet_queues_every_device():
+    handler = XdpcHandler()
+    assert not handler.waitForAnyPacket(timeout=0.01)
+
+    deliver(handler, FakeDevice("B"), 1)
+
+    assert handler.waitForAnyPacket(timeout=0.01)
+    assert handler.packetAvailable("B")
+
+
+@pytest.fixture
+def sim_handler(monkeypatch):
+    monkeypatch.setitem(movelladot_sim._config, "devices", 3)
+    monkeypatch.setitem(movelladot_sim._config, "advertisementDelay", 0.01)
+    handler = XdpcHandler(whitelist=())
+    assert handler.initialize()
+    yield handler
+    handler.cleanup()
+
+
+def test_scan_stops_once_the_advertised_names_were_seen(sim_handler):
+    started = time.perf_counter()
+    assert sim_handler.scanForDots(names=["Movella DOT 1"], timeout=5.0, headless=True)
+    assert time.perf_counter() - started < 1.0
+    assert "Movella DOT 1" in [str(portInfo.portName()) for portInfo in sim_handler.detectedDots()]
+
+    # the advertised name is not the tag the device reports once connected
+    sim_handler.connectDots()
+    assert "Movella DOT 1" not in [str(device.deviceTagName()) for device in sim_handler.connectedDots()]
+
+
+def test_scan_for_a_name_that_is_not_advertised_times_out(sim_handler):
+    assert not sim_handler.scanForDots(names=["DOT1"], timeout=0.2, headless=True)
+    assert len(sim_handler.detectedDots()) == 3
+
+
+def test_known_dots_reopen_directly_where_the_simulated_sdk_rebuilds_their_ports(sim_handler, tmp_path):
+    path = str(tmp_path / "known.json")
+    sim_handler.scanForDots(expected_count=3, timeout=5.0, headless=True)
+    sim_handler.connectDots()
+    sim_handler.saveKnownDots(path)
+
+    handler = XdpcHandler(whitelist=())
+    handler.initialize()
+    try:
+        assert handler.connectKnownDots(path) == 3
+        assert handler.detectedDots() == []
+    finally:
+        handler.cleanup()
+
+
+def test_known_dots_are_scanned_for_when_the_sdk_cannot_rebuild_their_ports(sim_handler, tmp_path, monkeypatch):
+    path = str(tmp_path / "known.json")
+    sim_handler.scanForDots(expected_count=3, timeout=5.0, headless=True)
+    sim_handler.connectDots()
+    sim_handler.saveKnownDots(path)
+
+    handler = XdpcHandler(whitelist=())
+    handler.initialize()
+
+    def swigPortInfo(*args, **kwargs):
+        # like the SWIG wrapped SDK: no keyword arguments, no constructor taking a device id
+        raise TypeError("Wrong number or type of arguments for overloaded function 'new_XsPortInfo'")
+    monkeypatch.setattr(movelladot_sim, "XsPortInfo", swigPortInfo)
+    try:
+        assert handler.connectKnownDots(path, scan_timeout=5.0) == 3
+        assert len(handler.detectedDots()) == 3
+    finally:
+        handler.cleanup()
+
+
+def test_known_dots_without_a_device_id_are_scanned_for(sim_handler, tmp_path):
+    path = str(tmp_path / "known.json")
+    with open(path, "w") as file:
+        json.dump([{"address": "D4:22:CD:00:00:01", "portName": "Movella DOT 1"}], file)
+
+    assert sim_handler.connectKnownDots(path, scan_timeout=5.0) == 1
+    assert [str(portInfo.bluetoothAddress()) for portInfo in sim_handler.detectedDots()][-1] == "D4:22:CD:00:00:01"
+
+
+def test_recovered_device_starts_with_clean_stream_stats(sim_handler):
+    sim_handler.scanForDots(expected_count=3, timeout=5.0, headless=True)
+    sim_handler.connectDots()
+    sim_handler.configureDots(DeviceConfig(outputRate=60, payloadMode=movelladot_sim.XsPayloadMode_ExtendedEuler))
+    sim_handler.superviseDots(stall_timeout=0.5, check_interval=0.02)
+    address = str(sim_handler.connectedDots()[0].bluetoothAddress())
+    time.sleep(0.2)
+
+    sim_handler.manager().dropConnection(address)
+    deadline = time.perf_counter() + 5.0
+    while not sim_handler.recoveries() and time.perf_counter() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.2)
+
+    assert sim_handler.recoveries()[0].connected
+    stats = sim_handler.streamStats()[address]
+    assert stats.samples > 0
+    assert (stats.gaps, stats.lostSamples) == (0, 0)
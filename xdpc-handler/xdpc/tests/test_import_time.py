@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+# seconds, measured in a fresh interpreter
+PACKAGE_IMPORT_BUDGET = 0.05
+HANDLER_IMPORT_BUDGET = 1.0
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def import_in_subprocess(statement):
+    """
+    Runs statement in a fresh interpreter with the simulated SDK
+
+    Returns:
+        A tuple of the seconds the statement took and the set of modules it loaded
+    """
+    code = (
+        "import sys, time\n"
+        "before = set(sys.modules)\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+        "print(' '.join(set(sys.modules) - before))\n"
+    )
+    environment = dict(os.environ, XDPC_BACKEND="sim", PYTHONPATH=PACKAGE_ROOT)
+    output = subprocess.run([sys.executable, "-c", code], env=environment, cwd=PACKAGE_ROOT,
+                            capture_output=True, text=True, check=True).stdout.split("\n")
+    return float(output[0]), set(output[1].split())
+
+
+def test_package_import_is_lazy():
+    seconds, modules = import_in_subprocess("import xdpc")
+    assert not modules & {"xdpc.movelladot_sim", "movelladot_pc_sdk", "pynput", "numpy", "xdpc.handler"}
+    assert seconds < PACKAGE_IMPORT_BUDGET
+
+
+def test_handler_import_budget():
+    seconds, modules = import_in_subprocess("from xdpc import XdpcHandler")
+    assert "xdpc.movelladot_sim" in modules
+    assert "pynput" not in modules
+    assert seconds < HANDLER_IMPORT_BUDGET
@@ -0,0 +1,130 @@
+from threading import Condition, Lock, Thread
+
+import pytest
+
+from xdpc.packetbuffer import BLOCK, DROP_NEWEST, DROP_OLDEST, BroadcastRing, PacketRingBuffer, Subscription
+
+
+def filled(policy, count, capacity=3):
+    buffer = PacketRingBuffer(capacity, policy)
+    results = [buffer.push(packet) for packet in range(count)]
+    return buffer, results
+
+
+def test_drop_oldest_overwrites_the_oldest_packet():
+    buffer, results = filled(DROP_OLDEST, 5)
+
+    assert results == [True] * 5
+    assert buffer.dropped() == 2
+    assert buffer.popMany() == [2, 3, 4]
+
+
+def test_drop_newest_discards_the_incoming_packet():
+    buffer, results = filled(DROP_NEWEST, 5)
+
+    assert results == [True, True, True, False, False]
+    assert buffer.dropped() == 2
+    assert buffer.popMany() == [0, 1, 2]
+
+
+def test_block_refuses_the_push_and_leaves_counting_to_the_caller():
+    buffer, results = filled(BLOCK, 4)
+
+    assert results == [True, True, True, False]
+    assert buffer.full()
+    assert buffer.dropped() == 0
+    buffer.countDrop()
+    assert buffer.dropped() == 1
+    assert buffer.pop() == 0
+    assert buffer.push(3)
+    assert buffer.popMany() == [1, 2, 3]
+
+
+def test_pop_wraps_around_and_clear_does_not_count_drops():
+    buffer = PacketRingBuffer(2)
+    for packet in range(4):
+        buffer.push(packet)
+        assert buffer.pop() == packet
+    assert buffer.pop() is None
+
+    buffer.push(4)
+    buffer.push(5)
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.dropped() == 0
+    assert buffer.popMany(5) == []
+
+
+def test_invalid_buffers():
+    with pytest.raises(ValueError):
+        PacketRingBuffer(0)
+    with pytest.raises(ValueError):
+        PacketRingBuffer(3, "drop_random")
+    with pytest.raises(ValueError):
+        BroadcastRing(0)
+
+
+def subscribed(capacity=4, conflate=False):
+    ring = BroadcastRing(capacity)
+    return ring, Subscription("A", ring, Condition(Lock()), conflate)
+
+
+def test_subscription_reads_every_packet_published_after_it_was_created():
+    ring = BroadcastRing(4)
+    ring.publish("before")
+    subscription = Subscription("A", ring, Condition(Lock()))
+    for packet in range(3):
+        ring.publish(packet)
+
+    assert subscription.lag() == 3
+    assert subscription.next() == 0
+    assert subscription.drain() == [1, 2]
+    assert subscription.next() is None
+    assert subscription.lag() == 0
+
+
+def test_subscription_that_falls_behind_counts_overwritten_packets():
+    ring, subscription = subscribed(capacity=4)
+    for packet in range(10):
+        ring.publish(packet)
+
+    assert subscription.lag() == 10
+    assert subscription.drain(2) == [6, 7]
+    assert subscription.dropped() == 6
+    assert subscription.drain() == [8, 9]
+
+
+def test_conflating_subscription_returns_the_newest_packet_and_counts_skipped_ones():
+    ring, subscription = subscribed(capacity=8, conflate=True)
+    for packet in range(5):
+        ring.publish(packet)
+
+    assert subscription.next() == 4
+    assert subscription.skipped() == 4
+    assert subscription.dropped() == 0
+    assert subscription.next() is None
+    ring.publish(5)
+    assert subscription.next() == 5
+    assert subscription.skipped() == 4
+
+
+def test_wait_wakes_up_on_publish_and_on_close():
+    ring = BroadcastRing(4)
+    condition = Condition(Lock())
+    subscription = Subscription("A", ring, condition)
+
+    assert not subscription.wait(0.01)
+
+    def publish():
+        with condition:
+            ring.publish("packet")
+            condition.notify_all()
+    thread = Thread(target=publish)
+    thread.start()
+    assert subscription.wait(1.0)
+    thread.join()
+    assert subscription.next() == "packet"
+
+    Thread(target=subscription.close).start()
+    assert not subscription.wait(1.0)
+    assert subscription.closed()
@@ -0,0 +1,35 @@
+from xdpc import movelladot_sim
+from xdpc.deviceconfig import EULER, FREE_ACC, QUATERNION
+from xdpc.samples import decodePacket
+
+
+class NoQuaternionPacket(movelladot_sim.XsDataPacket):
+    def orientationQuaternion(self):
+        raise AssertionError("the quaternion was decoded")
+
+
+def test_quaternion_is_only_decoded_when_asked_for():
+    packet = NoQuaternionPacket(sampleTimeFine=10, euler=(1.0, 2.0, 3.0), freeAcc=(0.0, 0.0, 9.0))
+
+    sample = decodePacket("A", packet, hostTime=1.5, quaternion=False)
+
+    assert sample.euler == (1.0, 2.0, 3.0)
+    assert sample.freeAcc == (0.0, 0.0, 9.0)
+    assert sample.quaternion is None
+    assert sample.hostTime == 1.5
+    assert decodePacket("A", movelladot_sim.XsDataPacket(packet)).quaternion is not None
+
+
+def test_handler_decodes_the_quaternion_only_for_consumers_that_read_it():
+    from xdpc.handler import XdpcHandler
+    handler = XdpcHandler(decode_samples=True)
+    assert handler._needsQuaternion("A")
+
+    handler.registerConsumer([EULER], bluetoothAddress="A")
+    handler.registerConsumer([FREE_ACC])
+    assert not handler._needsQuaternion("A")
+    assert not handler._needsQuaternion("B")
+
+    handler.registerConsumer([QUATERNION], bluetoothAddress="B")
+    assert not handler._needsQuaternion("A")
+    assert handler._needsQuaternion("B")
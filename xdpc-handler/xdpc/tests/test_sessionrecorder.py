@@ -0,0 +1,40 @@
+import numpy as np
+
+from xdpc.sessionrecorder import SessionRecorder, openSession
+
+
+def record(handler, path, samples, chunkSize):
+    recorder = SessionRecorder(handler, path, addresses=["A", "B"], chunkSize=chunkSize, flushInterval=0.01)
+    recorder.start()
+    for address, sampleTimeFine in samples:
+        handler.publish(address, sampleTimeFine)
+    recorder.stop()
+    return recorder
+
+
+def test_each_device_is_stored_as_contiguous_columns(fake_handler, tmp_path):
+    path = tmp_path / "session.xdpc"
+    recorder = record(fake_handler, path, [("A", 10), ("B", 20), ("A", 11), ("B", 21), ("A", 12)], chunkSize=8)
+
+    metadata, columns = openSession(path)
+
+    assert recorder.recorded() == 5
+    assert metadata["addresses"] == ["A", "B"]
+    assert columns["A"]["sampleTimeFine"].tolist() == [10, 11, 12]
+    assert columns["B"]["sampleTimeFine"].tolist() == [20, 21]
+    assert columns["A"]["euler"].shape == (3, 3)
+    assert np.isnan(columns["A"]["quaternion"]).all()
+    assert columns["A"]["hostTime"].flags.c_contiguous
+    assert not columns["A"]["hostTime"].flags.owndata
+
+
+def test_devices_that_outgrow_a_block_get_more_blocks(fake_handler, tmp_path):
+    path = tmp_path / "session.xdpc"
+    record(fake_handler, path, [("A", sampleTimeFine) for sampleTimeFine in range(10)], chunkSize=4)
+
+    _, columns = openSession(path)
+
+    assert columns["A"]["sampleTimeFine"].tolist() == list(range(10))
+    assert np.diff(columns["A"]["hostTime"]).min() >= 0
+    assert len(columns["B"]["sampleTimeFine"]) == 0
+    assert columns["B"]["freeAcc"].shape == (0, 3)